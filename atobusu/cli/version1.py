@@ -5,7 +5,10 @@ Provides command-line interface for processing data files through templates
 and generating HTML, PHP, and mixed content output files.
 """
 
+import os
 import sys
+import stat
+import errno
 from pathlib import Path
 from typing import Dict, Any, Optional
 
@@ -18,6 +21,18 @@ from atobusu.file_handlers.output_writer import OutputWriter
 from atobusu.core.exceptions import AtobusuError, InputError, ProcessingError, OutputError
 
 
+def _stat_path(path: str) -> Optional[os.stat_result]:
+    """Stat a path once, returning None if it does not exist (as Path.exists() would)."""
+    try:
+        return os.stat(path)
+    except OSError as e:
+        if e.errno in (errno.ENOENT, errno.ENOTDIR, errno.EBADF, errno.ELOOP):
+            return None
+        raise
+    except ValueError:
+        return None
+
+
 def validate_cli_arguments(args, logger) -> Dict[str, Any]:
     """
     Validate command-line arguments for Version 1.
@@ -44,29 +59,31 @@ def validate_cli_arguments(args, logger) -> Dict[str, Any]:
         if not args.input:
             validation['errors'].append("Input file is required for Version 1")
         else:
-            input_path = Path(args.input)
-            if not input_path.exists():
+            # One stat() answers both the existence and the regular-file checks
+            input_stat = _stat_path(args.input)
+            if input_stat is None:
                 validation['errors'].append(f"Input file does not exist: {args.input}")
-            elif not input_path.is_file():
+            elif not stat.S_ISREG(input_stat.st_mode):
                 validation['errors'].append(f"Input path is not a file: {args.input}")
-            elif input_path.suffix.lower() not in ['.json', '.yaml', '.yml']:
+            elif os.path.splitext(args.input)[1].lower() not in ['.json', '.yaml', '.yml']:
                 validation['errors'].append(f"Input file must be JSON or YAML: {args.input}")
             else:
-                validation['input_file'] = str(input_path.resolve())
+                validation['input_file'] = os.path.realpath(args.input)
         
         # Validate template file (optional - can use default)
         if args.template:
             template_path = Path(args.template)
-            if not template_path.exists():
+            template_stat = _stat_path(args.template)
+            if template_stat is None:
                 validation['errors'].append(f"Template file does not exist: {args.template}")
-            elif not template_path.is_file():
+            elif not stat.S_ISREG(template_stat.st_mode):
                 validation['errors'].append(f"Template path is not a file: {args.template}")
             else:
                 # Store just the template name if it's in the templates directory
                 if template_path.parent.name == 'templates':
                     validation['template_file'] = template_path.name
                 else:
-                    validation['template_file'] = str(template_path.resolve())
+                    validation['template_file'] = os.path.realpath(args.template)
         
         # Set output file (optional - will generate default if not provided)
         if args.output:
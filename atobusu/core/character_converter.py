@@ -6,11 +6,25 @@ and Japanese text according to the specified rules.
 """
 
 import re
-from typing import Dict, Any, Optional
+import logging
+from collections import Counter
+from functools import lru_cache
+from typing import Dict, Any, Optional, Union, Iterable, Iterator, TextIO
 from atobusu.core.logging_config import get_logger
 from atobusu.core.exceptions import ProcessingError
 
 
+# Patterns shared by every converter instance, compiled once per process
+_QUOTE_RE = re.compile(r'(?<!")"(?!")')
+_JAPANESE_RE = re.compile(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]')
+
+
+@lru_cache(maxsize=32)
+def _compile_char_class(chars: str):
+    """Compile a character class pattern for the given characters once."""
+    return re.compile(f'[{re.escape(chars)}]')
+
+
 class CharacterConverter:
     """
     Handles character conversion and text processing for Atobusu.
@@ -59,28 +73,121 @@ class CharacterConverter:
         self._compile_patterns()
     
     def _compile_patterns(self):
-        """Compile regex patterns for efficient character matching."""
+        """Compile regex patterns and str.translate tables for character matching."""
         try:
             # Pattern for straight quotes (but not already converted curly quotes)
-            self.quote_pattern = re.compile(r'(?<!")(?<!")\"(?!")(?!")')
+            self.quote_pattern = _QUOTE_RE
             
             # Pattern for circled numbers
             circled_chars = ''.join(self.conversion_rules.get('circled_numbers', {}).keys())
             if circled_chars:
-                self.circled_pattern = re.compile(f'[{re.escape(circled_chars)}]')
+                self.circled_pattern = _compile_char_class(circled_chars)
             else:
                 self.circled_pattern = None
             
             # Pattern for special symbols
             special_chars = ''.join(self.conversion_rules.get('special_symbols', {}).keys())
             if special_chars:
-                self.special_pattern = re.compile(f'[{re.escape(special_chars)}]')
+                self.special_pattern = _compile_char_class(special_chars)
             else:
                 self.special_pattern = None
+            
+            # Single-character rules are applied in one C-level pass with
+            # str.translate; multi-character rules (e.g. 'ハート') need str.replace
+            circled_rules = self.conversion_rules.get('circled_numbers', {})
+            self._circled_table = str.maketrans(
+                {char: entity for char, entity in circled_rules.items() if len(char) == 1}
+            ) or None
+            self._multi_char_circled = [
+                (chars, entity) for chars, entity in circled_rules.items() if len(chars) > 1
+            ]
+            
+            special_rules = self.conversion_rules.get('special_symbols', {})
+            self._symbol_table = str.maketrans(
+                {char: entity for char, entity in special_rules.items() if len(char) == 1}
+            ) or None
+            self._multi_char_symbols = [
+                (chars, entity) for chars, entity in special_rules.items() if len(chars) > 1
+            ]
+            
+            # Symbol rules are applied one after another; the translate table
+            # gives the same result only when no rule feeds another
+            self._symbols_sequential = not self._rules_independent(special_rules)
+            
+            # Proper prefixes of multi-character rules, which convert_stream
+            # carries between pieces
+            multi_char_rules = self._multi_char_circled + self._multi_char_symbols
+            self._multi_char_prefixes = frozenset(
+                chars[:size] for chars, _ in multi_char_rules for size in range(1, len(chars))
+            )
+            self._max_carry = max((len(chars) for chars, _ in multi_char_rules), default=1) - 1
+            
+            self._combined_table = self._build_combined_table()
                 
         except re.error as e:
             raise ProcessingError("Failed to compile regex patterns", str(e))
     
+    @staticmethod
+    def _rules_independent(rules: Dict[str, str]) -> bool:
+        """
+        Check whether applying rules one after another (in order) equals
+        replacing every multi-character rule first and then translating the
+        single-character ones in one pass.
+        
+        That holds when no single-character key occurs in any replacement or
+        multi-character key, and no single-character replacement can form
+        part of a multi-character key.
+        """
+        single_keys = {char for char in rules if len(char) == 1}
+        multi_key_chars = set(''.join(chars for chars in rules if len(chars) > 1))
+        replacement_chars = set(''.join(rules.values()))
+        single_replacement_chars = set(
+            ''.join(entity for char, entity in rules.items() if len(char) == 1)
+        )
+        
+        return not (
+            single_keys & (replacement_chars | multi_key_chars)
+            or multi_key_chars & single_replacement_chars
+        )
+    
+    def _build_combined_table(self) -> Optional[Dict[int, str]]:
+        """
+        Merge the quote, circled number and symbol rules into one translate table.
+        
+        The conversions normally run one after another, so they can only be
+        merged when no rule's output feeds another rule's input.
+        
+        Returns:
+            Combined str.translate table, or None if the rules interact
+        """
+        quote_rules = self.conversion_rules.get('quotes', {})
+        stages = [
+            {'"': quote_rules['"']} if '"' in quote_rules else {},
+            {char: entity for char, entity in
+             self.conversion_rules.get('circled_numbers', {}).items() if len(char) == 1},
+            {char: entity for char, entity in
+             self.conversion_rules.get('special_symbols', {}).items() if len(char) == 1}
+        ]
+        
+        combined = {}
+        for stage in stages:
+            for char, replacement in stage.items():
+                if char in combined:
+                    return None
+                combined[char] = replacement
+        
+        multi_char_rules = self._multi_char_circled + self._multi_char_symbols
+        key_chars = set(combined)
+        multi_chars = set(''.join(chars for chars, _ in multi_char_rules))
+        for chars, replacement in multi_char_rules:
+            if key_chars.intersection(chars) or key_chars.intersection(replacement):
+                return None
+        for replacement in combined.values():
+            if key_chars.intersection(replacement) or multi_chars.intersection(replacement):
+                return None
+        
+        return str.maketrans(combined) if combined else None
+    
     def convert_quotes(self, text: str) -> str:
         """
         Convert straight quotes to curly quotes.
@@ -105,7 +212,9 @@ class CharacterConverter:
                 opening_quote = quote_rules['"']
                 result = result.replace('"', opening_quote)
             
-            self.logger.debug(f"Quote conversion: '{text}' -> '{result}'")
+            # Guarded: the message copies the whole text twice
+            if self.logger.isEnabledFor(logging.DEBUG):
+                self.logger.debug(f"Quote conversion: '{text}' -> '{result}'")
             return result
             
         except Exception as e:
@@ -121,19 +230,17 @@ class CharacterConverter:
         Returns:
             Text with circled numbers converted to HTML entities
         """
-        if not text or not self.circled_pattern:
+        if not text or not (self._circled_table or self._multi_char_circled):
             return text
         
         try:
-            circled_rules = self.conversion_rules.get('circled_numbers', {})
-            
-            def replace_circled(match):
-                char = match.group(0)
-                return circled_rules.get(char, char)
-            
-            result = self.circled_pattern.sub(replace_circled, text)
+            result = text
+            for old_chars, new_chars in self._multi_char_circled:
+                result = result.replace(old_chars, new_chars)
+            if self._circled_table:
+                result = result.translate(self._circled_table)
             
-            if result != text:
+            if self.logger.isEnabledFor(logging.DEBUG) and result != text:
                 self.logger.debug(f"Circled number conversion: '{text}' -> '{result}'")
             
             return result
@@ -155,17 +262,23 @@ class CharacterConverter:
             return text
         
         try:
-            # Handle symbols that should be kept as-is
-            symbol_rules = self.conversion_rules.get('symbols', {})
-            special_rules = self.conversion_rules.get('special_symbols', {})
-            
             result = text
             
-            # Apply special symbol conversions
-            for old_char, new_char in special_rules.items():
-                if old_char in result:
-                    result = result.replace(old_char, new_char)
-                    self.logger.debug(f"Symbol conversion: '{old_char}' -> '{new_char}'")
+            if self._symbols_sequential:
+                # Rules feed each other: apply them one after another, in order
+                for old_chars, new_chars in self.conversion_rules.get('special_symbols', {}).items():
+                    result = result.replace(old_chars, new_chars)
+                return result
+            
+            # Apply multi-character symbol conversions
+            for old_chars, new_chars in self._multi_char_symbols:
+                if old_chars in result:
+                    result = result.replace(old_chars, new_chars)
+                    self.logger.debug(f"Symbol conversion: '{old_chars}' -> '{new_chars}'")
+            
+            # Apply single-character symbol conversions in one pass
+            if self._symbol_table:
+                result = result.translate(self._symbol_table)
             
             # Note: symbols in 'symbols' rules are kept as-is (like ※)
             # so we don't need to process them
@@ -194,15 +307,18 @@ class CharacterConverter:
             if isinstance(text, bytes):
                 # Decode bytes to string
                 text = text.decode(encoding, errors='replace')
-            elif isinstance(text, str):
+            elif isinstance(text, str) and not text.isascii():
                 # Encode and decode to ensure proper encoding
+                # (ASCII-only text round-trips unchanged; isascii() is O(1))
                 text = text.encode(encoding, errors='replace').decode(encoding)
             
             # Validate that Japanese characters are properly handled
             # This is a basic check - you might want more sophisticated validation
-            japanese_chars = re.findall(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]', text)
-            if japanese_chars:
-                self.logger.debug(f"Found {len(japanese_chars)} Japanese characters")
+            # (skipped unless debug logging is on, as it scans the whole text)
+            if self.logger.isEnabledFor(logging.DEBUG):
+                japanese_chars = _JAPANESE_RE.findall(text)
+                if japanese_chars:
+                    self.logger.debug(f"Found {len(japanese_chars)} Japanese characters")
             
             return text
             
@@ -226,17 +342,7 @@ class CharacterConverter:
         try:
             self.logger.debug(f"Starting character conversion for text: {text[:100]}...")
             
-            # Step 1: Handle Japanese encoding
-            result = self.handle_japanese_encoding(text, encoding)
-            
-            # Step 2: Convert quotes
-            result = self.convert_quotes(result)
-            
-            # Step 3: Convert circled numbers
-            result = self.convert_circled_numbers(result)
-            
-            # Step 4: Convert special symbols
-            result = self.convert_symbols(result)
+            result = self._convert_text(text, encoding)
             
             if result != text:
                 self.logger.info("Character conversion completed with changes")
@@ -251,6 +357,73 @@ class CharacterConverter:
         except Exception as e:
             raise ProcessingError(f"Failed to apply character conversions", str(e))
     
+    def convert_stream(self, chunks: Union[Iterable[str], TextIO], encoding: str = 'utf-8',
+                       chunk_size: int = 64 * 1024) -> Iterator[str]:
+        """
+        Apply all character conversions to text arriving in pieces.
+        
+        Only one piece is held in memory at a time. A trailing partial match
+        of a multi-character rule (e.g. 'ハー' of 'ハート') is carried over to
+        the next piece, so ''.join(convert_stream(...)) equals
+        apply_all_conversions() on the whole text.
+        
+        Args:
+            chunks: Iterable of text pieces, or a text stream to read from
+            encoding: Character encoding to use
+            chunk_size: Read size when chunks is a text stream
+            
+        Yields:
+            Converted text pieces
+        """
+        if hasattr(chunks, 'read'):
+            stream = chunks
+            chunks = iter(lambda: stream.read(chunk_size), '')
+        
+        prefixes = self._multi_char_prefixes
+        max_carry = self._max_carry
+        
+        try:
+            carry = ''
+            for chunk in chunks:
+                buffer = carry + chunk
+                cut = len(buffer)
+                for size in range(min(max_carry, len(buffer)), 0, -1):
+                    if buffer[-size:] in prefixes:
+                        cut -= size
+                        break
+                
+                carry = buffer[cut:]
+                if cut:
+                    yield self._convert_text(buffer[:cut], encoding)
+            
+            if carry:
+                yield self._convert_text(carry, encoding)
+                
+        except ProcessingError:
+            raise
+        except Exception as e:
+            raise ProcessingError("Failed to apply character conversions to stream", str(e))
+    
+    def _convert_text(self, text: str, encoding: str) -> str:
+        """Run every conversion step on a piece of text."""
+        # Step 1: Handle Japanese encoding
+        result = self.handle_japanese_encoding(text, encoding)
+        
+        if self._combined_table is not None:
+            # Steps 2-4 in a single pass: quotes, circled numbers and symbols
+            for old_chars, new_chars in self._multi_char_circled + self._multi_char_symbols:
+                result = result.replace(old_chars, new_chars)
+            return result.translate(self._combined_table)
+        
+        # Step 2: Convert quotes
+        result = self.convert_quotes(result)
+        
+        # Step 3: Convert circled numbers
+        result = self.convert_circled_numbers(result)
+        
+        # Step 4: Convert special symbols
+        return self.convert_symbols(result)
+    
     def add_conversion_rule(self, category: str, old_char: str, new_char: str):
         """
         Add a new conversion rule.
@@ -266,7 +439,7 @@ class CharacterConverter:
         self.conversion_rules[category][old_char] = new_char
         
         # Recompile patterns if necessary
-        if category in ['circled_numbers', 'special_symbols']:
+        if category in ['quotes', 'circled_numbers', 'special_symbols']:
             self._compile_patterns()
         
         self.logger.info(f"Added conversion rule: {category}['{old_char}'] -> '{new_char}'")
@@ -284,21 +457,28 @@ class CharacterConverter:
         if not text:
             return {}
         
+        # One C-level pass over the text; the rules are then looked up per
+        # distinct character rather than rescanning the text for each rule
+        char_counts = Counter(text)
+        
         stats = {
-            'straight_quotes': len(re.findall(r'"', text)),
+            'straight_quotes': char_counts['"'],
             'circled_numbers': 0,
             'special_symbols': 0,
-            'japanese_chars': len(re.findall(r'[\u3040-\u309F\u30A0-\u30FF\u4E00-\u9FAF]', text))
+            'japanese_chars': sum(
+                count for char, count in char_counts.items()
+                if '\u3040' <= char <= '\u30FF' or '\u4E00' <= char <= '\u9FAF'
+            )
         }
         
         # Count circled numbers
         circled_rules = self.conversion_rules.get('circled_numbers', {})
         for char in circled_rules.keys():
-            stats['circled_numbers'] += text.count(char)
+            stats['circled_numbers'] += char_counts[char] if len(char) == 1 else text.count(char)
         
         # Count special symbols
         special_rules = self.conversion_rules.get('special_symbols', {})
         for char in special_rules.keys():
-            stats['special_symbols'] += text.count(char)
+            stats['special_symbols'] += char_counts[char] if len(char) == 1 else text.count(char)
         
         return stats
\ No newline at end of file
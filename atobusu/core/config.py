@@ -3,11 +3,36 @@ Configuration management for Atobusu application.
 """
 
 import json
-import yaml
 import os
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Union, TextIO
 from pathlib import Path
+from types import MappingProxyType
+
+try:
+    import orjson
+except ImportError:  # Optional speedup (pip install atobusu[fast])
+    orjson = None
+
+from atobusu.core.json_compat import orjson_matches_stdlib
+
+
+# Default character conversion rules, built once; each config gets its own copy
+DEFAULT_CHARACTER_CONVERSION_RULES = MappingProxyType({
+    'quotes': {'"': '"', '"': '"'},
+    'symbols': {'※': '※'},  # Keep as-is
+    'circled_numbers': {
+        '①': '&#9312;', '②': '&#9313;', '③': '&#9314;',
+        '④': '&#9315;', '⑤': '&#9316;', '⑥': '&#9317;',
+        '⑦': '&#9318;', '⑧': '&#9319;', '⑨': '&#9320;',
+        '⑩': '&#9321;'
+    },
+    'special_symbols': {
+        '◎': '&#9678;',
+        'ハート': '&#9825;',
+        '♪': '&#9834;'
+    }
+})
 
 
 @dataclass
@@ -17,21 +42,10 @@ class AtobusuConfig:
     template_directory: str = "templates"
     output_directory: str = "output"
     gui_framework: str = "tkinter"  # 'tkinter' or 'pyqt5'
-    character_conversion_rules: Dict[str, Dict[str, str]] = field(default_factory=lambda: {
-        'quotes': {'"': '"', '"': '"'},
-        'symbols': {'※': '※'},  # Keep as-is
-        'circled_numbers': {
-            '①': '&#9312;', '②': '&#9313;', '③': '&#9314;',
-            '④': '&#9315;', '⑤': '&#9316;', '⑥': '&#9317;',
-            '⑦': '&#9318;', '⑧': '&#9319;', '⑨': '&#9320;',
-            '⑩': '&#9321;'
-        },
-        'special_symbols': {
-            '◎': '&#9678;',
-            'ハート': '&#9825;',
-            '♪': '&#9834;'
-        }
-    })
+    character_conversion_rules: Dict[str, Dict[str, str]] = field(
+        default_factory=lambda: {category: rules.copy()
+                                 for category, rules in DEFAULT_CHARACTER_CONVERSION_RULES.items()}
+    )
     
     # Logging configuration
     log_level: str = "INFO"
@@ -42,12 +56,16 @@ class AtobusuConfig:
     output_encoding: str = "utf-8"
     
     @classmethod
-    def load_from_file(cls, config_path: str) -> 'AtobusuConfig':
+    def load_from_file(cls, config_path: Union[str, TextIO],
+                       file_format: Optional[str] = None) -> 'AtobusuConfig':
         """
         Load configuration from a JSON or YAML file.
         
         Args:
-            config_path: Path to the configuration file
+            config_path: Path to the configuration file, or an open text
+                stream (e.g. io.StringIO) to read it from
+            file_format: 'json' or 'yaml'; defaults to the file extension
+                (required for streams without a name)
             
         Returns:
             AtobusuConfig instance with loaded settings
@@ -56,23 +74,52 @@ class AtobusuConfig:
             FileNotFoundError: If config file doesn't exist
             ValueError: If config file format is invalid
         """
+        if hasattr(config_path, 'read'):
+            suffix = cls._config_suffix(getattr(config_path, 'name', ''), file_format)
+            return cls(**cls._parse_config(config_path, suffix))
+        
         config_path = Path(config_path)
         
         if not config_path.exists():
             raise FileNotFoundError(f"Configuration file not found: {config_path}")
         
+        suffix = cls._config_suffix(config_path, file_format)
+        with open(config_path, 'r', encoding='utf-8') as f:
+            data = cls._parse_config(f, suffix)
+        
+        return cls(**data)
+    
+    @staticmethod
+    def _config_suffix(name: Union[str, Path], file_format: Optional[str]) -> str:
+        """Return the lower-case extension used to pick the config parser."""
+        if file_format:
+            return f".{file_format.lower().lstrip('.')}"
+        return Path(str(name)).suffix.lower()
+    
+    @staticmethod
+    def _parse_config(stream: TextIO, suffix: str) -> Dict[str, Any]:
+        """Parse configuration data from a text stream."""
         try:
-            with open(config_path, 'r', encoding='utf-8') as f:
-                if config_path.suffix.lower() == '.json':
-                    data = json.load(f)
-                elif config_path.suffix.lower() in ['.yaml', '.yml']:
-                    data = yaml.safe_load(f)
-                else:
-                    raise ValueError(f"Unsupported config file format: {config_path.suffix}")
-            
-            return cls(**data)
+            if suffix == '.json':
+                if orjson is not None:
+                    content = stream.read()
+                    try:
+                        return orjson.loads(content)
+                    except orjson.JSONDecodeError:
+                        # The stdlib parser accepts a little more (e.g. NaN)
+                        return json.loads(content)
+                return json.load(stream)
+            elif suffix in ['.yaml', '.yml']:
+                import yaml
+                try:
+                    # libyaml's CSafeLoader when PyYAML was built with it
+                    return yaml.load(stream, Loader=getattr(yaml, 'CSafeLoader', yaml.SafeLoader))
+                except yaml.YAMLError as e:
+                    raise ValueError(f"Invalid configuration file format: {e}")
+            else:
+                raise ValueError(f"Unsupported config file format: {suffix}")
             
-        except (json.JSONDecodeError, yaml.YAMLError) as e:
+        except json.JSONDecodeError as e:
             raise ValueError(f"Invalid configuration file format: {e}")
     
     def save_to_file(self, config_path: str) -> None:
@@ -99,9 +146,14 @@ class AtobusuConfig:
         
         with open(config_path, 'w', encoding='utf-8') as f:
             if config_path.suffix.lower() == '.json':
-                json.dump(data, f, indent=2, ensure_ascii=False)
+                if orjson is not None and orjson_matches_stdlib(data):
+                    f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8'))
+                else:
+                    json.dump(data, f, indent=2, ensure_ascii=False)
             elif config_path.suffix.lower() in ['.yaml', '.yml']:
-                yaml.dump(data, f, default_flow_style=False, allow_unicode=True)
+                import yaml
+                yaml.dump(data, f, Dumper=getattr(yaml, 'CSafeDumper', yaml.SafeDumper),
+                          default_flow_style=False, allow_unicode=True)
             else:
                 raise ValueError(f"Unsupported config file format: {config_path.suffix}")
     
@@ -8,9 +8,13 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Dict, Any, Optional, Union
 import json
+import sys
 
+# Slotted instances (no per-instance __dict__) where dataclasses support it
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_DATACLASS_OPTIONS)
 class InputData:
     """
     Model for input data from various sources.
@@ -64,7 +68,7 @@ class InputData:
         return True
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class TemplateData:
     """
     Model for template-specific data.
@@ -83,21 +87,17 @@ class TemplateData:
     
     def to_placeholder_dict(self) -> Dict[str, Any]:
         """Convert to dictionary suitable for placeholder replacement."""
-        placeholder_dict = {
+        # Built in one display so the dict is sized once; date fields and
+        # additional data override the fixed fields in that order
+        return {
             'product_code': self.product_code,
             'product_name': self.product_name,
             'category': self.category,
             'reviewer_name': self.reviewer_name,
             'rating': self.rating,
+            **self.dates,
+            **self.additional_data,
         }
-        
-        # Add date fields
-        placeholder_dict.update(self.dates)
-        
-        # Add additional data
-        placeholder_dict.update(self.additional_data)
-        
-        return placeholder_dict
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'TemplateData':
@@ -123,7 +123,7 @@ class TemplateData:
         return True
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ProcessedData:
     """
     Model for processed data ready for template rendering.
@@ -146,11 +146,10 @@ class ProcessedData:
             'content': self.converted_content,
             'output_format': self.output_format,
             'template_type': self.template_type,
+            # Add template variables
+            **self.template_variables,
         }
         
-        # Add template variables
-        context.update(self.template_variables)
-        
         # Add template data if available
         if self.template_data:
             context.update(self.template_data.to_placeholder_dict())
@@ -197,7 +196,7 @@ class ProcessedData:
         return True
 
 
-@dataclass
+@dataclass(**_DATACLASS_OPTIONS)
 class ValidationResult:
     """
     Model for validation results.
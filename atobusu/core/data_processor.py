@@ -5,16 +5,41 @@ Handles parsing, validation, and processing of data from various sources
 including JSON, YAML, and structured input data.
 """
 
+import os
 import json
-import yaml
+import threading
 from pathlib import Path
-from typing import Dict, Any, Optional, Union, List
+from types import MappingProxyType
+from typing import Dict, Any, Optional, Union, List, BinaryIO, Iterable, Tuple
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:  # Optional speedup (pip install atobusu[fast])
+    orjson = None
+
 from atobusu.core.logging_config import get_logger
 from atobusu.core.exceptions import InputError, ProcessingError
 from atobusu.core.data_models import InputData, ProcessedData, TemplateData, ValidationResult
 from atobusu.core.character_converter import CharacterConverter
+from atobusu.core.json_compat import orjson_matches_stdlib
+
+# Initial size of the per-thread buffer parse_json reads files into
+SCRATCH_BUFFER_SIZE = 1 << 16
+
+# Largest buffer kept for reuse; bigger files get a buffer of their own so
+# one large file does not pin its size in memory for the thread's lifetime
+MAX_SCRATCH_BUFFER_SIZE = 4 * SCRATCH_BUFFER_SIZE
+
+# ASCII record separator used to batch contents through one conversion pass
+RECORD_SEPARATOR = '\x1e'
+
+# Accepted values, checked on every validation and processing call
+_SOURCE_TYPES = frozenset({'json', 'yaml', 'gui', 'word'})
+_TEMPLATE_TYPES = frozenset({'page', 'index', 'content'})
+_OUTPUT_FORMATS = frozenset({'html', 'php', 'mixed'})
+# Top-level keys that mark list data for the index template
+_INDEX_KEYS = frozenset({'items', 'list'})
 
 
 class DataProcessor:
@@ -39,6 +64,14 @@ class DataProcessor:
         self.json_extensions = {'.json'}
         self.yaml_extensions = {'.yaml', '.yml'}
         
+        # Per-thread buffer reused by parse_json for file contents
+        self._scratch = threading.local()
+        
+        # Parser and source type for each supported extension
+        parsers = {ext: (self.parse_json, 'json') for ext in self.json_extensions}
+        parsers.update((ext, (self.parse_yaml, 'yaml')) for ext in self.yaml_extensions)
+        self._parsers = MappingProxyType(parsers)
+        
         # Template type mappings
         self.template_type_mappings = {
             'page': ['page', 'detail', 'content'],
@@ -46,12 +79,12 @@ class DataProcessor:
             'content': ['content', 'article', 'post']
         }
     
-    def parse_json(self, file_path: str) -> Dict[str, Any]:
+    def parse_json(self, file_path: Union[str, Path, BinaryIO]) -> Dict[str, Any]:
         """
         Parse JSON file and return data dictionary.
         
         Args:
-            file_path: Path to JSON file
+            file_path: Path to JSON file, or a readable file-like object
             
         Returns:
             Parsed JSON data as dictionary
@@ -60,16 +93,28 @@ class DataProcessor:
             InputError: If file cannot be read or parsed
         """
         try:
-            file_path = Path(file_path)
-            
-            if not file_path.exists():
-                raise InputError(f"JSON file not found: {file_path}")
-            
-            if file_path.suffix.lower() not in self.json_extensions:
-                raise InputError(f"Invalid JSON file extension: {file_path.suffix}")
-            
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            if isinstance(file_path, (str, Path)):
+                file_path = Path(file_path)
+                
+                if file_path.suffix.lower() not in self.json_extensions:
+                    raise InputError(f"Invalid JSON file extension: {file_path.suffix}")
+                
+                # One open() instead of a separate exists() stat beforehand
+                try:
+                    raw = self._read_json_bytes(file_path)
+                except FileNotFoundError:
+                    raise InputError(f"JSON file not found: {file_path}")
+            else:
+                raw = file_path.read()
+            
+            if orjson is not None:
+                try:
+                    data = orjson.loads(raw)
+                except orjson.JSONDecodeError:
+                    # The stdlib parser accepts a little more (e.g. NaN)
+                    data = json.loads(bytes(raw) if isinstance(raw, memoryview) else raw)
+            else:
+                data = json.loads(raw)
             
             self.logger.info(f"Successfully parsed JSON file: {file_path}")
             return data
@@ -79,12 +124,55 @@ class DataProcessor:
         except Exception as e:
             raise InputError(f"Failed to parse JSON file: {file_path}", str(e))
     
-    def parse_yaml(self, file_path: str) -> Dict[str, Any]:
+    def _read_json_bytes(self, file_path: Path) -> Union[bytes, memoryview]:
+        """
+        Read a JSON file for parsing.
+        
+        With orjson available the file is read into a per-thread scratch
+        buffer that is reused across calls, and a view of it is returned;
+        the view is only valid until the next read on the same thread.
+        Files larger than MAX_SCRATCH_BUFFER_SIZE are read into a fresh
+        buffer that is not kept.
+        
+        Args:
+            file_path: Path to JSON file
+            
+        Returns:
+            File contents as bytes or a memoryview
+        """
+        if orjson is None:
+            return file_path.read_bytes()
+        
+        with open(file_path, 'rb', buffering=0) as f:
+            size = os.fstat(f.fileno()).st_size
+            scratch = getattr(self._scratch, 'buffer', None)
+            if size > MAX_SCRATCH_BUFFER_SIZE:
+                scratch = bytearray(size)
+            elif scratch is None or len(scratch) < size:
+                scratch = bytearray(max(size, SCRATCH_BUFFER_SIZE))
+                self._scratch.buffer = scratch
+            
+            view = memoryview(scratch)[:size]
+            filled = 0
+            while filled < size:
+                count = f.readinto(view[filled:])
+                if not count:
+                    break
+                filled += count
+            
+            # Size changed under us or not a regular file; fall back to read()
+            if filled < size or f.read(1):
+                f.seek(0)
+                return f.read()
+            
+            return view
+    
+    def parse_yaml(self, file_path: Union[str, Path, BinaryIO]) -> Dict[str, Any]:
         """
         Parse YAML file and return data dictionary.
         
         Args:
-            file_path: Path to YAML file
+            file_path: Path to YAML file, or a readable file-like object
             
         Returns:
             Parsed YAML data as dictionary
@@ -92,17 +180,26 @@ class DataProcessor:
         Raises:
             InputError: If file cannot be read or parsed
         """
+        # Deferred so PyYAML is only loaded when YAML input is actually parsed
+        import yaml
+        
+        # libyaml's CSafeLoader when PyYAML was built with it
+        loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+        
         try:
-            file_path = Path(file_path)
-            
-            if not file_path.exists():
-                raise InputError(f"YAML file not found: {file_path}")
-            
-            if file_path.suffix.lower() not in self.yaml_extensions:
-                raise InputError(f"Invalid YAML file extension: {file_path.suffix}")
-            
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+            if isinstance(file_path, (str, Path)):
+                file_path = Path(file_path)
+                
+                if not file_path.exists():
+                    raise InputError(f"YAML file not found: {file_path}")
+                
+                if file_path.suffix.lower() not in self.yaml_extensions:
+                    raise InputError(f"Invalid YAML file extension: {file_path.suffix}")
+                
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    data = yaml.load(f, Loader=loader)
+            else:
+                data = yaml.load(file_path, Loader=loader)
             
             # Handle case where YAML file is empty or contains only None
             if data is None:
@@ -133,18 +230,16 @@ class DataProcessor:
         extension = file_path.suffix.lower()
         
         try:
-            if extension in self.json_extensions:
-                data = self.parse_json(str(file_path))
-                source_type = 'json'
-            elif extension in self.yaml_extensions:
-                data = self.parse_yaml(str(file_path))
-                source_type = 'yaml'
-            else:
+            parser = self._parsers.get(extension)
+            if parser is None:
                 raise InputError(f"Unsupported file format: {extension}")
             
+            parse, source_type = parser
+            data = parse(file_path)
+            
             # Convert parsed data to InputData
             input_data = InputData(
-                content=json.dumps(data, ensure_ascii=False, indent=2),
+                content=self._dump_content(data),
                 metadata={
                     'file_path': str(file_path),
                     'file_size': file_path.stat().st_size,
@@ -161,6 +256,25 @@ class DataProcessor:
                 raise
             raise InputError(f"Failed to parse file: {file_path}", str(e))
     
+    @staticmethod
+    def _dump_content(data: Any) -> str:
+        """
+        Serialize parsed data as indented JSON text.
+        
+        Args:
+            data: Parsed input data
+            
+        Returns:
+            JSON text with non-ASCII characters kept as-is
+        """
+        if orjson is not None and orjson_matches_stdlib(data):
+            try:
+                return orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode('utf-8')
+            except TypeError:
+                # orjson.JSONEncodeError (e.g. ints beyond 64 bits); let the stdlib handle it
+                pass
+        return json.dumps(data, ensure_ascii=False, indent=2)
+    
     def validate_data(self, data: Union[InputData, Dict[str, Any]]) -> ValidationResult:
         """
         Validate input data structure and content.
@@ -171,7 +285,12 @@ class DataProcessor:
         Returns:
             ValidationResult with validation status and messages
         """
+        return self._validate(data)[0]
+    
+    def _validate(self, data: Union[InputData, Dict[str, Any]]) -> Tuple[ValidationResult, Optional[TemplateData]]:
+        """Validate data, also returning the TemplateData built while checking it."""
         result = ValidationResult(is_valid=True)
+        template_data = None
         
         try:
             if isinstance(data, InputData):
@@ -184,34 +303,36 @@ class DataProcessor:
                     result.add_warning("Empty content")
                 
                 # Validate source type
-                if data.source_type not in ['json', 'yaml', 'gui', 'word']:
+                if data.source_type not in _SOURCE_TYPES:
                     result.add_warning(f"Unknown source type: {data.source_type}")
                 
                 # Try to parse metadata if it contains parsed_data
                 if 'parsed_data' in data.metadata:
                     parsed_data = data.metadata['parsed_data']
-                    self._validate_parsed_data(parsed_data, result)
+                    template_data = self._validate_parsed_data(parsed_data, result)
                 
             elif isinstance(data, dict):
                 # Validate dictionary data
-                self._validate_parsed_data(data, result)
+                template_data = self._validate_parsed_data(data, result)
                 
             else:
                 result.add_error(f"Unsupported data type: {type(data)}")
             
             self.logger.debug(f"Data validation completed: {result.is_valid}")
-            return result
+            return result, template_data
             
         except Exception as e:
             result.add_error(f"Validation failed: {str(e)}")
-            return result
+            return result, None
     
-    def _validate_parsed_data(self, data: Dict[str, Any], result: ValidationResult):
-        """Validate parsed data structure."""
+    def _validate_parsed_data(self, data: Dict[str, Any], result: ValidationResult) -> Optional[TemplateData]:
+        """Validate parsed data structure, returning its TemplateData if present."""
+        template_data = None
+        
         # Check for required fields based on template type
         if 'template_type' in data:
             template_type = data['template_type']
-            if template_type not in ['page', 'index', 'content']:
+            if not isinstance(template_type, str) or template_type not in _TEMPLATE_TYPES:
                 result.add_warning(f"Unknown template type: {template_type}")
         
         # Validate template data if present
@@ -227,6 +348,8 @@ class DataProcessor:
         # Check for content field
         if 'content' not in data and 'text' not in data:
             result.add_warning("No content or text field found")
+        
+        return template_data
     
     def determine_template_type(self, data: Dict[str, Any], file_path: Optional[str] = None) -> str:
         """
@@ -242,7 +365,7 @@ class DataProcessor:
         # Check explicit template_type in data
         if 'template_type' in data:
             template_type = data['template_type'].lower()
-            if template_type in ['page', 'index', 'content']:
+            if template_type in _TEMPLATE_TYPES:
                 return template_type
         
         # Infer from file path
@@ -252,21 +375,21 @@ class DataProcessor:
                 if any(keyword in file_path_lower for keyword in keywords):
                     return template_type
         
-        # Infer from data structure
-        if 'items' in data or 'list' in data:
+        # Infer from data structure; product keys and the default both mean 'page'
+        if not _INDEX_KEYS.isdisjoint(data.keys()):
             return 'index'
-        elif 'product_code' in data or 'product_name' in data:
-            return 'page'
         
-        # Default to page
         return 'page'
     
-    def process_data(self, input_data: InputData) -> ProcessedData:
+    def process_data(self, input_data: InputData,
+                     validation_result: Optional[ValidationResult] = None) -> ProcessedData:
         """
         Process InputData and return ProcessedData ready for template rendering.
         
         Args:
             input_data: InputData object to process
+            validation_result: Result of an earlier validate_data(input_data)
+                call, reused instead of validating again
             
         Returns:
             ProcessedData object with converted content and template variables
@@ -278,12 +401,7 @@ class DataProcessor:
             self.logger.info(f"Processing data from {input_data.source_type} source")
             
             # Validate input data
-            validation_result = self.validate_data(input_data)
-            if not validation_result.is_valid:
-                raise ProcessingError(
-                    "Data validation failed", 
-                    validation_result.get_error_summary()
-                )
+            validation_result, template_data = self._validate_for_processing(input_data, validation_result)
             
             # Apply character conversion to content
             converted_content = self.character_converter.apply_all_conversions(
@@ -291,53 +409,144 @@ class DataProcessor:
                 input_data.encoding
             )
             
-            # Extract template data if available
-            template_data = None
-            parsed_data = input_data.metadata.get('parsed_data', {})
-            
-            if 'template_data' in parsed_data:
-                template_data = TemplateData.from_dict(parsed_data['template_data'])
-            
-            # Determine template type
-            template_type = self.determine_template_type(
-                parsed_data, 
-                input_data.metadata.get('file_path')
+            processed_data = self._build_processed_data(
+                input_data, converted_content, validation_result, template_data
             )
             
-            # Determine output format
-            output_format = parsed_data.get('output_format', 'html')
-            if output_format not in ['html', 'php', 'mixed']:
-                output_format = 'html'
-            
-            # Create processed data
-            processed_data = ProcessedData.from_input_data(
-                input_data=input_data,
-                converted_content=converted_content,
-                template_data=template_data,
-                output_format=output_format,
-                template_type=template_type
-            )
+            self.logger.info(f"Data processing completed successfully")
+            return processed_data
             
-            # Add template variables from parsed data
-            if 'variables' in parsed_data:
-                processed_data.template_variables.update(parsed_data['variables'])
+        except ProcessingError:
+            raise
+        except Exception as e:
+            raise ProcessingError(f"Failed to process data", str(e))
+    
+    def process_many(self, inputs: Iterable[InputData]) -> List[ProcessedData]:
+        """
+        Process several InputData objects with one character conversion pass.
+        
+        The contents of inputs sharing an encoding are joined with a record
+        separator, converted once and split again, so the result matches
+        calling process_data() on each input in turn.
+        
+        Args:
+            inputs: InputData objects to process
             
-            # Add conversion statistics
-            conversion_stats = self.character_converter.get_conversion_stats(input_data.content)
-            processed_data.processing_metadata['conversion_stats'] = conversion_stats
+        Returns:
+            ProcessedData objects in input order
+            
+        Raises:
+            ProcessingError: If any input fails validation or processing
+        """
+        try:
+            inputs = list(inputs)
+            self.logger.info(f"Processing {len(inputs)} inputs")
             
-            # Add validation warnings if any
-            if validation_result.has_warnings():
-                processed_data.processing_metadata['warnings'] = validation_result.warnings
+            validations = [self._validate_for_processing(input_data) for input_data in inputs]
+            converted_contents = self._convert_many(
+                [input_data.content for input_data in inputs],
+                [input_data.encoding for input_data in inputs]
+            )
             
-            self.logger.info(f"Data processing completed successfully")
-            return processed_data
+            return [
+                self._build_processed_data(input_data, converted_content, validation_result, template_data)
+                for input_data, converted_content, (validation_result, template_data)
+                in zip(inputs, converted_contents, validations)
+            ]
             
         except ProcessingError:
             raise
         except Exception as e:
             raise ProcessingError(f"Failed to process data", str(e))
     
+    def _convert_many(self, contents: List[str], encodings: List[str]) -> List[str]:
+        """Apply character conversion to several texts, one call per encoding."""
+        converter = self.character_converter
+        rules_text = ''.join(
+            key + value
+            for rules in converter.conversion_rules.values()
+            for key, value in rules.items()
+        )
+        
+        # A separator already in the data or the rules would corrupt the split
+        if RECORD_SEPARATOR in rules_text or any(RECORD_SEPARATOR in content for content in contents):
+            return [
+                converter.apply_all_conversions(content, encoding)
+                for content, encoding in zip(contents, encodings)
+            ]
+        
+        # Conversion depends on the encoding, so only same-encoding texts share a pass
+        groups: Dict[str, List[int]] = {}
+        for index, encoding in enumerate(encodings):
+            groups.setdefault(encoding, []).append(index)
+        
+        converted_contents = [None] * len(contents)
+        for encoding, indices in groups.items():
+            converted = converter.apply_all_conversions(
+                RECORD_SEPARATOR.join([contents[index] for index in indices]), encoding
+            )
+            for index, converted_content in zip(indices, converted.split(RECORD_SEPARATOR)):
+                converted_contents[index] = converted_content
+        return converted_contents
+    
+    def _validate_for_processing(self, input_data: InputData,
+                                 validation_result: Optional[ValidationResult] = None
+                                 ) -> Tuple[ValidationResult, Optional[TemplateData]]:
+        """Validate input data, raising ProcessingError if it cannot be processed."""
+        template_data = None
+        if validation_result is None:
+            validation_result, template_data = self._validate(input_data)
+        if not validation_result.is_valid:
+            raise ProcessingError(
+                "Data validation failed", 
+                validation_result.get_error_summary()
+            )
+        return validation_result, template_data
+    
+    def _build_processed_data(self, input_data: InputData, converted_content: str,
+                              validation_result: ValidationResult,
+                              template_data: Optional[TemplateData] = None) -> ProcessedData:
+        """Assemble ProcessedData from input data and its converted content."""
+        # Extract template data if available (validation usually built it already)
+        parsed_data = input_data.metadata.get('parsed_data', {})
+        
+        if template_data is None and 'template_data' in parsed_data:
+            template_data = TemplateData.from_dict(parsed_data['template_data'])
+        
+        # Determine template type
+        template_type = self.determine_template_type(
+            parsed_data, 
+            input_data.metadata.get('file_path')
+        )
+        
+        # Determine output format
+        output_format = parsed_data.get('output_format', 'html')
+        if not isinstance(output_format, str) or output_format not in _OUTPUT_FORMATS:
+            output_format = 'html'
+        
+        # Create processed data
+        processed_data = ProcessedData.from_input_data(
+            input_data=input_data,
+            converted_content=converted_content,
+            template_data=template_data,
+            output_format=output_format,
+            template_type=template_type
+        )
+        
+        # Add template variables from parsed data
+        if 'variables' in parsed_data:
+            processed_data.template_variables.update(parsed_data['variables'])
+        
+        # Add conversion statistics
+        conversion_stats = self.character_converter.get_conversion_stats(input_data.content)
+        processed_data.processing_metadata['conversion_stats'] = conversion_stats
+        
+        # Add validation warnings if any
+        if validation_result.has_warnings():
+            processed_data.processing_metadata['warnings'] = validation_result.warnings
+        
+        return processed_data
+    
     def process_file(self, file_path: str) -> ProcessedData:
         """
         Process a file directly and return ProcessedData.
@@ -0,0 +1,51 @@
+"""
+Helpers for using orjson as a drop-in replacement for the json module.
+"""
+
+from typing import Any
+
+# orjson and json.dumps print floats identically only in this magnitude range
+# (outside it orjson writes 1e-05 as 0.00001 and 1e+16 as 1e16)
+_FLOAT_PLAIN_MIN = 1e-4
+_FLOAT_PLAIN_MAX = 1e16
+
+_SCALAR_TYPES = (str, int, bool, type(None))
+_KEY_TYPES = (str, int)
+
+
+def orjson_matches_stdlib(data: Any) -> bool:
+    """
+    Check whether orjson would serialize data exactly like json.dumps.
+    
+    Only exact JSON-native types qualify: dicts with str or int keys, lists,
+    tuples, strings, ints, bools, None and finite floats that both libraries
+    print the same way. Anything else (NaN, datetimes, subclasses, ...) should
+    go through the stdlib so output and errors stay unchanged.
+    
+    Args:
+        data: Data about to be serialized
+        
+    Returns:
+        True if orjson output would match json.dumps
+    """
+    stack = [data]
+    while stack:
+        value = stack.pop()
+        value_type = type(value)
+        if value_type in _SCALAR_TYPES:
+            continue
+        if value_type is float:
+            magnitude = abs(value)
+            if value == 0 or _FLOAT_PLAIN_MIN <= magnitude < _FLOAT_PLAIN_MAX:
+                continue
+            return False
+        if value_type is dict:
+            for key in value:
+                if type(key) not in _KEY_TYPES:
+                    return False
+            stack.extend(value.values())
+        elif value_type is list or value_type is tuple:
+            stack.extend(value)
+        else:
+            return False
+    return True
@@ -6,14 +6,126 @@ error handling, validation, and directory management.
 """
 
 import os
+import re
+import sys
 import json
-import yaml
+import mmap
+import errno
+import codecs
+import shutil
+import fnmatch
+import threading
+import time
 from pathlib import Path
-from typing import Dict, Any, Optional, Union, List
+from typing import Dict, Any, Optional, Union, List, Tuple
 from datetime import datetime
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 
 from atobusu.core.logging_config import get_logger
 from atobusu.core.exceptions import OutputError
+from atobusu.core.json_compat import orjson_matches_stdlib
+
+try:
+    import fcntl
+except ImportError:  # Not available on Windows
+    fcntl = None
+
+try:
+    import orjson
+except ImportError:  # Optional speedup (pip install atobusu[fast])
+    orjson = None
+
+# Linux ioctl request for copy-on-write file clones (btrfs, XFS, ...)
+FICLONE = 0x40049409
+
+# Bytes requested per os.sendfile() call when copying files in-kernel
+SENDFILE_BLOCK_SIZE = 1 << 23
+
+# O_DIRECT writes (direct_io=True): minimum payload size and block alignment
+DIRECT_IO_MIN_SIZE = 1 << 16
+DIRECT_IO_ALIGNMENT = 4096
+
+
+@lru_cache(maxsize=1)
+def _yaml_codec():
+    """
+    Import PyYAML on first use.
+    
+    Prefers the libyaml-backed safe dumper/loader when PyYAML was built with it.
+    
+    Returns:
+        Tuple of (yaml module, dumper class, loader class)
+    """
+    import yaml
+    try:
+        from yaml import CSafeDumper as Dumper, CSafeLoader as Loader
+    except ImportError:
+        from yaml import SafeDumper as Dumper, SafeLoader as Loader
+    return yaml, Dumper, Loader
+
+
+@lru_cache(maxsize=64)
+def _glob_re(pattern: str):
+    """Compile a file name glob pattern into a case-sensitive regex once."""
+    return re.compile(fnmatch.translate(pattern))
+
+
+# Upper bound on chunks passed to a single os.writev() call (POSIX IOV_MAX)
+WRITEV_MAX_CHUNKS = 1024
+
+# PHP open tags that make mixed content a PHP template (one scan instead of two)
+_PHP_TAG = re.compile(r'<\?(?:php|=)')
+_PHP_TAG_BYTES = re.compile(rb'<\?(?:php|=)')
+
+# Format-specific keyword option (and its default) forwarded by write_file/write_many
+_FORMAT_OPTIONS = {
+    'json': ('indent', 2),
+    'mixed': ('template_format', 'html'),
+}
+
+
+class _DirFdCache:
+    """
+    Directory descriptors kept open for the duration of a batch of writes
+    or deletions.
+    
+    Files are then opened (or unlinked) relative to their directory, so the
+    kernel resolves only the file name instead of walking the full path for
+    every file.
+    """
+    
+    supported = os.open in os.supports_dir_fd
+    unlink_supported = supported and os.unlink in os.supports_dir_fd
+    
+    __slots__ = ('_fds', '_lock')
+    
+    def __init__(self):
+        self._fds: Dict[Union[Path, str], int] = {}
+        self._lock = threading.Lock()
+    
+    def get(self, directory: Union[Path, str]) -> int:
+        """Return an open descriptor for directory, opening it on first use."""
+        with self._lock:
+            fd = self._fds.get(directory)
+            if fd is None:
+                fd = os.open(directory, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+                self._fds[directory] = fd
+            return fd
+    
+    def discard(self, directory: Union[Path, str]):
+        """Close and forget the descriptor for directory (e.g. after it was removed)."""
+        with self._lock:
+            fd = self._fds.pop(directory, None)
+            if fd is not None:
+                os.close(fd)
+    
+    def close(self):
+        """Close every descriptor opened for the batch."""
+        with self._lock:
+            for fd in self._fds.values():
+                os.close(fd)
+            self._fds.clear()
 
 
 class OutputWriter:
@@ -24,21 +136,38 @@ class OutputWriter:
     proper error handling, validation, and directory management.
     """
     
-    def __init__(self, output_dir: str = "output", create_dirs: bool = True):
+    def __init__(self, output_dir: str = "output", create_dirs: bool = True,
+                 direct_io: bool = False):
         """
         Initialize the output writer.
         
         Args:
             output_dir: Base directory for output files
             create_dirs: Whether to create directories automatically
+            direct_io: Write large files with O_DIRECT, bypassing the page
+                cache (Linux only; ignored where unsupported)
         """
         self.logger = get_logger(__name__)
         self.output_dir = Path(output_dir)
         self.create_dirs = create_dirs
+        self.direct_io = direct_io and hasattr(os, 'O_DIRECT')
+        
+        # String form of output_dir, joined directly on the per-file write path
+        self._output_dir_str = str(self.output_dir)
+        
+        # Directories (as path strings) already known to exist (skips repeated mkdir calls)
+        self._known_dirs = set()
+        
+        # Guards write_stats when files are written from several threads
+        self._stats_lock = threading.Lock()
         
         # Create output directory if it doesn't exist
         if self.create_dirs:
             self.output_dir.mkdir(parents=True, exist_ok=True)
+            self._known_dirs.add(self._output_dir_str)
+        
+        # Writability of the output tree, checked once (False if not created here)
+        self._dir_writable = self.create_dirs and os.access(self.output_dir, os.W_OK)
         
         # Supported file formats and their extensions
         self.format_extensions = {
@@ -49,6 +178,12 @@ class OutputWriter:
             'mixed': ['.html', '.htm', '.php', '.tpl']
         }
         
+        # Extension -> format lookup for auto-detection (first listed format wins)
+        self._ext_map = {}
+        for file_format, extensions in self.format_extensions.items():
+            for extension in extensions:
+                self._ext_map.setdefault(extension, file_format)
+        
         # Default encodings for different file types
         self.default_encodings = {
             'html': 'utf-8',
@@ -66,12 +201,14 @@ class OutputWriter:
             'last_write': None
         }
     
-    def write_html(self, content: str, output_path: str, encoding: str = 'utf-8') -> bool:
+    def write_html(self, content: Union[str, bytes], output_path: str,
+                   encoding: str = 'utf-8') -> bool:
         """
         Write HTML content to file.
         
         Args:
-            content: HTML content to write
+            content: HTML content to write (bytes are written as-is and must
+                already be in the target encoding)
             output_path: Path to output file
             encoding: File encoding (default: utf-8)
             
@@ -84,18 +221,11 @@ class OutputWriter:
         try:
             self.logger.debug(f"Writing HTML file: {output_path}")
             
-            # Validate content
-            if not isinstance(content, str):
-                raise OutputError("HTML content must be a string")
-            
-            # Ensure proper file extension
-            output_path = self._ensure_extension(output_path, 'html')
-            
-            # Write file
-            success = self._write_file(content, output_path, encoding)
+            output_path, payload = self._prepare_html(content, output_path, encoding)
+            success = self._write_file(payload, output_path, encoding)
             
             if success:
-                self._update_stats('html', len(content.encode(encoding)))
+                self._update_stats('html', len(payload))
                 self.logger.info(f"HTML file written successfully: {output_path}")
             
             return success
@@ -103,12 +233,14 @@ class OutputWriter:
         except Exception as e:
             raise OutputError(f"Failed to write HTML file: {output_path}", str(e))
     
-    def write_php(self, content: str, output_path: str, encoding: str = 'utf-8') -> bool:
+    def write_php(self, content: Union[str, bytes], output_path: str,
+                  encoding: str = 'utf-8') -> bool:
         """
         Write PHP content to file.
         
         Args:
-            content: PHP content to write
+            content: PHP content to write (bytes are written as-is and must
+                already be in the target encoding)
             output_path: Path to output file
             encoding: File encoding (default: utf-8)
             
@@ -121,18 +253,11 @@ class OutputWriter:
         try:
             self.logger.debug(f"Writing PHP file: {output_path}")
             
-            # Validate content
-            if not isinstance(content, str):
-                raise OutputError("PHP content must be a string")
-            
-            # Ensure proper file extension
-            output_path = self._ensure_extension(output_path, 'php')
-            
-            # Write file
-            success = self._write_file(content, output_path, encoding)
+            output_path, payload = self._prepare_php(content, output_path, encoding)
+            success = self._write_file(payload, output_path, encoding)
             
             if success:
-                self._update_stats('php', len(content.encode(encoding)))
+                self._update_stats('php', len(payload))
                 self.logger.info(f"PHP file written successfully: {output_path}")
             
             return success
@@ -141,7 +266,7 @@ class OutputWriter:
             raise OutputError(f"Failed to write PHP file: {output_path}", str(e))
     
     def write_json(self, data: Union[Dict[str, Any], List, str], output_path: str, 
-                   encoding: str = 'utf-8', indent: int = 2) -> bool:
+                   encoding: str = 'utf-8', indent: Optional[int] = 2) -> bool:
         """
         Write JSON data to file.
         
@@ -149,7 +274,7 @@ class OutputWriter:
             data: Data to write as JSON (dict, list, or JSON string)
             output_path: Path to output file
             encoding: File encoding (default: utf-8)
-            indent: JSON indentation (default: 2)
+            indent: JSON indentation (default: 2, None for compact output)
             
         Returns:
             True if successful, False otherwise
@@ -160,26 +285,11 @@ class OutputWriter:
         try:
             self.logger.debug(f"Writing JSON file: {output_path}")
             
-            # Convert data to JSON string if needed
-            if isinstance(data, str):
-                # Validate that it's valid JSON
-                try:
-                    json.loads(data)
-                    json_content = data
-                except json.JSONDecodeError:
-                    raise OutputError("Invalid JSON string provided")
-            else:
-                # Convert to JSON string
-                json_content = json.dumps(data, indent=indent, ensure_ascii=False)
-            
-            # Ensure proper file extension
-            output_path = self._ensure_extension(output_path, 'json')
-            
-            # Write file
-            success = self._write_file(json_content, output_path, encoding)
+            output_path, payload = self._prepare_json(data, output_path, encoding, indent)
+            success = self._write_file(payload, output_path, encoding)
             
             if success:
-                self._update_stats('json', len(json_content.encode(encoding)))
+                self._update_stats('json', len(payload))
                 self.logger.info(f"JSON file written successfully: {output_path}")
             
             return success
@@ -206,26 +316,11 @@ class OutputWriter:
         try:
             self.logger.debug(f"Writing YAML file: {output_path}")
             
-            # Convert data to YAML string if needed
-            if isinstance(data, str):
-                # Validate that it's valid YAML
-                try:
-                    yaml.safe_load(data)
-                    yaml_content = data
-                except yaml.YAMLError:
-                    raise OutputError("Invalid YAML string provided")
-            else:
-                # Convert to YAML string
-                yaml_content = yaml.dump(data, default_flow_style=False, allow_unicode=True)
-            
-            # Ensure proper file extension
-            output_path = self._ensure_extension(output_path, 'yaml')
-            
-            # Write file
-            success = self._write_file(yaml_content, output_path, encoding)
+            output_path, payload = self._prepare_yaml(data, output_path, encoding)
+            success = self._write_file(payload, output_path, encoding)
             
             if success:
-                self._update_stats('yaml', len(yaml_content.encode(encoding)))
+                self._update_stats('yaml', len(payload))
                 self.logger.info(f"YAML file written successfully: {output_path}")
             
             return success
@@ -233,13 +328,14 @@ class OutputWriter:
         except Exception as e:
             raise OutputError(f"Failed to write YAML file: {output_path}", str(e))
     
-    def write_mixed_template(self, content: str, output_path: str, 
+    def write_mixed_template(self, content: Union[str, bytes], output_path: str, 
                            template_format: str = 'html', encoding: str = 'utf-8') -> bool:
         """
         Write mixed template content to file.
         
         Args:
-            content: Mixed template content to write
+            content: Mixed template content to write (bytes are written as-is
+                and must already be in the target encoding)
             output_path: Path to output file
             template_format: Template format hint ('html', 'php', 'mixed')
             encoding: File encoding (default: utf-8)
@@ -253,21 +349,11 @@ class OutputWriter:
         try:
             self.logger.debug(f"Writing mixed template file: {output_path}")
             
-            # Validate content
-            if not isinstance(content, str):
-                raise OutputError("Mixed template content must be a string")
-            
-            # Determine appropriate extension based on format
-            if template_format == 'php' or '<?php' in content or '<?=' in content:
-                output_path = self._ensure_extension(output_path, 'php')
-            else:
-                output_path = self._ensure_extension(output_path, 'html')
-            
-            # Write file
-            success = self._write_file(content, output_path, encoding)
+            output_path, payload = self._prepare_mixed(content, output_path, encoding, template_format)
+            success = self._write_file(payload, output_path, encoding)
             
             if success:
-                self._update_stats('mixed', len(content.encode(encoding)))
+                self._update_stats('mixed', len(payload))
                 self.logger.info(f"Mixed template file written successfully: {output_path}")
             
             return success
@@ -275,6 +361,15 @@ class OutputWriter:
         except Exception as e:
             raise OutputError(f"Failed to write mixed template file: {output_path}", str(e))
     
+    # Write method per format, used by write_file()
+    _FORMAT_WRITERS = {
+        'html': write_html,
+        'php': write_php,
+        'json': write_json,
+        'yaml': write_yaml,
+        'mixed': write_mixed_template,
+    }
+    
     def write_file(self, content: str, output_path: str, file_format: str = 'auto', 
                    encoding: str = 'utf-8', **kwargs) -> bool:
         """
@@ -296,57 +391,547 @@ class OutputWriter:
                 file_format = self._detect_format(output_path)
             
             # Route to appropriate write method
-            if file_format == 'html':
-                return self.write_html(content, output_path, encoding)
-            elif file_format == 'php':
-                return self.write_php(content, output_path, encoding)
-            elif file_format == 'json':
-                return self.write_json(content, output_path, encoding, 
-                                     kwargs.get('indent', 2))
-            elif file_format == 'yaml':
-                return self.write_yaml(content, output_path, encoding)
-            elif file_format == 'mixed':
-                return self.write_mixed_template(content, output_path, 
-                                               kwargs.get('template_format', 'html'), encoding)
-            else:
+            writer = self._FORMAT_WRITERS.get(file_format)
+            if writer is None:
                 raise OutputError(f"Unsupported file format: {file_format}")
+            
+            return writer(self, content, output_path, encoding=encoding,
+                          **self._format_options(file_format, kwargs))
                 
         except OutputError:
             raise
         except Exception as e:
             raise OutputError(f"Failed to write file: {output_path}", str(e))
     
-    def _write_file(self, content: str, output_path: str, encoding: str) -> bool:
+    def write_many(self, items: List[Tuple[Any, str, str]], encoding: str = 'utf-8',
+                   max_workers: Optional[int] = None, **kwargs) -> List[bool]:
         """
-        Internal method to write content to file.
+        Write several files in one batch.
+        
+        Each item is prepared and written like write_file(), but write
+        statistics are updated once per format at the end of the batch.
+        Items must not depend on each other when written concurrently.
+        
+        Args:
+            items: List of (content, output_path, file_format) tuples
+            encoding: File encoding (default: utf-8)
+            max_workers: Write items on this many threads (default: sequential)
+            **kwargs: Additional arguments for specific formats
+            
+        Returns:
+            List of per-item success flags, in input order
+            
+        Raises:
+            OutputError: If an item cannot be prepared for writing
+        """
+        results = []
+        batch_stats: Dict[str, List[int]] = {}
+        dir_fds = _DirFdCache() if _DirFdCache.supported else None
+        
+        def write_item(item):
+            content, output_path, file_format = item
+            if file_format == 'auto':
+                file_format = self._detect_format(output_path)
+            
+            output_path, payload = self._prepare_output(
+                content, output_path, file_format, encoding, **kwargs
+            )
+            success = self._write_file(payload, output_path, encoding, dir_fds)
+            return file_format, success, len(payload)
+        
+        def collect(outcomes):
+            for file_format, success, byte_count in outcomes:
+                results.append(success)
+                if success:
+                    format_stats = batch_stats.setdefault(file_format, [0, 0])
+                    format_stats[0] += 1
+                    format_stats[1] += byte_count
+        
+        try:
+            if max_workers and max_workers > 1:
+                # File writes release the GIL, so independent items overlap
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    collect(executor.map(write_item, items))
+            else:
+                collect(map(write_item, items))
+            
+            self.logger.info(f"Batch write completed: {sum(results)}/{len(results)} files written")
+            return results
+            
+        except OutputError:
+            raise
+        except Exception as e:
+            raise OutputError("Failed to write file batch", str(e))
+        finally:
+            if dir_fds is not None:
+                dir_fds.close()
+            for file_format, (file_count, byte_count) in batch_stats.items():
+                self._update_stats(file_format, byte_count, file_count)
+    
+    def write_chunks(self, chunks: List[Union[str, bytes]], output_path: str,
+                     encoding: str = 'utf-8') -> bool:
+        """
+        Write content assembled from several pieces (e.g. header, body, footer).
+        
+        The pieces are written with os.writev() where available instead of
+        being joined into one string first. The file format for statistics
+        is detected from the output path.
+        
+        Repeated content can be passed as ``[fragment] * count``: each
+        distinct str piece is encoded once, and the kernel gathers every
+        repetition from that single buffer, so the repeated payload is never
+        built in memory.
+        
+        Args:
+            chunks: Content pieces in order (str pieces are encoded)
+            output_path: Path to output file
+            encoding: File encoding (default: utf-8)
+            
+        Returns:
+            True if successful, False otherwise
+            
+        Raises:
+            OutputError: If writing fails
+        """
+        try:
+            self.logger.debug(f"Writing {len(chunks)} chunks to file: {output_path}")
+            
+            # Encode each distinct str object once (chunks keeps them alive, so ids are stable)
+            encoded: Dict[int, bytes] = {}
+            payload = []
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    data = encoded.get(id(chunk))
+                    if data is None:
+                        data = encoded[id(chunk)] = chunk.encode(encoding)
+                    chunk = data
+                payload.append(chunk)
+            success = self._write_file(payload, output_path, encoding)
+            
+            if success:
+                byte_count = sum(len(chunk) for chunk in payload)
+                self._update_stats(self._detect_format(output_path), byte_count)
+                self.logger.info(f"Chunked file written successfully: {output_path}")
+            
+            return success
+            
+        except Exception as e:
+            raise OutputError(f"Failed to write chunked file: {output_path}", str(e))
+    
+    def write_with_backup(self, content: Any, output_path: str, file_format: str = 'auto',
+                          encoding: str = 'utf-8', backup_suffix: str = ".bak",
+                          **kwargs) -> bool:
+        """
+        Write a file and a backup snapshot of the same version.
+        
+        The content is prepared and encoded once and the same buffer is
+        written to both files, so the backup never reads the original back
+        from disk. The backup is an independent file (not a hard link), so
+        later rewrites of the original leave it untouched.
         
         Args:
             content: Content to write
             output_path: Path to output file
+            file_format: File format ('html', 'php', 'json', 'yaml', 'mixed', 'auto')
+            encoding: File encoding (default: utf-8)
+            backup_suffix: Suffix appended to the output path for the backup
+            **kwargs: Additional arguments for specific formats
+            
+        Returns:
+            True if both files were written, False otherwise
+            
+        Raises:
+            OutputError: If the content cannot be prepared for writing
+        """
+        try:
+            if file_format == 'auto':
+                file_format = self._detect_format(output_path)
+            
+            output_path, payload = self._prepare_output(
+                content, output_path, file_format, encoding, **kwargs
+            )
+            
+            if not self._write_file(payload, output_path, encoding):
+                return False
+            self._update_stats(file_format, len(payload))
+            
+            backup_path = output_path + backup_suffix
+            success = self._write_file(payload, backup_path, encoding)
+            if success:
+                self.logger.info(f"File written with backup: {output_path} -> {backup_path}")
+            
+            return success
+            
+        except OutputError:
+            raise
+        except Exception as e:
+            raise OutputError(f"Failed to write file with backup: {output_path}", str(e))
+    
+    def _prepare_output(self, content: Any, output_path: str, file_format: str,
+                        encoding: str, **kwargs) -> Tuple[str, bytes]:
+        """Prepare content for any supported format."""
+        preparer = self._FORMAT_PREPARERS.get(file_format)
+        if preparer is None:
+            raise OutputError(f"Unsupported file format: {file_format}")
+        
+        return preparer(self, content, output_path, encoding=encoding,
+                        **self._format_options(file_format, kwargs))
+    
+    @staticmethod
+    def _format_options(file_format: str, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Pick the keyword option a format's writer accepts out of kwargs."""
+        option = _FORMAT_OPTIONS.get(file_format)
+        if option is None:
+            return {}
+        name, default = option
+        return {name: kwargs.get(name, default)}
+    
+    @staticmethod
+    def _encode_text(content: Union[str, bytes], encoding: str, label: str) -> bytes:
+        """
+        Encode text content once for both the write and the statistics.
+        
+        Already-encoded content (bytes, bytearray or memoryview) is passed
+        through unchanged, so callers writing the same content repeatedly
+        can encode it a single time themselves.
+        
+        Args:
+            content: Text or already-encoded content
+            encoding: Encoding applied to str content
+            label: Content kind used in the error message
+            
+        Returns:
+            Encoded content
+            
+        Raises:
+            OutputError: If content is neither text nor bytes
+        """
+        if isinstance(content, str):
+            return content.encode(encoding)
+        if isinstance(content, (bytes, bytearray)):
+            return content
+        if isinstance(content, memoryview):
+            return content.cast('B')
+        raise OutputError(f"{label} content must be a string or bytes")
+    
+    def _prepare_html(self, content: Union[str, bytes], output_path: str,
+                      encoding: str) -> Tuple[str, bytes]:
+        """Validate and encode HTML content, ensuring an HTML extension."""
+        payload = self._encode_text(content, encoding, "HTML")
+        return self._ensure_extension(output_path, 'html'), payload
+    
+    def _prepare_php(self, content: Union[str, bytes], output_path: str,
+                     encoding: str) -> Tuple[str, bytes]:
+        """Validate and encode PHP content, ensuring a PHP extension."""
+        payload = self._encode_text(content, encoding, "PHP")
+        return self._ensure_extension(output_path, 'php'), payload
+    
+    def _prepare_json(self, data: Union[Dict[str, Any], List, str], output_path: str,
+                      encoding: str, indent: Optional[int] = 2) -> Tuple[str, bytes]:
+        """Serialize (or validate) and encode JSON data, ensuring a JSON extension."""
+        # Convert data to JSON string if needed
+        if isinstance(data, str):
+            # Validate that it's valid JSON
+            try:
+                json.loads(data)
+                json_content = data
+            except json.JSONDecodeError:
+                raise OutputError("Invalid JSON string provided")
+        else:
+            payload = self._dump_json(data, indent)
+            if payload is not None:
+                if codecs.lookup(encoding).name != 'utf-8':
+                    payload = payload.decode('utf-8').encode(encoding)
+                return self._ensure_extension(output_path, 'json'), payload
+            
+            # Convert to JSON string (compact separators when not indenting)
+            separators = (',', ':') if indent is None else None
+            json_content = json.dumps(data, indent=indent, ensure_ascii=False,
+                                      separators=separators)
+        
+        return self._ensure_extension(output_path, 'json'), json_content.encode(encoding)
+    
+    @staticmethod
+    def _dump_json(data: Any, indent: Optional[int]) -> Optional[bytes]:
+        """
+        Serialize data to UTF-8 JSON bytes with orjson when it can match json.dumps.
+        
+        Args:
+            data: Data to serialize
+            indent: Indentation width (orjson supports only 2 or None)
+            
+        Returns:
+            Encoded JSON, or None if the stdlib serializer should be used
+        """
+        if orjson is None or indent not in (2, None) or not orjson_matches_stdlib(data):
+            return None
+        
+        option = orjson.OPT_NON_STR_KEYS
+        if indent == 2:
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(data, option=option)
+        except TypeError:
+            # orjson.JSONEncodeError (e.g. ints beyond 64 bits); let the stdlib handle it
+            return None
+    
+    def _prepare_yaml(self, data: Union[Dict[str, Any], List, str], output_path: str,
+                      encoding: str) -> Tuple[str, bytes]:
+        """Serialize (or validate) and encode YAML data, ensuring a YAML extension."""
+        yaml, yaml_dumper, yaml_loader = _yaml_codec()
+        
+        # Convert data to YAML string if needed
+        if isinstance(data, str):
+            # Validate that it's valid YAML
+            try:
+                yaml.load(data, Loader=yaml_loader)
+                payload = data.encode(encoding)
+            except yaml.YAMLError:
+                raise OutputError("Invalid YAML string provided")
+        elif codecs.lookup(encoding).name == 'utf-8':
+            # The emitter encodes as it goes and returns bytes directly
+            # (libyaml only emits UTF-8/UTF-16, so other encodings go via str)
+            payload = yaml.dump(data, Dumper=yaml_dumper, default_flow_style=False,
+                                allow_unicode=True, encoding='utf-8')
+        else:
+            # Convert to YAML string
+            yaml_content = yaml.dump(data, Dumper=yaml_dumper, default_flow_style=False,
+                                     allow_unicode=True)
+            payload = yaml_content.encode(encoding)
+        
+        return self._ensure_extension(output_path, 'yaml'), payload
+    
+    def _prepare_mixed(self, content: Union[str, bytes], output_path: str, encoding: str,
+                       template_format: str = 'html') -> Tuple[str, bytes]:
+        """Validate and encode mixed content, choosing a PHP or HTML extension."""
+        payload = self._encode_text(content, encoding, "Mixed template")
+        
+        # Look for PHP tags in the text, or in the (ASCII-compatible) encoded bytes
+        if template_format == 'php':
+            is_php = True
+        elif isinstance(content, str):
+            is_php = _PHP_TAG.search(content) is not None
+        else:
+            is_php = _PHP_TAG_BYTES.search(payload) is not None
+        
+        # Determine appropriate extension based on format
+        if is_php:
+            output_path = self._ensure_extension(output_path, 'php')
+        else:
+            output_path = self._ensure_extension(output_path, 'html')
+        
+        return output_path, payload
+    
+    # Prepare method per format, used by _prepare_output()
+    _FORMAT_PREPARERS = {
+        'html': _prepare_html,
+        'php': _prepare_php,
+        'json': _prepare_json,
+        'yaml': _prepare_yaml,
+        'mixed': _prepare_mixed,
+    }
+    
+    def _write_file(self, content: Union[str, bytes, List[bytes]], output_path: str,
+                    encoding: str, dir_fds: Optional['_DirFdCache'] = None) -> bool:
+        """
+        Internal method to write content to file.
+        
+        The payload is already one encoded buffer, so it is handed to
+        os.write() on a raw file descriptor; a buffered file object would
+        only copy it (small payloads) or pass it straight through (large).
+        A list of byte chunks is gathered into the file with os.writev().
+        
+        Args:
+            content: Content to write (str is encoded with the given encoding,
+                a list of bytes chunks is written in order)
+            output_path: Path to output file
             encoding: File encoding
+            dir_fds: Open directory descriptors shared by a batch of writes
             
         Returns:
             True if successful, False otherwise
         """
         try:
-            # Resolve full output path
-            full_path = self._resolve_output_path(output_path)
+            # Resolve full output path on plain strings (no Path objects per file)
+            if os.path.isabs(output_path):
+                full_path = output_path
+            else:
+                full_path = os.path.join(self._output_dir_str, output_path)
+            parent, name = os.path.split(full_path)
             
             # Create directory if needed
             if self.create_dirs:
-                full_path.parent.mkdir(parents=True, exist_ok=True)
+                self._ensure_directory(parent)
             
-            # Write file
-            with open(full_path, 'w', encoding=encoding) as f:
-                f.write(content)
+            if isinstance(content, list):
+                data = content
+                byte_count = sum(len(chunk) for chunk in content)
+            else:
+                data = content.encode(encoding) if isinstance(content, str) else content
+                byte_count = len(data)
             
-            self.logger.debug(f"File written: {full_path} ({len(content)} characters)")
+            # Write file
+            try:
+                self._write_target(full_path, parent, name, data, dir_fds)
+            except FileNotFoundError:
+                if not self.create_dirs:
+                    raise
+                # The directory was removed since it was cached as existing:
+                # forget it, recreate it and retry once
+                self._known_dirs.discard(parent)
+                if dir_fds is not None:
+                    dir_fds.discard(parent)
+                self._ensure_directory(parent)
+                self._write_target(full_path, parent, name, data, dir_fds)
+            
+            self.logger.debug(f"File written: {full_path} ({byte_count} bytes)")
             return True
             
         except Exception as e:
             self.logger.error(f"Failed to write file {output_path}: {e}")
             return False
     
+    def _write_target(self, full_path: str, parent: str, name: str,
+                      data: Union[bytes, List[bytes]], dir_fds: Optional['_DirFdCache']):
+        """Write encoded data (or a list of byte chunks) to full_path."""
+        if dir_fds is not None:
+            target, dir_fd = name, dir_fds.get(parent)
+        else:
+            target, dir_fd = full_path, None
+        
+        if isinstance(data, list):
+            if hasattr(os, 'writev'):
+                self._writev_direct(target, data, dir_fd=dir_fd)
+            else:
+                self._write_direct(target, b''.join(data), dir_fd=dir_fd)
+        else:
+            self._write_direct(target, data, dir_fd=dir_fd)
+    
+    def _ensure_directory(self, dir_path: Union[Path, str]):
+        """Create directory (and parents) unless it is already known to exist."""
+        dir_path = os.fspath(dir_path)
+        if dir_path in self._known_dirs:
+            return
+        os.makedirs(dir_path, exist_ok=True)
+        self._known_dirs.add(dir_path)
+    
+    def _clone_file(self, source: Path, destination: Path):
+        """
+        Copy a file, sharing data blocks via a reflink where the filesystem allows.
+        
+        Both files are opened once; without a reflink the data is moved
+        in-kernel with os.sendfile() on Linux, and only other platforms
+        (or a failed sendfile) copy through a user-space buffer.
+        """
+        if not sys.platform.startswith('linux'):
+            shutil.copy2(source, destination)
+            return
+        
+        with open(source, 'rb') as src, open(destination, 'wb') as dst:
+            if not self._reflink(src.fileno(), dst.fileno()):
+                offset = self._sendfile(src.fileno(), dst.fileno())
+                if offset is not None:
+                    src.seek(offset)
+                    dst.seek(offset)
+                    shutil.copyfileobj(src, dst)
+        
+        shutil.copystat(source, destination)
+    
+    @staticmethod
+    def _reflink(src_fd: int, dst_fd: int) -> bool:
+        """Clone src_fd into dst_fd with FICLONE; False if the filesystem can't."""
+        if fcntl is None:
+            return False
+        try:
+            fcntl.ioctl(dst_fd, FICLONE, src_fd)
+            return True
+        except OSError:
+            return False
+    
+    @staticmethod
+    def _sendfile(src_fd: int, dst_fd: int) -> Optional[int]:
+        """
+        Copy src_fd to dst_fd with os.sendfile().
+        
+        Returns:
+            None when the whole file was copied, otherwise the offset
+            reached before sendfile failed (the caller finishes the copy)
+        """
+        offset = 0
+        try:
+            while True:
+                sent = os.sendfile(dst_fd, src_fd, offset, SENDFILE_BLOCK_SIZE)
+                if sent == 0:
+                    return None
+                offset += sent
+        except (OSError, AttributeError):
+            return offset
+    
+    def _writev_direct(self, full_path: Union[Path, str], chunks: List[bytes],
+                       dir_fd: Optional[int] = None):
+        """Write byte chunks to a file with as few writev() calls as possible."""
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+        fd = os.open(full_path, flags, 0o666, dir_fd=dir_fd)
+        try:
+            views = [memoryview(chunk) for chunk in chunks if chunk]
+            index = 0
+            while index < len(views):
+                written = os.writev(fd, views[index:index + WRITEV_MAX_CHUNKS])
+                
+                # Skip fully written chunks and trim a partially written one
+                while index < len(views) and written >= len(views[index]):
+                    written -= len(views[index])
+                    index += 1
+                if written:
+                    views[index] = views[index][written:]
+        finally:
+            os.close(fd)
+    
+    def _write_direct(self, full_path: Union[Path, str], data: bytes, dir_fd: Optional[int] = None):
+        """Write bytes to a file through a raw file descriptor (relative to dir_fd if given)."""
+        if self.direct_io and len(data) >= DIRECT_IO_MIN_SIZE:
+            try:
+                self._write_unbuffered(full_path, data, dir_fd)
+                return
+            except OSError as e:
+                # EINVAL: the filesystem (e.g. tmpfs) does not support O_DIRECT
+                if e.errno != errno.EINVAL:
+                    raise
+        
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, 'O_BINARY', 0)
+        fd = os.open(full_path, flags, 0o666, dir_fd=dir_fd)
+        try:
+            view = memoryview(data)
+            while view:
+                written = os.write(fd, view)
+                view = view[written:]
+        finally:
+            os.close(fd)
+    
+    def _write_unbuffered(self, full_path: Union[Path, str], data: bytes,
+                          dir_fd: Optional[int] = None):
+        """
+        Write bytes with O_DIRECT, bypassing the page cache.
+        
+        O_DIRECT needs block-aligned buffers and lengths, so the data is
+        copied into a page-aligned anonymous mapping padded to the block
+        size, and the file is truncated back to the real length afterwards.
+        """
+        size = len(data)
+        aligned_size = -(-size // DIRECT_IO_ALIGNMENT) * DIRECT_IO_ALIGNMENT
+        flags = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | os.O_DIRECT
+        fd = os.open(full_path, flags, 0o666, dir_fd=dir_fd)
+        try:
+            with mmap.mmap(-1, aligned_size) as buffer:
+                buffer[:size] = data
+                offset = 0
+                while offset < aligned_size:
+                    with memoryview(buffer)[offset:] as view:
+                        offset += os.write(fd, view)
+            os.ftruncate(fd, size)
+        finally:
+            os.close(fd)
+    
     def _resolve_output_path(self, output_path: str) -> Path:
         """Resolve output path relative to output directory."""
         path = Path(output_path)
@@ -356,43 +941,47 @@ class OutputWriter:
         else:
             return self.output_dir / path
     
+    def _is_within_output_dir(self, full_path: Path) -> bool:
+        """Check whether a resolved path lies inside the output directory."""
+        return '..' not in full_path.parts and (
+            full_path.parent == self.output_dir or self.output_dir in full_path.parents
+        )
+    
     def _ensure_extension(self, output_path: str, file_format: str) -> str:
         """Ensure file has appropriate extension for format."""
-        path = Path(output_path)
+        root, extension = os.path.splitext(output_path)
         
         # Get expected extensions for format
         expected_extensions = self.format_extensions.get(file_format, [])
         
-        if expected_extensions and path.suffix.lower() not in expected_extensions:
-            # Add default extension
-            default_ext = expected_extensions[0]
-            output_path = str(path.with_suffix(default_ext))
+        if expected_extensions and extension.lower() not in expected_extensions:
+            # Replace (or add) the default extension
+            output_path = root + expected_extensions[0]
         
         return output_path
     
     def _detect_format(self, output_path: str) -> str:
         """Detect file format from extension."""
-        path = Path(output_path)
-        extension = path.suffix.lower()
-        
-        for file_format, extensions in self.format_extensions.items():
-            if extension in extensions:
-                return file_format
+        extension = os.path.splitext(output_path)[1].lower()
         
         # Default to mixed if unknown
-        return 'mixed'
+        return self._ext_map.get(extension, 'mixed')
     
-    def _update_stats(self, file_format: str, byte_count: int):
+    def _update_stats(self, file_format: str, byte_count: int, file_count: int = 1):
         """Update write statistics."""
-        self.write_stats['files_written'] += 1
-        self.write_stats['total_bytes'] += byte_count
-        self.write_stats['last_write'] = datetime.now().isoformat()
-        
-        if file_format not in self.write_stats['formats']:
-            self.write_stats['formats'][file_format] = {'count': 0, 'bytes': 0}
-        
-        self.write_stats['formats'][file_format]['count'] += 1
-        self.write_stats['formats'][file_format]['bytes'] += byte_count
+        with self._stats_lock:
+            stats = self.write_stats
+            stats['files_written'] += file_count
+            stats['total_bytes'] += byte_count
+            # Kept as a raw timestamp; get_write_stats() formats it on request
+            stats['last_write'] = time.time()
+            
+            format_stats = stats['formats'].get(file_format)
+            if format_stats is None:
+                format_stats = stats['formats'][file_format] = {'count': 0, 'bytes': 0}
+            
+            format_stats['count'] += file_count
+            format_stats['bytes'] += byte_count
     
     def create_directory(self, dir_path: str) -> bool:
         """
@@ -407,6 +996,7 @@ class OutputWriter:
         try:
             full_path = self._resolve_output_path(dir_path)
             full_path.mkdir(parents=True, exist_ok=True)
+            self._known_dirs.add(str(full_path))
             
             self.logger.info(f"Directory created: {full_path}")
             return True
@@ -441,6 +1031,14 @@ class OutputWriter:
             # Check if file exists
             result['exists'] = full_path.exists()
             
+            # Paths inside the writable output tree need no further access checks
+            if self._dir_writable and self._is_within_output_dir(full_path):
+                self._ensure_directory(full_path.parent)
+                result['directory_exists'] = True
+                result['is_writable'] = True
+                result['is_valid'] = True
+                return result
+            
             # Check if directory exists
             result['directory_exists'] = full_path.parent.exists()
             
@@ -466,6 +1064,42 @@ class OutputWriter:
         
         return result
     
+    def verify(self, output_path: str, expected: Union[str, bytes],
+               encoding: str = 'utf-8') -> bool:
+        """
+        Check whether a written file contains the expected content.
+        
+        The file is memory-mapped and searched at the byte level, so it is
+        neither copied into a Python bytes object nor decoded.
+        
+        Args:
+            output_path: Path to the written file
+            expected: Content to look for (str is encoded with encoding)
+            encoding: Encoding used for str content (default: utf-8)
+            
+        Returns:
+            True if the file contains expected, False otherwise (including
+            when the file cannot be read)
+        """
+        needle = expected.encode(encoding) if isinstance(expected, str) else expected
+        
+        try:
+            full_path = self._resolve_output_path(output_path)
+            fd = os.open(full_path, os.O_RDONLY | getattr(os, 'O_BINARY', 0))
+            try:
+                size = os.fstat(fd).st_size
+                if size == 0:
+                    # Empty files cannot be mapped
+                    return not needle
+                with mmap.mmap(fd, size, access=mmap.ACCESS_READ) as mapped:
+                    return mapped.find(needle) != -1
+            finally:
+                os.close(fd)
+            
+        except Exception as e:
+            self.logger.error(f"Failed to verify output file {output_path}: {e}")
+            return False
+    
     def get_write_stats(self) -> Dict[str, Any]:
         """
         Get file writing statistics.
@@ -473,16 +1107,25 @@ class OutputWriter:
         Returns:
             Dictionary with write statistics
         """
-        return self.write_stats.copy()
+        with self._stats_lock:
+            stats = self.write_stats.copy()
+            stats['formats'] = {
+                file_format: counts.copy() for file_format, counts in stats['formats'].items()
+            }
+        
+        if stats['last_write'] is not None:
+            stats['last_write'] = datetime.fromtimestamp(stats['last_write']).isoformat()
+        return stats
     
     def reset_stats(self):
         """Reset write statistics."""
-        self.write_stats = {
-            'files_written': 0,
-            'total_bytes': 0,
-            'formats': {},
-            'last_write': None
-        }
+        with self._stats_lock:
+            self.write_stats = {
+                'files_written': 0,
+                'total_bytes': 0,
+                'formats': {},
+                'last_write': None
+            }
         self.logger.info("Write statistics reset")
     
     def list_output_files(self, pattern: str = "*") -> List[str]:
@@ -499,18 +1142,98 @@ class OutputWriter:
             if not self.output_dir.exists():
                 return []
             
-            files = []
-            for file_path in self.output_dir.rglob(pattern):
-                if file_path.is_file():
-                    relative_path = file_path.relative_to(self.output_dir)
-                    files.append(str(relative_path))
-            
-            return sorted(files)
+            return sorted(self._match_output_files(pattern))
             
         except Exception as e:
             self.logger.error(f"Failed to list output files: {e}")
             return []
     
+    def _match_output_files(self, pattern: str) -> List[str]:
+        """Return paths (relative to output directory) of files matching pattern."""
+        # Patterns with directory parts need full glob semantics
+        if '/' in pattern or os.sep in pattern:
+            return [str(file_path.relative_to(self.output_dir))
+                    for file_path in self.output_dir.rglob(pattern) if file_path.is_file()]
+        
+        match = _glob_re(pattern).match
+        return [rel_path for rel_path, file_name in self._walk_output_files()
+                if match(file_name)]
+    
+    def _walk_output_files(self):
+        """
+        Yield every file below the output directory.
+        
+        Walks with os.scandir() directly: entry types come from the cached
+        directory listing and relative paths are built by prefixing, so no
+        per-directory relpath() or per-file Path objects are needed.
+        
+        Yields:
+            Tuples of (path relative to output directory, file name)
+        """
+        pending = [('', self._output_dir_str)]
+        while pending:
+            rel_dir, dir_path = pending.pop()
+            try:
+                with os.scandir(dir_path) as entries:
+                    for entry in entries:
+                        rel_path = rel_dir + entry.name
+                        try:
+                            is_dir = entry.is_dir()
+                            # Follows symlinks, so dangling links and special
+                            # files are skipped as with Path.is_file()
+                            is_file = not is_dir and entry.is_file()
+                        except OSError:
+                            continue
+                        
+                        # Like os.walk(), symlinked directories are not followed
+                        if is_file:
+                            yield rel_path, entry.name
+                        elif is_dir and not entry.is_symlink():
+                            pending.append((rel_path + os.sep, entry.path))
+            except OSError:
+                continue
+    
+    def list_output_files_multi(self, patterns: List[str]) -> Dict[str, List[str]]:
+        """
+        List files in output directory for several patterns in one walk.
+        
+        Args:
+            patterns: File name patterns to match (e.g. ["*.html", "*.php"])
+            
+        Returns:
+            Dictionary mapping each pattern to its sorted list of file paths
+            relative to output directory
+        """
+        result = {pattern: [] for pattern in patterns}
+        
+        try:
+            if not self.output_dir.exists():
+                return result
+            
+            # Patterns with directory parts need full glob semantics
+            name_patterns = []
+            for pattern in result:
+                if '/' in pattern or os.sep in pattern:
+                    result[pattern] = self.list_output_files(pattern)
+                else:
+                    name_patterns.append(pattern)
+            
+            if name_patterns:
+                matchers = [(pattern, _glob_re(pattern).match) for pattern in name_patterns]
+                for rel_path, file_name in self._walk_output_files():
+                    for pattern, match in matchers:
+                        if match(file_name):
+                            result[pattern].append(rel_path)
+                
+                for pattern in name_patterns:
+                    result[pattern].sort()
+            
+            return result
+            
+        except Exception as e:
+            self.logger.error(f"Failed to list output files: {e}")
+            return {pattern: [] for pattern in patterns}
+    
     def cleanup_output_dir(self, pattern: str = "*", dry_run: bool = True) -> Dict[str, Any]:
         """
         Clean up output directory.
@@ -533,18 +1256,28 @@ class OutputWriter:
             if not self.output_dir.exists():
                 return result
             
-            files_to_delete = list(self.output_dir.rglob(pattern))
-            result['files_found'] = len([f for f in files_to_delete if f.is_file()])
+            files_to_delete = self._match_output_files(pattern)
+            result['files_found'] = len(files_to_delete)
             
             if not dry_run:
-                for file_path in files_to_delete:
-                    if file_path.is_file():
+                # Unlink by name relative to each directory, opened once per batch
+                dir_fds = _DirFdCache() if _DirFdCache.unlink_supported else None
+                try:
+                    for relative_path in files_to_delete:
+                        file_path = os.path.join(self._output_dir_str, relative_path)
                         try:
-                            file_path.unlink()
+                            if dir_fds is not None:
+                                parent, name = os.path.split(file_path)
+                                os.unlink(name, dir_fd=dir_fds.get(parent))
+                            else:
+                                os.unlink(file_path)
                             result['files_deleted'] += 1
-                            result['deleted_files'].append(str(file_path.relative_to(self.output_dir)))
+                            result['deleted_files'].append(relative_path)
                         except Exception as e:
                             result['errors'].append(f"Failed to delete {file_path}: {e}")
+                finally:
+                    if dir_fds is not None:
+                        dir_fds.close()
             
             action = "Would delete" if dry_run else "Deleted"
             self.logger.info(f"{action} {result['files_found']} files from output directory")
@@ -574,9 +1307,8 @@ class OutputWriter:
             
             backup_path = full_path.with_suffix(full_path.suffix + backup_suffix)
             
-            # Copy file content
-            content = full_path.read_text(encoding='utf-8')
-            backup_path.write_text(content, encoding='utf-8')
+            # Copy file content byte-for-byte
+            self._clone_file(full_path, backup_path)
             
             self.logger.info(f"Backup created: {backup_path}")
             return True
@@ -6,13 +6,39 @@ and PHP function parameter replacement while preserving syntax.
 """
 
 import re
+from collections import OrderedDict
+from functools import lru_cache
 from typing import Dict, Any, Optional, List, Tuple
 from datetime import datetime, date
+from decimal import Decimal
 from pathlib import Path
+from types import MappingProxyType
 
 from atobusu.core.logging_config import get_logger
 from atobusu.core.exceptions import ProcessingError, TemplateError
 
+try:
+    import re2
+except ImportError:  # Optional speedup (pip install atobusu[fast])
+    re2 = None
+
+
+# Value types that cannot change after creation, so they can stand for
+# themselves in a render cache key (exact types; subclasses may be mutable)
+_IMMUTABLE_SCALAR_TYPES = frozenset({str, int, float, bool, type(None), date, datetime, Decimal})
+
+
+@lru_cache(maxsize=1024)
+def _parse_variable_name(name: str) -> Tuple[str, Optional[Tuple[str, ...]]]:
+    """
+    Parse a placeholder name once: the stripped name and, for dotted names,
+    its path parts (None for plain names).
+    """
+    variable_name = name.strip()
+    if '.' in variable_name:
+        return variable_name, tuple(variable_name.split('.'))
+    return variable_name, None
+
 
 class PlaceholderProcessor:
     """
@@ -22,10 +48,51 @@ class PlaceholderProcessor:
     and comprehensive pattern recognition and replacement.
     """
     
-    def __init__(self):
-        """Initialize the placeholder processor."""
+    # Literal placeholders replaced with the product code (in priority order)
+    PRODUCT_CODE_PLACEHOLDERS = (
+        '商品コード', 'product_code', 'PRODUCT_CODE',
+        '製品コード', 'item_code', 'code'
+    )
+    
+    # Data keys a prod_info() first parameter may be filled from (in priority order)
+    PHP_PARAM_KEYS = ('product_name', 'category', 'reviewer_name')
+    
+    # Kinds whose own pattern is embedded in the fused pattern, with the
+    # number of capture groups (parameters or variable name) each must have
+    _FUSED_VARIABLE_KINDS = {
+        'php_function': 2,
+        'generic_placeholder': 1,
+        'template_variable': 1,
+    }
+    
+    # Named date placeholders looked up in the 'dates' mapping
+    NAMED_DATE_PLACEHOLDERS = (
+        'post_date', 'update_date', 'publish_date', 'review_date', 'short_date'
+    )
+    
+    # Named date placeholders filled from the current date
+    CURRENT_DATE_PLACEHOLDERS = {
+        'current_date': 'full',
+        'current_short_date': 'short'
+    }
+    
+    def __init__(self, max_cache_size: int = 256):
+        """
+        Initialize the placeholder processor.
+        
+        Args:
+            max_cache_size: Maximum number of rendered results kept by
+                apply_all_replacements (0 disables the cache)
+        """
         self.logger = get_logger(__name__)
         
+        # Rendered results (bounded LRU) keyed by content, day and data fingerprint
+        self.max_cache_size = max_cache_size
+        self._render_cache: Dict[Tuple, str] = OrderedDict()
+        
+        # Content split into literal and placeholder segments (bounded LRU)
+        self._segment_cache: Dict[str, Tuple[Tuple[str, ...], Tuple[Tuple, ...], Tuple[int, ...]]] = OrderedDict()
+        
         # Placeholder patterns based on the design document
         self.placeholder_patterns = {
             'product_code': r'[^/]*コード[^/]*',  # Matches product code patterns
@@ -84,9 +151,107 @@ class PlaceholderProcessor:
                 r'\$\{([^}]+)\}'
             )
             
+            # Literal text every match of a built-in pattern contains
+            self._pattern_anchors = {
+                'product_code': 'コード',
+                'php_function': '<?=prod_info(',
+                'generic_placeholder': '{{',
+                'template_variable': '${',
+            }
+            
+            # Literal product code placeholders, matched in one pass
+            product_codes = '|'.join(map(re.escape, self.PRODUCT_CODE_PLACEHOLDERS))
+            self.compiled_patterns['product_code_placeholder'] = re.compile(product_codes)
+            
+            self._compile_combined_patterns()
+            
         except re.error as e:
             raise ProcessingError("Failed to compile placeholder patterns", str(e))
     
+    def _compile_combined_patterns(self):
+        """
+        Compile the date and fused patterns from the current per-kind patterns.
+        
+        Called again by add_custom_pattern when a pattern they are built from
+        is overridden; a custom 'date_placeholder' pattern is left in place.
+        
+        Raises:
+            re.error: If the combined patterns cannot be compiled
+        """
+        product_codes = self.compiled_patterns['product_code_placeholder'].pattern
+        
+        # Every date placeholder kind, matched in one pass
+        named_dates = (
+            list(self.NAMED_DATE_PLACEHOLDERS) + list(self.CURRENT_DATE_PLACEHOLDERS)
+        )
+        date_placeholders = (
+            '(?P<date_full>' + re.escape(self.placeholder_patterns['date_full']) + ')'
+            '|(?P<date_short>' + re.escape(self.placeholder_patterns['date_short']) + ')'
+            '|(?P<named_date>' + '|'.join(map(re.escape, named_dates)) + ')'
+        )
+        
+        # Each variable kind wraps its own pattern (built-in or custom), whose
+        # capture groups then follow the kind's named group in the fused match
+        fused = re.compile(
+            '|'.join('(?P<%s>%s)' % (kind, self.compiled_patterns[kind].pattern)
+                     for kind in self._FUSED_VARIABLE_KINDS) +
+            '|' + date_placeholders +
+            '|(?P<product_code>' + product_codes + ')'
+        )
+        
+        if 'date_placeholder' not in self.placeholder_patterns:
+            self.compiled_patterns['date_placeholder'] = re.compile(date_placeholders)
+            
+            # Substrings at least one of which every date placeholder contains
+            # (all named date placeholders share '_date')
+            self._date_anchors = (
+                self.placeholder_patterns['date_full'],
+                self.placeholder_patterns['date_short'],
+            )
+            if all('_date' in name for name in named_dates):
+                self._date_anchors += ('_date',)
+            else:
+                self._date_anchors += tuple(named_dates)
+        
+        # Fused pattern matching every placeholder kind in a single pass
+        self.compiled_patterns['fused'] = self._compile_fused(fused.pattern)
+        self._fused_groups = {
+            kind: fused.groupindex[kind] + 1 for kind in self._FUSED_VARIABLE_KINDS
+        }
+    
+    def _compile_fused(self, source: str):
+        """
+        Compile the fused pattern, preferring RE2 when it is installed.
+        
+        ``re`` backtracks, so runs of unclosed '{{' or '${' cost quadratic time;
+        RE2 scans in linear time. The RE2 build is only used when it splits a
+        sample of every placeholder kind exactly like ``re`` does.
+        """
+        compiled = re.compile(source)
+        if re2 is None:
+            return compiled
+        
+        sample = ' '.join((
+            '<?=prod_info("name", "cat")?>', '{{ item.name }}', '${x}', '{{',
+            self.placeholder_patterns['date_full'], self.placeholder_patterns['date_short'],
+            *self.NAMED_DATE_PLACEHOLDERS, *self.CURRENT_DATE_PLACEHOLDERS,
+            *self.PRODUCT_CODE_PLACEHOLDERS, 'テスト'
+        ))
+        
+        def split(pattern):
+            return [
+                (m.span(), m.lastgroup, m.group(m.lastgroup), m.group(2), m.group(3))
+                for m in pattern.finditer(sample)
+            ]
+        
+        try:
+            fast = re2.compile(source)
+            if split(fast) == split(compiled):
+                return fast
+        except Exception as e:
+            self.logger.debug(f"RE2 unusable for fused pattern: {e}")
+        return compiled
+    
     def process_product_codes(self, content: str, data: Dict[str, Any]) -> str:
         """
         Process product code placeholders with pattern matching.
@@ -102,24 +267,19 @@ class PlaceholderProcessor:
             return content
         
         try:
-            result = content
             product_code = data.get('product_code', '')
             
-            # Handle specific product code placeholders (more targeted approach)
-            if product_code:
-                # Only replace exact placeholder matches, not patterns
-                pass  # Skip pattern matching for now to avoid over-replacement
+            # Only replace exact placeholder matches, not patterns
+            if not product_code:
+                return content
             
-            # Handle specific product code placeholders
-            placeholders = [
-                '商品コード', 'product_code', 'PRODUCT_CODE',
-                '製品コード', 'item_code', 'code'
-            ]
+            # One scan for every placeholder; replaced text is never rescanned
+            replacement = str(product_code)
+            pattern = self.compiled_patterns['product_code_placeholder']
+            result, count = pattern.subn(lambda match: replacement, content)
             
-            for placeholder in placeholders:
-                if placeholder in result and product_code:
-                    result = result.replace(placeholder, product_code)
-                    self.logger.debug(f"Replaced placeholder '{placeholder}' with '{product_code}'")
+            if count:
+                self.logger.debug(f"Replaced {count} product code placeholders with '{replacement}'")
             
             return result
             
@@ -140,47 +300,23 @@ class PlaceholderProcessor:
         if not content or not data:
             return content
         
+        # Skip the regex scan when no date placeholder can be present
+        if self._date_anchors and not any(a in content for a in self._date_anchors):
+            return content
+        
         try:
-            result = content
+            # Every date placeholder text maps to a fixed value for this data
+            replacements = self._build_date_replacements(self._get_dates(data))
             
-            # Get dates from data
-            dates = data.get('dates', {})
-            if not dates and 'date' in data:
-                dates = {'date': data['date']}
-            
-            # Process full date format (2025/00/00)
-            if self.placeholder_patterns['date_full'] in result:
-                replacement_date = self._get_date_replacement(dates, 'full')
-                result = result.replace(
-                    self.placeholder_patterns['date_full'], 
-                    replacement_date
-                )
-                self.logger.debug(f"Replaced full date placeholder with '{replacement_date}'")
-            
-            # Process short date format ('25/00/00)
-            if self.placeholder_patterns['date_short'] in result:
-                replacement_date = self._get_date_replacement(dates, 'short')
-                result = result.replace(
-                    self.placeholder_patterns['date_short'], 
-                    replacement_date
-                )
-                self.logger.debug(f"Replaced short date placeholder with '{replacement_date}'")
-            
-            # Process named date placeholders
-            date_placeholders = {
-                'post_date': dates.get('post_date', ''),
-                'update_date': dates.get('update_date', ''),
-                'publish_date': dates.get('publish_date', ''),
-                'review_date': dates.get('review_date', ''),
-                'short_date': dates.get('short_date', ''),
-                'current_date': self._format_current_date('full'),
-                'current_short_date': self._format_current_date('short')
-            }
+            def replace_date(match):
+                original = match.group(0)
+                return replacements.get(original, original)
+            
+            # Full, short and named date placeholders in a single scan
+            result, count = self.compiled_patterns['date_placeholder'].subn(replace_date, content)
             
-            for placeholder, value in date_placeholders.items():
-                if value and placeholder in result:
-                    result = result.replace(placeholder, str(value))
-                    self.logger.debug(f"Replaced date placeholder '{placeholder}' with '{value}'")
+            if count:
+                self.logger.debug(f"Replaced {count} date placeholders")
             
             return result
             
@@ -201,64 +337,107 @@ class PlaceholderProcessor:
         if not content or not data:
             return content
         
+        # Skip the regex scan when no call can be present
+        if not self._may_match('php_function', content):
+            return content
+        
         try:
             result = content
             pattern = self.compiled_patterns['php_function']
+            resolved = {}
             
             def replace_php_function(match):
-                param1 = match.group(1)  # First parameter
-                param2 = match.group(2)  # Second parameter
-                
-                # Replace parameters with actual values from data
-                new_param1 = self._replace_parameter_value(param1, data)
-                new_param2 = param2  # Keep second parameter as-is (usually field name)
-                
-                # Reconstruct the PHP function call
-                return f'<?=prod_info("{new_param1}", "{new_param2}")?>'
-            
-            result = pattern.sub(replace_php_function, result)
+                # Repeated calls are rebuilt once per call of this method
+                original = match.group(0)
+                value = resolved.get(original)
+                if value is None:
+                    value = resolved[original] = self._rebuild_php_function(
+                        match.group(1), match.group(2), data
+                    )
+                return value
+            
+            # subn() counts the calls during the same scan (no second findall pass)
+            result, count = pattern.subn(replace_php_function, result)
             
             # Log the number of replacements made
-            matches = pattern.findall(content)
-            if matches:
-                self.logger.debug(f"Processed {len(matches)} PHP function calls")
+            if count:
+                self.logger.debug(f"Processed {count} PHP function calls")
             
             return result
             
         except Exception as e:
             raise ProcessingError(f"Failed to process PHP function parameters", str(e))
     
+    def _rebuild_php_function(self, param1: str, param2: str, data: Dict[str, Any]) -> str:
+        """Rebuild a prod_info() call with its first parameter replaced from data."""
+        # Keep second parameter as-is (usually field name)
+        new_param1 = self._replace_parameter_value(param1, data)
+        return f'<?=prod_info("{new_param1}", "{param2}")?>'
+    
     def _replace_parameter_value(self, param: str, data: Dict[str, Any]) -> str:
         """Replace parameter value with data from dictionary."""
+        lowered = param.lower()
+        
         # Check if parameter matches product code pattern
-        if 'コード' in param or 'code' in param.lower():
+        if 'コード' in param or 'code' in lowered:
             return data.get('product_code', param)
         
-        # Check for other common patterns
-        replacements = {
-            'product_name': data.get('product_name', param),
-            'category': data.get('category', param),
-            'reviewer_name': data.get('reviewer_name', param),
-        }
-        
-        for key, value in replacements.items():
-            if key in param.lower() or param in value:
+        # Check for other common patterns (no per-call dict, one lower())
+        for key in self.PHP_PARAM_KEYS:
+            value = data.get(key, param)
+            if key in lowered or param in value:
                 return value
         
         return param  # Return original if no replacement found
     
-    def _get_date_replacement(self, dates: Dict[str, str], format_type: str) -> str:
+    def _get_dates(self, data: Dict[str, Any]) -> Dict[str, str]:
+        """Get the dates mapping from data, falling back to a single 'date' value."""
+        dates = data.get('dates', {})
+        if not dates and 'date' in data:
+            dates = {'date': data['date']}
+        return dates
+    
+    def _build_date_replacements(
+        self, dates: Dict[str, str], now: Optional[datetime] = None
+    ) -> Dict[str, str]:
+        """
+        Build the replacement for every date placeholder text from a dates mapping.
+        
+        Named placeholders without a value map to themselves (left unchanged).
+        
+        Args:
+            dates: Dates mapping (see _get_dates)
+            now: Current date and time; read once here if not given
+        """
+        if now is None:
+            now = datetime.now()
+        replacements = {
+            self.placeholder_patterns['date_full']: self._get_date_replacement(dates, 'full', now),
+            self.placeholder_patterns['date_short']: self._get_date_replacement(dates, 'short', now),
+        }
+        for name in self.NAMED_DATE_PLACEHOLDERS:
+            value = dates.get(name, '')
+            replacements[name] = str(value) if value else name
+        for name, format_type in self.CURRENT_DATE_PLACEHOLDERS.items():
+            replacements[name] = self._format_current_date(format_type, now)
+        return replacements
+    
+    def _get_date_replacement(
+        self, dates: Dict[str, str], format_type: str, current_date: Optional[datetime] = None
+    ) -> str:
         """Get appropriate date replacement based on format type."""
-        if format_type == 'full':
-            return dates.get('post_date', dates.get('date', self._format_current_date('full')))
-        elif format_type == 'short':
-            return dates.get('short_date', dates.get('date', self._format_current_date('short')))
-        else:
-            return dates.get('date', self._format_current_date('full'))
+        # The current date is only formatted when no date is given
+        key = {'full': 'post_date', 'short': 'short_date'}.get(format_type, 'date')
+        if key in dates:
+            return dates[key]
+        if 'date' in dates:
+            return dates['date']
+        return self._format_current_date(format_type if key != 'date' else 'full', current_date)
     
-    def _format_current_date(self, format_type: str) -> str:
-        """Format current date according to specified type."""
-        current_date = datetime.now()
+    def _format_current_date(self, format_type: str, current_date: Optional[datetime] = None) -> str:
+        """Format current date (or the given date) according to specified type."""
+        if current_date is None:
+            current_date = datetime.now()
         
         if format_type == 'full':
             return current_date.strftime('%Y/%m/%d')
@@ -285,31 +464,24 @@ class PlaceholderProcessor:
         if not content or not data:
             return content
         
+        # Skip the regex scan when no placeholder can be present
+        if not self._may_match('generic_placeholder', content):
+            return content
+        
         try:
             result = content
             pattern = self.compiled_patterns['generic_placeholder']
+            resolved = {}
             
             def replace_placeholder(match):
-                variable_name = match.group(1).strip()
-                
-                # Look for the variable in data
-                if variable_name in data:
-                    return str(data[variable_name])
-                
-                # Try nested access (e.g., template_data.product_name)
-                if '.' in variable_name:
-                    parts = variable_name.split('.')
-                    value = data
-                    try:
-                        for part in parts:
-                            value = value[part]
-                        return str(value)
-                    except (KeyError, TypeError):
-                        pass
-                
-                # Return original placeholder if not found
-                self.logger.warning(f"Placeholder '{variable_name}' not found in data")
-                return match.group(0)
+                # Repeated placeholders are resolved (and reported) once per call
+                original = match.group(0)
+                value = resolved.get(original)
+                if value is None:
+                    value = resolved[original] = self._resolve_generic_placeholder(
+                        match.group(1), original, data
+                    )
+                return value
             
             result = pattern.sub(replace_placeholder, result)
             return result
@@ -317,6 +489,28 @@ class PlaceholderProcessor:
         except Exception as e:
             raise ProcessingError(f"Failed to process generic placeholders", str(e))
     
+    def _resolve_generic_placeholder(self, name: str, original: str, data: Dict[str, Any]) -> str:
+        """Resolve a {{variable}} placeholder, returning the original text if not found."""
+        variable_name, parts = _parse_variable_name(name)
+        
+        # Look for the variable in data
+        if variable_name in data:
+            return str(data[variable_name])
+        
+        # Try nested access (e.g., template_data.product_name)
+        if parts is not None:
+            value = data
+            try:
+                for part in parts:
+                    value = value[part]
+                return str(value)
+            except (KeyError, TypeError):
+                pass
+        
+        # Return original placeholder if not found
+        self.logger.warning(f"Placeholder '{variable_name}' not found in data")
+        return original
+    
     def process_template_variables(self, content: str, data: Dict[str, Any]) -> str:
         """
         Process ${variable} style template variables.
@@ -331,19 +525,24 @@ class PlaceholderProcessor:
         if not content or not data:
             return content
         
+        # Skip the regex scan when no placeholder can be present
+        if not self._may_match('template_variable', content):
+            return content
+        
         try:
             result = content
             pattern = self.compiled_patterns['template_variable']
+            resolved = {}
             
             def replace_variable(match):
-                variable_name = match.group(1).strip()
-                
-                if variable_name in data:
-                    return str(data[variable_name])
-                
-                # Return original if not found
-                self.logger.warning(f"Template variable '{variable_name}' not found in data")
-                return match.group(0)
+                # Repeated variables are resolved (and reported) once per call
+                original = match.group(0)
+                value = resolved.get(original)
+                if value is None:
+                    value = resolved[original] = self._resolve_template_variable(
+                        match.group(1), original, data
+                    )
+                return value
             
             result = pattern.sub(replace_variable, result)
             return result
@@ -351,9 +550,26 @@ class PlaceholderProcessor:
         except Exception as e:
             raise ProcessingError(f"Failed to process template variables", str(e))
     
+    def _resolve_template_variable(self, name: str, original: str, data: Dict[str, Any]) -> str:
+        """Resolve a ${variable} placeholder, returning the original text if not found."""
+        variable_name = name.strip()
+        
+        if variable_name in data:
+            return str(data[variable_name])
+        
+        # Return original if not found
+        self.logger.warning(f"Template variable '{variable_name}' not found in data")
+        return original
+    
     def apply_all_replacements(self, content: str, data: Dict[str, Any]) -> str:
         """
-        Apply all placeholder replacements in the correct order.
+        Apply all placeholder replacements in a single pass.
+        
+        Product codes, dates, PHP function parameters, generic placeholders
+        and template variables are matched by one fused pattern, so the
+        content is scanned once rather than once per placeholder kind. The
+        split of the content into literal text and placeholders is cached,
+        so rendering known content with new data needs no regex scan.
         
         Args:
             content: Template content to process
@@ -369,30 +585,38 @@ class PlaceholderProcessor:
             return content  # Return unchanged if no data
         
         try:
-            self.logger.debug(f"Starting placeholder processing for content: {content[:100]}...")
-            
-            result = content
-            
-            # Step 1: Process product codes
-            result = self.process_product_codes(result, data)
+            # Placeholder-free content needs no cache key (data fingerprint),
+            # clock read or rendering
+            segments = self._compile_segments(content)
+            if not segments[1]:
+                return content
+            
+            # One clock read per call, shared by the cache key and every
+            # current-date placeholder
+            now = datetime.now()
+            
+            # Identical content and data render identically (on the same day)
+            cache_key = self._render_key(content, data, now)
+            if cache_key is not None:
+                cached = self._render_cache.get(cache_key)
+                if cached is not None:
+                    self._render_cache.move_to_end(cache_key)
+                    return cached
             
-            # Step 2: Process date placeholders
-            result = self.process_date_placeholders(result, data)
-            
-            # Step 3: Process PHP function parameters
-            result = self.process_php_function_params(result, data)
-            
-            # Step 4: Process generic placeholders
-            result = self.process_generic_placeholders(result, data)
+            self.logger.debug(f"Starting placeholder processing for content: {content[:100]}...")
             
-            # Step 5: Process template variables
-            result = self.process_template_variables(result, data)
+            result = self._render_segments(content, segments, data, now)
             
             if result != content:
                 self.logger.info("Placeholder processing completed with changes")
             else:
                 self.logger.debug("Placeholder processing completed with no changes")
             
+            if cache_key is not None:
+                self._render_cache[cache_key] = result
+                while len(self._render_cache) > self.max_cache_size:
+                    self._render_cache.popitem(last=False)
+            
             return result
             
         except ProcessingError:
@@ -400,6 +624,184 @@ class PlaceholderProcessor:
         except Exception as e:
             raise ProcessingError(f"Failed to apply placeholder replacements", str(e))
     
+    def apply_all_replacements_batch(
+        self, content: str, rows: List[Dict[str, Any]]
+    ) -> List[str]:
+        """
+        Apply all placeholder replacements to one template for many data rows.
+        
+        The content is split into literal text and placeholders once; each
+        row then only resolves its distinct placeholders and joins the
+        result. Rows are not added to the render cache.
+        
+        Args:
+            content: Template content to process
+            rows: Data dictionaries, one per rendered output
+            
+        Returns:
+            Rendered content for each row, in row order
+        """
+        if not content:
+            return [content for _ in rows]
+        
+        try:
+            segments = self._compile_segments(content)
+            now = datetime.now()
+            results = [
+                self._render_segments(content, segments, data, now) if data else content
+                for data in rows
+            ]
+            self.logger.info(f"Placeholder processing completed for {len(results)} rows")
+            return results
+            
+        except ProcessingError:
+            raise
+        except Exception as e:
+            raise ProcessingError(f"Failed to apply batch placeholder replacements", str(e))
+    
+    def _render_segments(
+        self, content: str, segments: Tuple[Tuple[str, ...], Tuple[Tuple, ...], Tuple[int, ...]],
+        data: Dict[str, Any], now: datetime
+    ) -> str:
+        """
+        Render content from its segment split (see _compile_segments) for one data row.
+        
+        ``now`` is the current date and time used for current-date placeholders.
+        """
+        statics, slots, indices = segments
+        if not slots:
+            return content
+        
+        # Resolve data-dependent values once for the whole content; every
+        # product code placeholder shares the one converted string
+        product_code = data.get('product_code', '')
+        product_value = str(product_code) if product_code else None
+        date_replacements = None
+        
+        def resolve(original, kind, first, second):
+            if kind == 'php_function':
+                return self._rebuild_php_function(first, second, data)
+            if kind == 'generic_placeholder' or kind == 'template_variable':
+                # The plan holds the stripped name, so plain keys need one lookup
+                if first in data:
+                    return str(data[first])
+                if kind == 'generic_placeholder':
+                    return self._resolve_generic_placeholder(first, original, data)
+                return self._resolve_template_variable(first, original, data)
+            if kind in ('date_full', 'date_short', 'named_date'):
+                nonlocal date_replacements
+                if date_replacements is None:
+                    date_replacements = self._build_date_replacements(self._get_dates(data), now)
+                return date_replacements.get(original, original)
+            if kind == 'product_code':
+                return product_value if product_value is not None else original
+            return original
+        
+        # Resolve each distinct placeholder once, then interleave the values
+        # with the literal text via slice assignment (no per-placeholder loop)
+        values = [resolve(*slot) for slot in slots]
+        parts = [None] * (2 * len(indices) + 1)
+        parts[::2] = statics
+        parts[1::2] = map(values.__getitem__, indices)
+        return ''.join(parts)
+    
+    def _compile_segments(
+        self, content: str
+    ) -> Tuple[Tuple[str, ...], Tuple[Tuple, ...], Tuple[int, ...]]:
+        """
+        Split content into literal text and placeholder slots with the fused pattern.
+        
+        Identical placeholder text always matches the same alternative, so it
+        resolves to the same value and is stored as a single slot.
+        
+        Returns:
+            Tuple of (statics, slots, indices): len(statics) == len(indices) + 1,
+            and the content is statics[0] + slots[indices[0]] + statics[1] + ...
+            Each slot is (matched text, kind, first argument, second argument);
+            for variable placeholders the first argument is the stripped name
+        """
+        segments = self._segment_cache.get(content)
+        if segments is not None:
+            self._segment_cache.move_to_end(content)
+            return segments
+        
+        statics = []
+        slots = []
+        indices = []
+        slot_index = {}
+        last = 0
+        for match in self.compiled_patterns['fused'].finditer(content):
+            original = match.group(0)
+            index = slot_index.get(original)
+            if index is None:
+                kind = match.lastgroup
+                group = self._fused_groups.get(kind)
+                if kind == 'php_function':
+                    # Inner groups of the PHP alternative hold the two parameters
+                    first, second = match.group(group), match.group(group + 1)
+                elif group is not None:
+                    first, second = match.group(group).strip(), None
+                else:
+                    first = second = None
+                index = slot_index[original] = len(slots)
+                slots.append((original, kind, first, second))
+            
+            statics.append(content[last:match.start()])
+            indices.append(index)
+            last = match.end()
+        statics.append(content[last:])
+        
+        segments = (tuple(statics), tuple(slots), tuple(indices))
+        if self.max_cache_size > 0:
+            self._segment_cache[content] = segments
+            while len(self._segment_cache) > self.max_cache_size:
+                self._segment_cache.popitem(last=False)
+        return segments
+    
+    def _render_key(self, content: str, data: Dict[str, Any], now: datetime) -> Optional[Tuple]:
+        """
+        Build the render cache key for content and data.
+        
+        The current date is part of the key because current_date placeholders
+        and missing dates fall back to today's date.
+        
+        Returns:
+            Cache key, or None if caching is disabled or data holds values
+            that cannot be fingerprinted (the render cache is then bypassed)
+        """
+        if self.max_cache_size <= 0:
+            return None
+        try:
+            return (content, now.toordinal(), self._fingerprint(data))
+        except TypeError:
+            return None
+    
+    def _fingerprint(self, value: Any) -> Any:
+        """
+        Convert data into a hashable value that compares equal only for equal data.
+        
+        Values carry their type, since 1, 1.0 and True (or a dict and a
+        read-only mappingproxy) compare equal but render differently. Only
+        immutable scalars and dicts, lists and tuples of them are accepted:
+        any other object may change without its hash changing, which would
+        serve a stale render.
+        
+        Raises:
+            TypeError: If data holds a value that cannot be fingerprinted
+        """
+        value_type = type(value)
+        if value_type is str:
+            return value
+        if value_type in _IMMUTABLE_SCALAR_TYPES:
+            return (value_type, value)
+        if value_type is dict or value_type is MappingProxyType:
+            return (value_type, tuple(
+                (self._fingerprint(key), self._fingerprint(item)) for key, item in value.items()
+            ))
+        if value_type is list or value_type is tuple:
+            return (value_type, tuple(self._fingerprint(item) for item in value))
+        raise TypeError(f"Cannot fingerprint {value_type.__name__} values")
+    
     def get_placeholder_stats(self, content: str) -> Dict[str, int]:
         """
         Get statistics about placeholders in content.
@@ -422,9 +824,7 @@ class PlaceholderProcessor:
         }
         
         # Count product code patterns
-        stats['product_code_patterns'] = len(
-            self.compiled_patterns['product_code'].findall(content)
-        )
+        stats['product_code_patterns'] = self._count_matches('product_code', content)
         
         # Count date placeholders
         stats['date_placeholders'] = (
@@ -433,22 +833,32 @@ class PlaceholderProcessor:
         )
         
         # Count PHP functions
-        stats['php_functions'] = len(
-            self.compiled_patterns['php_function'].findall(content)
-        )
+        stats['php_functions'] = self._count_matches('php_function', content)
         
         # Count generic placeholders
-        stats['generic_placeholders'] = len(
-            self.compiled_patterns['generic_placeholder'].findall(content)
-        )
+        stats['generic_placeholders'] = self._count_matches('generic_placeholder', content)
         
         # Count template variables
-        stats['template_variables'] = len(
-            self.compiled_patterns['template_variable'].findall(content)
-        )
+        stats['template_variables'] = self._count_matches('template_variable', content)
         
         return stats
     
+    def _may_match(self, name: str, content: str) -> bool:
+        """
+        Check whether a compiled pattern can match content at all.
+        
+        Built-in patterns contain a fixed anchor text; when it does not occur
+        in the content (a C-level substring check) no regex scan is needed.
+        """
+        anchor = self._pattern_anchors.get(name)
+        return anchor is None or anchor in content
+    
+    def _count_matches(self, name: str, content: str) -> int:
+        """Count matches of a compiled pattern, skipping the scan when it cannot match."""
+        if not self._may_match(name, content):
+            return 0
+        return sum(1 for _ in self.compiled_patterns[name].finditer(content))
+    
     def add_custom_pattern(self, name: str, pattern: str):
         """
         Add a custom placeholder pattern.
@@ -457,9 +867,50 @@ class PlaceholderProcessor:
             name: Pattern name
             pattern: Regex pattern string
         """
+        # Compile before registering so an invalid pattern leaves no trace
         try:
-            self.placeholder_patterns[name] = pattern
-            self.compiled_patterns[name] = re.compile(pattern)
-            self.logger.info(f"Added custom pattern '{name}': {pattern}")
+            compiled = re.compile(pattern)
         except re.error as e:
-            raise ProcessingError(f"Invalid regex pattern '{pattern}'", str(e))
\ No newline at end of file
+            raise ProcessingError(f"Invalid regex pattern '{pattern}'", str(e))
+        
+        groups = self._FUSED_VARIABLE_KINDS.get(name, 0)
+        if compiled.groups < groups:
+            raise ProcessingError(
+                f"Invalid regex pattern '{pattern}'",
+                f"'{name}' patterns need {groups} capture group(s)"
+            )
+        
+        previous = (
+            self.placeholder_patterns.get(name), self.compiled_patterns.get(name)
+        )
+        self.placeholder_patterns[name] = pattern
+        self.compiled_patterns[name] = compiled
+        
+        # Built-in kinds are also matched through the fused pattern, so
+        # overriding one (or a date literal) requires rebuilding it
+        if name in self._FUSED_VARIABLE_KINDS or name in ('date_full', 'date_short'):
+            try:
+                self._compile_combined_patterns()
+            except re.error as e:
+                self._restore_pattern(name, *previous)
+                raise ProcessingError(f"Invalid regex pattern '{pattern}'", str(e))
+        
+        self._pattern_anchors.pop(name, None)
+        if name == 'date_placeholder':
+            self._date_anchors = ()
+        
+        # Renders and segment splits made with the old patterns are stale
+        self._render_cache.clear()
+        self._segment_cache.clear()
+        self.logger.info(f"Added custom pattern '{name}': {pattern}")
+    
+    def _restore_pattern(self, name: str, pattern: Optional[str], compiled: Optional[re.Pattern]):
+        """Put back the pattern registered under name before a failed override."""
+        if pattern is None:
+            self.placeholder_patterns.pop(name, None)
+        else:
+            self.placeholder_patterns[name] = pattern
+        if compiled is None:
+            self.compiled_patterns.pop(name, None)
+        else:
+            self.compiled_patterns[name] = compiled
\ No newline at end of file
@@ -6,9 +6,14 @@ Integrates with PlaceholderProcessor for comprehensive template processing.
 """
 
 import os
+import time
+from collections import OrderedDict
 from pathlib import Path
-from typing import Dict, Any, Optional, Union, List
-from jinja2 import Environment, FileSystemLoader, Template, TemplateNotFound, TemplateSyntaxError
+from typing import Dict, Any, Optional, Union, List, Tuple, Callable
+from jinja2 import (
+    BaseLoader, Environment, FileSystemBytecodeCache, FileSystemLoader, Template,
+    TemplateNotFound, TemplateSyntaxError
+)
 import re
 
 from atobusu.core.logging_config import get_logger
@@ -24,26 +29,53 @@ class TemplateManager:
     placeholder processing for HTML, PHP, and mixed content templates.
     """
     
-    def __init__(self, template_dir: str, placeholder_processor: Optional[PlaceholderProcessor] = None):
+    def __init__(self, template_dir: Optional[str], placeholder_processor: Optional[PlaceholderProcessor] = None,
+                 max_cache_size: int = 256, bytecode_cache_dir: Optional[str] = None,
+                 loader: Optional[BaseLoader] = None):
         """
         Initialize the template manager.
         
         Args:
-            template_dir: Directory containing template files
+            template_dir: Directory containing template files (may be None when
+                a loader is given)
             placeholder_processor: Optional PlaceholderProcessor instance
+            max_cache_size: Maximum number of entries kept in each template cache
+            bytecode_cache_dir: Optional directory where compiled file templates
+                are cached, so other managers and processes skip recompiling them
+            loader: Optional Jinja2 loader used instead of loading from
+                template_dir (e.g. a DictLoader for in-memory templates)
+            
+        Raises:
+            TemplateError: If neither template_dir nor loader is given
         """
         self.logger = get_logger(__name__)
-        self.template_dir = Path(template_dir)
+        if template_dir is None and loader is None:
+            raise TemplateError("Either a template directory or a loader is required")
+        
+        self.template_dir = Path(template_dir) if template_dir is not None else None
         self.placeholder_processor = placeholder_processor or PlaceholderProcessor()
+        self.bytecode_cache_dir = bytecode_cache_dir
+        self._loader = loader
         
         # Create template directory if it doesn't exist
-        self.template_dir.mkdir(parents=True, exist_ok=True)
+        if self.template_dir is not None:
+            self.template_dir.mkdir(parents=True, exist_ok=True)
         
         # Initialize Jinja2 environment
         self._setup_jinja_environment()
         
-        # Template cache
-        self._template_cache: Dict[str, Template] = {}
+        # Template caches (bounded LRU, least recently used evicted first)
+        self.max_cache_size = max_cache_size
+        self._template_cache: Dict[str, Template] = OrderedDict()
+        # Sources are stored with the loader's uptodate callable (or None)
+        self._source_cache: Dict[str, Tuple[str, Optional[Callable[[], bool]]]] = OrderedDict()
+        
+        # Compiled templates for placeholder-processed sources, keyed by source text
+        self._string_template_cache: Dict[str, Template] = OrderedDict()
+        
+        # Memoized (timestamp, count) of available templates for get_cache_stats
+        self._template_count_ttl = 5.0
+        self._template_count_cache: Optional[Tuple[float, int]] = None
         
         # Supported template types
         self.template_types = {
@@ -62,8 +94,14 @@ class TemplateManager:
     def _setup_jinja_environment(self):
         """Set up Jinja2 environment with custom settings."""
         try:
-            # Create file system loader
-            loader = FileSystemLoader(str(self.template_dir))
+            # Create file system loader (unless a loader was given)
+            loader = self._loader or FileSystemLoader(str(self.template_dir))
+            
+            # Compiled file templates shared through the file system (optional)
+            bytecode_cache = None
+            if self.bytecode_cache_dir:
+                os.makedirs(self.bytecode_cache_dir, exist_ok=True)
+                bytecode_cache = FileSystemBytecodeCache(directory=self.bytecode_cache_dir)
             
             # Configure environment
             self.jinja_env = Environment(
@@ -71,13 +109,18 @@ class TemplateManager:
                 autoescape=False,  # Disable auto-escaping for PHP content
                 trim_blocks=True,
                 lstrip_blocks=True,
-                keep_trailing_newline=True
+                keep_trailing_newline=True,
+                cache_size=400,
+                bytecode_cache=bytecode_cache
             )
             
             # Add custom filters
             self._add_custom_filters()
             
-            self.logger.info(f"Jinja2 environment initialized with template directory: {self.template_dir}")
+            if self.template_dir is not None:
+                self.logger.info(f"Jinja2 environment initialized with template directory: {self.template_dir}")
+            else:
+                self.logger.info(f"Jinja2 environment initialized with {type(loader).__name__}")
             
         except Exception as e:
             raise TemplateError(f"Failed to initialize Jinja2 environment", str(e))
@@ -125,16 +168,23 @@ class TemplateManager:
             TemplateError: If template cannot be loaded
         """
         try:
-            # Check cache first
-            if template_name in self._template_cache:
-                self.logger.debug(f"Template '{template_name}' loaded from cache")
-                return self._template_cache[template_name]
+            # Check cache first, dropping entries whose file has changed on disk
+            template = self._template_cache.get(template_name)
+            if template is not None:
+                if template.is_up_to_date:
+                    self._template_cache.move_to_end(template_name)
+                    self.logger.debug(f"Template '{template_name}' loaded from cache")
+                    return template
+                
+                self.logger.debug(f"Template '{template_name}' changed on disk, reloading")
+                del self._template_cache[template_name]
+                self._source_cache.pop(template_name, None)
             
             # Load template from file system
             template = self.jinja_env.get_template(template_name)
             
             # Cache the template
-            self._template_cache[template_name] = template
+            self._cache_put(self._template_cache, template_name, template)
             
             self.logger.info(f"Template '{template_name}' loaded and cached")
             return template
@@ -146,6 +196,100 @@ class TemplateManager:
         except Exception as e:
             raise TemplateError(f"Failed to load template '{template_name}'", str(e))
     
+    def _get_source(self, template_name: str) -> str:
+        """
+        Get raw template source with caching.
+        
+        Args:
+            template_name: Name of the template file
+            
+        Returns:
+            Template source content
+        """
+        # Cached sources (prewarmed ones included) are re-read once the file
+        # changes on disk, as Template.is_up_to_date does for templates
+        cached = self._source_cache.get(template_name)
+        if cached is not None:
+            source, uptodate = cached
+            if uptodate is None or uptodate():
+                self._source_cache.move_to_end(template_name)
+                return source
+        
+        source, _, uptodate = self.jinja_env.loader.get_source(self.jinja_env, template_name)
+        self._cache_put(self._source_cache, template_name, (source, uptodate))
+        return source
+    
+    def _compile_string(self, source: str) -> Template:
+        """
+        Compile template source with caching.
+        
+        Args:
+            source: Template source content
+            
+        Returns:
+            Jinja2 Template object
+        """
+        template = self._string_template_cache.get(source)
+        if template is not None:
+            self._string_template_cache.move_to_end(source)
+            return template
+        
+        template = self.jinja_env.from_string(source)
+        self._cache_put(self._string_template_cache, source, template)
+        return template
+    
+    def _cache_put(self, cache: Dict[str, Any], key: str, value: Any):
+        """Store a cache entry, evicting the least recently used one when full."""
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > self.max_cache_size:
+            evicted, _ = cache.popitem(last=False)
+            self.logger.debug(f"Evicted '{evicted}' from template cache")
+    
+    async def _get_source_async(
+        self, template_name: str
+    ) -> Tuple[str, Optional[Callable[[], bool]]]:
+        """Read raw template source and its uptodate check without blocking the event loop."""
+        import asyncio
+        
+        loop = asyncio.get_running_loop()
+        source, _, uptodate = await loop.run_in_executor(
+            None, self.jinja_env.loader.get_source, self.jinja_env, template_name
+        )
+        return source, uptodate
+    
+    async def prewarm_sources(self, names: List[str]) -> int:
+        """
+        Read many template sources concurrently and populate the source cache.
+        
+        Intended to be awaited once before bulk validation or rendering of a
+        large template tree that is not yet in the OS page cache.
+        
+        Args:
+            names: Template names to read
+            
+        Returns:
+            Number of sources added to the cache
+        """
+        import asyncio
+        
+        pending = [name for name in dict.fromkeys(names) if name not in self._source_cache]
+        results = await asyncio.gather(
+            *(self._get_source_async(name) for name in pending),
+            return_exceptions=True
+        )
+        
+        loaded = 0
+        for name, result in zip(pending, results):
+            if isinstance(result, BaseException):
+                self.logger.warning(f"Failed to prewarm template source '{name}': {result}")
+                continue
+            self._cache_put(self._source_cache, name, result)
+            loaded += 1
+        
+        self.logger.info(f"Prewarmed {loaded} template sources")
+        return loaded
+    
     def render_html(self, template_name: str, data: Dict[str, Any]) -> str:
         """
         Render HTML template with data.
@@ -164,11 +308,14 @@ class TemplateManager:
             template = self.load_template(template_name)
             
             # Get template source content
-            template_content = self.jinja_env.loader.get_source(self.jinja_env, template_name)[0]
-            processed_content = self.placeholder_processor.apply_all_replacements(template_content, data)
+            template_content = self._get_source(template_name)
+            processed_content = (
+                self.placeholder_processor.apply_all_replacements(template_content, data)
+                if data else template_content
+            )
             
             # Create new template from processed content
-            processed_template = self.jinja_env.from_string(processed_content)
+            processed_template = self._compile_string(processed_content)
             
             # Render with Jinja2
             result = processed_template.render(**data)
@@ -197,16 +344,19 @@ class TemplateManager:
             
             # Load template and get source content
             template = self.load_template(template_name)
-            template_content = self.jinja_env.loader.get_source(self.jinja_env, template_name)[0]
+            template_content = self._get_source(template_name)
             
             # Preserve PHP code blocks
             php_blocks, protected_content = self._preserve_php_blocks(template_content)
             
             # Apply placeholder processing to protected content
-            processed_content = self.placeholder_processor.apply_all_replacements(protected_content, data)
+            processed_content = (
+                self.placeholder_processor.apply_all_replacements(protected_content, data)
+                if data else protected_content
+            )
             
             # Create new template from processed content
-            processed_template = self.jinja_env.from_string(processed_content)
+            processed_template = self._compile_string(processed_content)
             
             # Render with Jinja2
             rendered_content = processed_template.render(**data)
@@ -238,7 +388,7 @@ class TemplateManager:
             
             # Determine template type based on content
             template = self.load_template(template_name)
-            template_content = self.jinja_env.loader.get_source(self.jinja_env, template_name)[0]
+            template_content = self._get_source(template_name)
             
             # Check if template contains PHP
             if self._contains_php(template_content):
@@ -323,10 +473,13 @@ class TemplateManager:
         """
         try:
             # Apply placeholder processing
-            processed_content = self.placeholder_processor.apply_all_replacements(template_string, data)
+            processed_content = (
+                self.placeholder_processor.apply_all_replacements(template_string, data)
+                if data else template_string
+            )
             
             # Create template from string
-            template = self.jinja_env.from_string(processed_content)
+            template = self._compile_string(processed_content)
             
             # Render template
             result = template.render(**data)
@@ -344,12 +497,37 @@ class TemplateManager:
             List of template file names
         """
         try:
+            if self.template_dir is None:
+                try:
+                    return sorted(self.jinja_env.loader.list_templates())
+                except TypeError:
+                    # The loader cannot enumerate its templates (e.g. FunctionLoader)
+                    self.logger.debug(f"{type(self.jinja_env.loader).__name__} cannot list templates")
+                    return []
+            
+            # scandir entries carry their type, so unlike rglob() plus is_file()
+            # only symlinks need a stat call, and no Path object is built per file
             templates = []
-            for file_path in self.template_dir.rglob('*'):
-                if file_path.is_file():
-                    # Get relative path from template directory
-                    relative_path = file_path.relative_to(self.template_dir)
-                    templates.append(str(relative_path))
+            pending = [('', str(self.template_dir))]
+            while pending:
+                relative_dir, dir_path = pending.pop()
+                try:
+                    with os.scandir(dir_path) as entries:
+                        for entry in entries:
+                            try:
+                                is_dir = entry.is_dir()
+                                # Follows symlinks, so dangling links are skipped
+                                is_file = not is_dir and entry.is_file()
+                            except OSError:
+                                continue
+                            
+                            # Like rglob(), symlinked directories are not followed
+                            if is_file:
+                                templates.append(relative_dir + entry.name)
+                            elif is_dir and not entry.is_symlink():
+                                pending.append((relative_dir + entry.name + os.sep, entry.path))
+                except OSError:
+                    continue
             
             return sorted(templates)
             
@@ -368,6 +546,14 @@ class TemplateManager:
             True if template exists, False otherwise
         """
         try:
+            if self.template_dir is None:
+                # Ask the loader directly; not every loader can list its templates
+                try:
+                    self.jinja_env.loader.get_source(self.jinja_env, template_name)
+                except TemplateNotFound:
+                    return False
+                return True
+            
             template_path = self.template_dir / template_name
             return template_path.exists() and template_path.is_file()
         except Exception:
@@ -376,22 +562,42 @@ class TemplateManager:
     def clear_cache(self):
         """Clear the template cache."""
         self._template_cache.clear()
+        self._source_cache.clear()
+        self._string_template_cache.clear()
+        self._template_count_cache = None
         self.logger.info("Template cache cleared")
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """
         Get template cache statistics.
         
+        The template count is memoized for a few seconds so that frequent
+        stats calls do not rescan the template directory.
+        
         Returns:
             Dictionary with cache statistics
         """
         return {
             'cached_templates': len(self._template_cache),
-            'template_names': list(self._template_cache.keys()),
-            'template_directory': str(self.template_dir),
-            'available_templates': len(self.get_template_list())
+            'template_names': list(self._template_cache),
+            'compiled_string_templates': len(self._string_template_cache),
+            'jinja_cache_size': len(self.jinja_env.cache) if self.jinja_env.cache is not None else 0,
+            'template_directory': str(self.template_dir) if self.template_dir is not None else None,
+            'available_templates': self._cached_template_count()
         }
     
+    def _cached_template_count(self) -> int:
+        """Get number of available templates, rescanning at most once per TTL."""
+        now = time.monotonic()
+        if self._template_count_cache is not None:
+            timestamp, count = self._template_count_cache
+            if now - timestamp < self._template_count_ttl:
+                return count
+        
+        count = len(self.get_template_list())
+        self._template_count_cache = (now, count)
+        return count
+    
     def validate_template(self, template_name: str) -> Dict[str, Any]:
         """
         Validate a template for syntax errors.
@@ -417,7 +623,7 @@ class TemplateManager:
             
             # Try to load template
             template = self.load_template(template_name)
-            template_content = self.jinja_env.loader.get_source(self.jinja_env, template_name)[0]
+            template_content = self._get_source(template_name)
             
             # Determine template type
             if self._contains_php(template_content):
@@ -426,7 +632,7 @@ class TemplateManager:
                 result['template_type'] = 'html'
             
             # Check for common issues
-            if not template_content.strip():
+            if not template_content or template_content.isspace():
                 result['warnings'].append("Template is empty")
             
             # Validate placeholder syntax
@@ -463,7 +669,7 @@ class TemplateManager:
                     return self.render_php(template_name, data)
                 elif template_name.endswith(('.html', '.htm')):
                     template = self.load_template(template_name)
-                    template_content = self.jinja_env.loader.get_source(self.jinja_env, template_name)[0]
+                    template_content = self._get_source(template_name)
                     if self._contains_php(template_content):
                         return self.render_mixed_template(template_name, data)
                     else:
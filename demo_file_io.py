@@ -3,25 +3,104 @@
 Demonstration of Atobusu file I/O operations.
 """
 
+import os
 import tempfile
-import shutil
 import json
+import mmap
 from pathlib import Path
 
 from atobusu.file_handlers.output_writer import OutputWriter
 
 
+# Demo file contents, stripped once at import time
+HTML_CONTENT = """
+<!DOCTYPE html>
+<html lang="ja">
+<head>
+    <meta charset="UTF-8">
+    <title>Demo HTML File</title>
+</head>
+<body>
+    <h1>Demo HTML Content</h1>
+    <p>This is a demonstration of HTML file writing.</p>
+    <p>Product: Demo Product (DEMO123456)</p>
+    <p>Rating: 5/5 stars</p>
+</body>
+</html>
+""".strip()
+
+PHP_CONTENT = """
+<?php
+    $title = "Demo PHP Page";
+    $product_code = "DEMO123456";
+    $rating = 5;
+?>
+<!DOCTYPE html>
+<html>
+<head><title><?php echo $title; ?></title></head>
+<body>
+    <h1><?php echo $title; ?></h1>
+    <p>Product Code: <?php echo $product_code; ?></p>
+    <p>Rating: <?php echo $rating; ?>/5</p>
+    <img src="<?=prod_info($product_code, 'mimg')?>" alt="Product Image">
+</body>
+</html>
+""".strip()
+
+MIXED_CONTENT = """
+<div class="product-review">
+    <h2>Product Review</h2>
+    <div class="product-info">
+        <p>Product: DEMO123456</p>
+        <p>Name: Demo Product</p>
+        <p>Category: Demo Category</p>
+    </div>
+    <div class="php-section">
+        <?php echo "Dynamic PHP content"; ?>
+        <img src="<?=prod_info('demo_code', 'mimg')?>" alt="Product">
+    </div>
+    <div class="rating">
+        <span>Rating: 5/5</span>
+    </div>
+</div>
+""".strip()
+
+JAPANESE_CONTENT = """
+<!DOCTYPE html>
+<html lang="ja">
+<head>
+    <meta charset="UTF-8">
+    <title>日本語テスト</title>
+</head>
+<body>
+    <h1>商品レビュー</h1>
+    <p>商品名：テスト商品</p>
+    <p>カテゴリ：テストカテゴリ</p>
+    <p>評価：★★★★★</p>
+    <p>レビュアー：テスト評価者</p>
+</body>
+</html>
+""".strip()
+
+
 def main():
     print("📁 Atobusu File I/O Operations Demo")
     print("=" * 50)
     
-    # Create temporary directory for demonstration
-    temp_dir = tempfile.mkdtemp()
-    output_dir = Path(temp_dir)
-    
-    try:
+    # Create temporary directory for demonstration (removed on exit)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_dir = Path(temp_dir)
+        
+        # Paths looked up repeatedly by the demos, built once
+        base = temp_dir + os.sep
+        paths = {
+            name: base + name
+            for name in ('demo.html', 'demo.php', 'demo_data.json',
+                         'demo_data.yaml', 'japanese_demo.html')
+        }
+        
         # Initialize output writer
-        writer = OutputWriter(str(output_dir))
+        writer = OutputWriter(temp_dir)
         
         # Sample data for demonstrations
         demo_data = {
@@ -41,55 +120,24 @@ def main():
             }
         }
         
+        # Serialize once; Japanese text is kept as-is rather than \u-escaped
+        demo_json = json.dumps(demo_data, indent=2, ensure_ascii=False)
+        
         # Demo 1: HTML File Writing
         print("\n1. HTML File Writing")
         print("-" * 30)
         
-        html_content = """
-        <!DOCTYPE html>
-        <html lang="ja">
-        <head>
-            <meta charset="UTF-8">
-            <title>Demo HTML File</title>
-        </head>
-        <body>
-            <h1>Demo HTML Content</h1>
-            <p>This is a demonstration of HTML file writing.</p>
-            <p>Product: Demo Product (DEMO123456)</p>
-            <p>Rating: 5/5 stars</p>
-        </body>
-        </html>
-        """
-        
-        success = writer.write_html(html_content.strip(), "demo.html")
+        success = writer.write_html(HTML_CONTENT, "demo.html")
         print(f"HTML file written: {success}")
-        print(f"File location: {output_dir / 'demo.html'}")
+        print(f"File location: {paths['demo.html']}")
         
         # Demo 2: PHP File Writing
         print("\n2. PHP File Writing")
         print("-" * 30)
         
-        php_content = """
-        <?php
-            $title = "Demo PHP Page";
-            $product_code = "DEMO123456";
-            $rating = 5;
-        ?>
-        <!DOCTYPE html>
-        <html>
-        <head><title><?php echo $title; ?></title></head>
-        <body>
-            <h1><?php echo $title; ?></h1>
-            <p>Product Code: <?php echo $product_code; ?></p>
-            <p>Rating: <?php echo $rating; ?>/5</p>
-            <img src="<?=prod_info($product_code, 'mimg')?>" alt="Product Image">
-        </body>
-        </html>
-        """
-        
-        success = writer.write_php(php_content.strip(), "demo.php")
+        success = writer.write_php(PHP_CONTENT, "demo.php")
         print(f"PHP file written: {success}")
-        print(f"File location: {output_dir / 'demo.php'}")
+        print(f"File location: {paths['demo.php']}")
         
         # Demo 3: JSON File Writing
         print("\n3. JSON File Writing")
@@ -99,9 +147,9 @@ def main():
         print(f"JSON file written: {success}")
         
         # Read back and display
-        json_path = output_dir / "demo_data.json"
-        with open(json_path, 'r', encoding='utf-8') as f:
-            loaded_data = json.load(f)
+        json_path = paths['demo_data.json']
+        with open(json_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            loaded_data = json.loads(mm[:])
         print(f"JSON data keys: {list(loaded_data.keys())}")
         
         # Demo 4: YAML File Writing
@@ -112,34 +160,19 @@ def main():
         print(f"YAML file written: {success}")
         
         # Show YAML content preview
-        yaml_path = output_dir / "demo_data.yaml"
-        yaml_content = yaml_path.read_text(encoding='utf-8')
+        yaml_path = paths['demo_data.yaml']
+        with open(yaml_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # Only the previewed bytes are paged in
+            yaml_preview = mm[:200].decode('utf-8', 'replace')
+            truncated = len(mm) > 200
         print("YAML content preview:")
-        print(yaml_content[:200] + "..." if len(yaml_content) > 200 else yaml_content)
+        print(yaml_preview + "..." if truncated else yaml_preview)
         
         # Demo 5: Mixed Template Writing
         print("\n5. Mixed Template Writing")
         print("-" * 30)
         
-        mixed_content = """
-        <div class="product-review">
-            <h2>Product Review</h2>
-            <div class="product-info">
-                <p>Product: DEMO123456</p>
-                <p>Name: Demo Product</p>
-                <p>Category: Demo Category</p>
-            </div>
-            <div class="php-section">
-                <?php echo "Dynamic PHP content"; ?>
-                <img src="<?=prod_info('demo_code', 'mimg')?>" alt="Product">
-            </div>
-            <div class="rating">
-                <span>Rating: 5/5</span>
-            </div>
-        </div>
-        """
-        
-        success = writer.write_mixed_template(mixed_content.strip(), "mixed_demo")
+        success = writer.write_mixed_template(MIXED_CONTENT, "mixed_demo")
         print(f"Mixed template written: {success}")
         
         # Check what extension was used
@@ -153,13 +186,16 @@ def main():
         
         # Write different formats with auto-detection
         formats_data = [
-            ("auto_html.html", html_content, "auto"),
-            ("auto_php.php", php_content, "auto"),
-            ("auto_json.json", json.dumps(demo_data, indent=2), "auto"),
+            ("auto_html.html", HTML_CONTENT, "auto"),
+            ("auto_php.php", PHP_CONTENT, "auto"),
+            ("auto_json.json", demo_json, "auto"),
         ]
         
-        for filename, content, format_type in formats_data:
-            success = writer.write_file(content, filename, format_type)
+        results = writer.write_many(
+            [(content, filename, format_type) for filename, content, format_type in formats_data],
+            max_workers=4
+        )
+        for (filename, _, _), success in zip(formats_data, results):
             print(f"Auto-format {filename}: {success}")
         
         # Demo 7: Directory Management
@@ -173,8 +209,17 @@ def main():
             print(f"Directory created {dir_path}: {success}")
         
         # Write files in nested directories
-        writer.write_html("<h1>Nested HTML</h1>", "reviews/2025/january/review.html")
-        writer.write_json({"nested": True}, "data/json/nested.json")
+        writer.write_many([
+            ("<h1>Nested HTML</h1>", "reviews/2025/january/review.html", "html"),
+            ({"nested": True}, "data/json/nested.json", "json"),
+        ], max_workers=4)
+        
+        # Assemble a page from header/body/footer pieces without joining them
+        success = writer.write_chunks(
+            ["<html><body>\n", "<h1>Chunked HTML</h1>\n", "</body></html>\n"],
+            "templates/html/chunked.html"
+        )
+        print(f"Chunked file written: {success}")
         
         # Demo 8: File Validation
         print("\n8. File Path Validation")
@@ -208,18 +253,14 @@ def main():
         print("\n10. File Listing and Management")
         print("-" * 30)
         
-        # List all files
-        all_files = writer.list_output_files()
+        # List all files and specific file types in a single directory walk
+        listing = writer.list_output_files_multi(["*", "*.html", "*.php", "*.json"])
+        all_files = listing["*"]
         print(f"Total files created: {len(all_files)}")
         
-        # List specific file types
-        html_files = writer.list_output_files("*.html")
-        php_files = writer.list_output_files("*.php")
-        json_files = writer.list_output_files("*.json")
-        
-        print(f"HTML files: {len(html_files)}")
-        print(f"PHP files: {len(php_files)}")
-        print(f"JSON files: {len(json_files)}")
+        print(f"HTML files: {len(listing['*.html'])}")
+        print(f"PHP files: {len(listing['*.php'])}")
+        print(f"JSON files: {len(listing['*.json'])}")
         
         # Show some file names
         print("Sample files created:")
@@ -251,28 +292,11 @@ def main():
         print("\n13. International Content Handling")
         print("-" * 30)
         
-        japanese_content = """
-        <!DOCTYPE html>
-        <html lang="ja">
-        <head>
-            <meta charset="UTF-8">
-            <title>日本語テスト</title>
-        </head>
-        <body>
-            <h1>商品レビュー</h1>
-            <p>商品名：テスト商品</p>
-            <p>カテゴリ：テストカテゴリ</p>
-            <p>評価：★★★★★</p>
-            <p>レビュアー：テスト評価者</p>
-        </body>
-        </html>
-        """
-        
-        success = writer.write_html(japanese_content.strip(), "japanese_demo.html")
+        success = writer.write_html(JAPANESE_CONTENT, "japanese_demo.html")
         print(f"Japanese content written: {success}")
         
         # Verify Japanese content
-        japanese_file = output_dir / "japanese_demo.html"
+        japanese_file = Path(paths['japanese_demo.html'])
         if japanese_file.exists():
             content = japanese_file.read_text(encoding='utf-8')
             print(f"Japanese characters preserved: {'商品レビュー' in content}")
@@ -296,10 +320,8 @@ def main():
         
         print("\n✨ File I/O operations demo completed!")
         
-    finally:
-        # Clean up temporary directory
+        
         print(f"\n🧹 Cleaning up temporary directory: {temp_dir}")
-        shutil.rmtree(temp_dir, ignore_errors=True)
 
 
 if __name__ == "__main__":
@@ -6,6 +6,55 @@ Demonstration of Atobusu placeholder processing system.
 from atobusu.templates.placeholder_processor import PlaceholderProcessor
 
 
+# Demo template contents, stripped once at import time
+PHP_CONTENT = '''
+<img src="<?=prod_info("商品コード123", "mimg")?>" alt="<?=prod_info("商品コード456", "pname")?>">
+'''.strip()
+
+COMPREHENSIVE_CONTENT = '''
+<div class="product-review">
+    <h2>{{title}}</h2>
+    <p>Product: product_code (${product_name})</p>
+    <p>Category: {{category}}</p>
+    <p>Posted: 2025/00/00</p>
+    <p>Rating: {{rating}}/5</p>
+    <img src="<?=prod_info("test_code", "mimg")?>" alt="Product Image">
+</div>
+'''.strip()
+
+REAL_WORLD_CONTENT = '''
+<!--サンプル商品コード123456_サンプル商品名-->
+<li>
+  <dl>
+    <dt class="item_img">
+        <a href="/review-product_code" target="_self">
+            <img src="<?=prod_info("test_code", "mimg")?>" alt="{{product_name}}">
+        </a>
+      </dt>
+    <dd class="item_user_box">
+        <p class="item_name">{{product_name}}</p>
+        <div class="item_date">
+            <div class="item_post_date">2025/00/00</div>
+            <div class="item_post_name">全体：{{reviewer_name}}</div>
+        </div>
+        <div class="item_star_box">
+            <div class="item_star_tag">おすすめ度</div>
+            <div class="item_star">★★★★★</div>
+        </div>
+    </dd>
+  </dl>
+</li>
+'''.strip()
+
+STATS_CONTENT = '''
+Product: 商品コード and product_code
+Dates: 2025/00/00 and '25/00/00
+PHP: <?=prod_info("test", "pname")?> and <?=prod_info("test2", "price")?>
+Generic: {{title}}, {{category}}, {{rating}}
+Template: ${product_name}, ${description}
+'''.strip()
+
+
 def main():
     print("🔧 Atobusu Placeholder Processing System Demo")
     print("=" * 60)
@@ -53,12 +102,9 @@ def main():
     print("\n3. PHP Function Processing")
     print("-" * 40)
     
-    php_content = '''
-    <img src="<?=prod_info("商品コード123", "mimg")?>" alt="<?=prod_info("商品コード456", "pname")?>">
-    '''
-    result = processor.process_php_function_params(php_content, demo_data)
+    result = processor.process_php_function_params(PHP_CONTENT, demo_data)
     
-    print(f"Original: {php_content.strip()}")
+    print(f"Original: {PHP_CONTENT}")
     print(f"Result:   {result.strip()}")
     
     # Demo 4: Generic Placeholders
@@ -85,21 +131,10 @@ def main():
     print("\n6. Comprehensive Processing")
     print("-" * 40)
     
-    comprehensive_content = '''
-    <div class="product-review">
-        <h2>{{title}}</h2>
-        <p>Product: product_code (${product_name})</p>
-        <p>Category: {{category}}</p>
-        <p>Posted: 2025/00/00</p>
-        <p>Rating: {{rating}}/5</p>
-        <img src="<?=prod_info("test_code", "mimg")?>" alt="Product Image">
-    </div>
-    '''
-    
-    result = processor.apply_all_replacements(comprehensive_content, demo_data)
+    result = processor.apply_all_replacements(COMPREHENSIVE_CONTENT, demo_data)
     
     print("Original:")
-    print(comprehensive_content.strip())
+    print(COMPREHENSIVE_CONTENT)
     print("\nResult:")
     print(result.strip())
     
@@ -107,31 +142,7 @@ def main():
     print("\n7. Real-world Template Processing")
     print("-" * 40)
     
-    real_world_content = '''
-    <!--サンプル商品コード123456_サンプル商品名-->
-    <li>
-      <dl>
-        <dt class="item_img">
-            <a href="/review-product_code" target="_self">
-                <img src="<?=prod_info("test_code", "mimg")?>" alt="{{product_name}}">
-            </a>
-          </dt>
-        <dd class="item_user_box">
-            <p class="item_name">{{product_name}}</p>
-            <div class="item_date">
-                <div class="item_post_date">2025/00/00</div>
-                <div class="item_post_name">全体：{{reviewer_name}}</div>
-            </div>
-            <div class="item_star_box">
-                <div class="item_star_tag">おすすめ度</div>
-                <div class="item_star">★★★★★</div>
-            </div>
-        </dd>
-      </dl>
-    </li>
-    '''
-    
-    result = processor.apply_all_replacements(real_world_content, demo_data)
+    result = processor.apply_all_replacements(REAL_WORLD_CONTENT, demo_data)
     
     print("Real-world template processed:")
     print(result.strip())
@@ -140,18 +151,10 @@ def main():
     print("\n8. Placeholder Statistics")
     print("-" * 40)
     
-    stats_content = '''
-    Product: 商品コード and product_code
-    Dates: 2025/00/00 and '25/00/00
-    PHP: <?=prod_info("test", "pname")?> and <?=prod_info("test2", "price")?>
-    Generic: {{title}}, {{category}}, {{rating}}
-    Template: ${product_name}, ${description}
-    '''
-    
-    stats = processor.get_placeholder_stats(stats_content)
+    stats = processor.get_placeholder_stats(STATS_CONTENT)
     
     print("Content analyzed:")
-    print(stats_content.strip())
+    print(STATS_CONTENT)
     print("\nPlaceholder Statistics:")
     for key, count in stats.items():
         print(f"  {key}: {count}")
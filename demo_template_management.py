@@ -3,13 +3,97 @@
 Demonstration of Atobusu template management system.
 """
 
+import os
 import tempfile
-import shutil
 from pathlib import Path
 
 from atobusu.templates.template_manager import TemplateManager
 
 
+# Demo template sources, stripped once at import time
+HTML_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head><title>{{title}}</title></head>
+<body>
+    <h1>{{title}}</h1>
+    <p>Product: product_code ({{product_name}})</p>
+    <p>Category: {{category}}</p>
+    <p>Date: 2025/00/00</p>
+    <p>Rating: {{rating}}/5</p>
+    <div>{{content|safe}}</div>
+</body>
+</html>
+""".strip()
+
+PHP_TEMPLATE = """
+<?php
+    $title = "{{title}}";
+    $product_code = "{{product_code}}";
+?>
+<h1><?php echo $title; ?></h1>
+<p>Product: <?=prod_info("product_code", "pname")?></p>
+<p>Image: <img src="<?=prod_info("test_code", "mimg")?>" alt="{{product_name}}"></p>
+<p>Date: 2025/00/00</p>
+<div class="rating">Rating: {{rating}}/5</div>
+""".strip()
+
+MIXED_TEMPLATE = """
+<div class="product-review">
+    <h2>{{title}}</h2>
+    <div class="product-info">
+        <p>Product: product_code</p>
+        <p>Name: {{product_name}}</p>
+        <p>Category: {{category}}</p>
+    </div>
+    <div class="review-date">
+        <span>Posted: 2025/00/00</span>
+        <span>Short: '25/00/00</span>
+    </div>
+    <div class="php-section">
+        <img src="<?=prod_info("demo_code", "mimg")?>" alt="Product Image">
+        <?php echo "Dynamic PHP content"; ?>
+    </div>
+    <div class="rating">
+        <span>Rating: {{rating}}/5</span>
+        <div class="stars">
+            {% for i in range(rating) %}★{% endfor %}
+        </div>
+    </div>
+</div>
+""".strip()
+
+STRING_TEMPLATE = """
+<article>
+    <h3>{{title}}</h3>
+    <p>Product Code: product_code</p>
+    <p>Reviewer: {{reviewer_name}}</p>
+    <p>Date: 2025/00/00</p>
+</article>
+""".strip()
+
+JAPANESE_TEMPLATE = """
+<div class="japanese-review">
+    <h2>{{title}}</h2>
+    <p>商品名：{{product_name}}</p>
+    <p>カテゴリ：{{category}}</p>
+    <p>レビュアー：{{reviewer_name}}</p>
+    <p>投稿日：2025/00/00</p>
+    <p>評価：{{rating}}/5</p>
+</div>
+""".strip()
+
+
+def _fast_rmtree(root):
+    """Remove a directory tree bottom-up without shutil.rmtree's per-entry checks."""
+    for dirpath, dirnames, filenames in os.walk(root, topdown=False):
+        for filename in filenames:
+            os.unlink(os.path.join(dirpath, filename))
+        for dirname in dirnames:
+            os.rmdir(os.path.join(dirpath, dirname))
+    os.rmdir(root)
+
+
 def main():
     print("🎨 Atobusu Template Management System Demo")
     print("=" * 60)
@@ -40,24 +124,9 @@ def main():
         print("\n1. HTML Template Rendering")
         print("-" * 40)
         
-        html_template = """
-        <!DOCTYPE html>
-        <html>
-        <head><title>{{title}}</title></head>
-        <body>
-            <h1>{{title}}</h1>
-            <p>Product: product_code ({{product_name}})</p>
-            <p>Category: {{category}}</p>
-            <p>Date: 2025/00/00</p>
-            <p>Rating: {{rating}}/5</p>
-            <div>{{content|safe}}</div>
-        </body>
-        </html>
-        """
-        
         # Create template file
         html_path = template_dir / "demo.html"
-        html_path.write_text(html_template.strip(), encoding='utf-8')
+        html_path.write_text(HTML_TEMPLATE, encoding='utf-8')
         
         result = manager.render_html("demo.html", demo_data)
         print("HTML Template Result:")
@@ -67,21 +136,9 @@ def main():
         print("\n2. PHP Template Rendering")
         print("-" * 40)
         
-        php_template = """
-        <?php
-            $title = "{{title}}";
-            $product_code = "{{product_code}}";
-        ?>
-        <h1><?php echo $title; ?></h1>
-        <p>Product: <?=prod_info("product_code", "pname")?></p>
-        <p>Image: <img src="<?=prod_info("test_code", "mimg")?>" alt="{{product_name}}"></p>
-        <p>Date: 2025/00/00</p>
-        <div class="rating">Rating: {{rating}}/5</div>
-        """
-        
         # Create PHP template file
         php_path = template_dir / "demo.php"
-        php_path.write_text(php_template.strip(), encoding='utf-8')
+        php_path.write_text(PHP_TEMPLATE, encoding='utf-8')
         
         result = manager.render_php("demo.php", demo_data)
         print("PHP Template Result:")
@@ -91,34 +148,9 @@ def main():
         print("\n3. Mixed Content Template")
         print("-" * 40)
         
-        mixed_template = """
-        <div class="product-review">
-            <h2>{{title}}</h2>
-            <div class="product-info">
-                <p>Product: product_code</p>
-                <p>Name: {{product_name}}</p>
-                <p>Category: {{category}}</p>
-            </div>
-            <div class="review-date">
-                <span>Posted: 2025/00/00</span>
-                <span>Short: '25/00/00</span>
-            </div>
-            <div class="php-section">
-                <img src="<?=prod_info("demo_code", "mimg")?>" alt="Product Image">
-                <?php echo "Dynamic PHP content"; ?>
-            </div>
-            <div class="rating">
-                <span>Rating: {{rating}}/5</span>
-                <div class="stars">
-                    {% for i in range(rating) %}★{% endfor %}
-                </div>
-            </div>
-        </div>
-        """
-        
         # Create mixed template file
         mixed_path = template_dir / "mixed.html"
-        mixed_path.write_text(mixed_template.strip(), encoding='utf-8')
+        mixed_path.write_text(MIXED_TEMPLATE, encoding='utf-8')
         
         result = manager.render_mixed_template("mixed.html", demo_data)
         print("Mixed Template Result:")
@@ -128,16 +160,7 @@ def main():
         print("\n4. Template from String")
         print("-" * 40)
         
-        string_template = """
-        <article>
-            <h3>{{title}}</h3>
-            <p>Product Code: product_code</p>
-            <p>Reviewer: {{reviewer_name}}</p>
-            <p>Date: 2025/00/00</p>
-        </article>
-        """
-        
-        result = manager.create_template_from_string(string_template.strip(), demo_data)
+        result = manager.create_template_from_string(STRING_TEMPLATE, demo_data)
         print("String Template Result:")
         print(result)
         
@@ -190,17 +213,6 @@ def main():
         print("\n8. Japanese Content Processing")
         print("-" * 40)
         
-        japanese_template = """
-        <div class="japanese-review">
-            <h2>{{title}}</h2>
-            <p>商品名：{{product_name}}</p>
-            <p>カテゴリ：{{category}}</p>
-            <p>レビュアー：{{reviewer_name}}</p>
-            <p>投稿日：2025/00/00</p>
-            <p>評価：{{rating}}/5</p>
-        </div>
-        """
-        
         japanese_data = {
             'title': 'テスト商品レビュー',
             'product_name': 'テスト商品名',
@@ -210,7 +222,7 @@ def main():
             'post_date': '2025/01/15'
         }
         
-        result = manager.create_template_from_string(japanese_template.strip(), japanese_data)
+        result = manager.create_template_from_string(JAPANESE_TEMPLATE, japanese_data)
         print("Japanese Template Result:")
         print(result)
         
@@ -238,7 +250,10 @@ def main():
         
     finally:
         # Clean up temporary directory
-        shutil.rmtree(temp_dir, ignore_errors=True)
+        try:
+            _fast_rmtree(temp_dir)
+        except OSError:
+            pass
 
 
 if __name__ == "__main__":
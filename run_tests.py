@@ -4,33 +4,42 @@ Test runner for Atobusu application.
 """
 
 import sys
-import subprocess
 from pathlib import Path
 
 
 def run_tests():
-    """Run all tests using pytest."""
+    """Run all tests using pytest in the current interpreter."""
     try:
-        # Run pytest with coverage
-        result = subprocess.run([
-            sys.executable, "-m", "pytest",
-            "tests/",
-            "-v",
-            "--tb=short",
-            "--cov=atobusu",
-            "--cov-report=term-missing"
-        ], check=True)
-        
-        print("\n✅ All tests passed!")
-        return True
-        
-    except subprocess.CalledProcessError as e:
-        print(f"\n❌ Tests failed with exit code {e.returncode}")
-        return False
-    except FileNotFoundError:
+        import pytest
+    except ImportError:
         print("❌ pytest not found. Please install test dependencies:")
         print("pip install pytest pytest-cov")
         return False
+    
+    args = [
+        "tests/",
+        "-v",
+        "--tb=short",
+        "--cov=atobusu",
+        "--cov-report=term-missing"
+    ]
+    
+    # Spread tests over all cores when pytest-xdist is installed
+    try:
+        import xdist  # noqa: F401
+        args += ["-n", "auto"]
+    except ImportError:
+        pass
+    
+    # Run pytest with coverage
+    exit_code = pytest.main(args)
+    
+    if exit_code == 0:
+        print("\n✅ All tests passed!")
+        return True
+    
+    print(f"\n❌ Tests failed with exit code {int(exit_code)}")
+    return False
 
 
 def main():
@@ -34,7 +34,8 @@ setup(
     install_requires=requirements,
     extras_require={
         "pyqt5": ["PyQt5>=5.15.0"],
-        "dev": ["pytest>=7.0.0", "pytest-cov>=4.0.0", "black>=22.0.0", "flake8>=5.0.0"],
+        "fast": ["orjson>=3.8", "google-re2>=1.0"],
+        "dev": ["pytest>=7.0.0", "pytest-cov>=4.0.0", "pytest-xdist>=3.0.0", "black>=22.0.0", "flake8>=5.0.0"],
     },
     entry_points={
         "console_scripts": [
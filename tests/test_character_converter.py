@@ -2,6 +2,8 @@
 Tests for character conversion system.
 """
 
+import io
+
 import pytest
 from atobusu.core.character_converter import CharacterConverter
 from atobusu.core.exceptions import ProcessingError
@@ -32,32 +34,28 @@ class TestCharacterConverter:
         result = self.converter.convert_quotes(text)
         assert result == text  # Should be unchanged
     
-    def test_convert_circled_numbers(self):
+    @pytest.mark.parametrize("input_text,expected", [
+        ("Test ① item", "Test &#9312; item"),
+        ("Items ②③④", "Items &#9313;&#9314;&#9315;"),
+        ("Number ⑩ is ten", "Number &#9321; is ten"),
+        ("No circled numbers", "No circled numbers"),  # No change
+    ])
+    def test_convert_circled_numbers(self, input_text, expected):
         """Test circled number conversion."""
-        test_cases = [
-            ("Test ① item", "Test &#9312; item"),
-            ("Items ②③④", "Items &#9313;&#9314;&#9315;"),
-            ("Number ⑩ is ten", "Number &#9321; is ten"),
-            ("No circled numbers", "No circled numbers"),  # No change
-        ]
-        
-        for input_text, expected in test_cases:
-            result = self.converter.convert_circled_numbers(input_text)
-            assert result == expected, f"Failed for input: {input_text}"
-    
-    def test_convert_symbols(self):
+        result = self.converter.convert_circled_numbers(input_text)
+        assert result == expected
+    
+    @pytest.mark.parametrize("input_text,expected", [
+        ("Symbol ◎ test", "Symbol &#9678; test"),
+        ("Heart ハート symbol", "Heart &#9825; symbol"),
+        ("Music ♪ note", "Music &#9834; note"),
+        ("Keep ※ as-is", "Keep ※ as-is"),  # Should not change
+        ("No special symbols", "No special symbols"),  # No change
+    ])
+    def test_convert_symbols(self, input_text, expected):
         """Test special symbol conversion."""
-        test_cases = [
-            ("Symbol ◎ test", "Symbol &#9678; test"),
-            ("Heart ハート symbol", "Heart &#9825; symbol"),
-            ("Music ♪ note", "Music &#9834; note"),
-            ("Keep ※ as-is", "Keep ※ as-is"),  # Should not change
-            ("No special symbols", "No special symbols"),  # No change
-        ]
-        
-        for input_text, expected in test_cases:
-            result = self.converter.convert_symbols(input_text)
-            assert result == expected, f"Failed for input: {input_text}"
+        result = self.converter.convert_symbols(input_text)
+        assert result == expected
     
     def test_handle_japanese_encoding(self):
         """Test Japanese character encoding handling."""
@@ -118,6 +116,47 @@ class TestCharacterConverter:
         result = self.converter.convert_symbols(text)
         assert '&#9733;' in result
     
+    def test_apply_all_conversions_chained_rules(self):
+        """Test rules whose output feeds a later rule keep their step order."""
+        self.converter.add_conversion_rule('special_symbols', '&', '&amp;')
+        
+        result = self.converter.apply_all_conversions('① & "x"')
+        assert result == '&amp;#9312; &amp; “x“'
+    
+    def test_add_multi_char_circled_rule(self):
+        """Test multi-character circled number rules are accepted and applied."""
+        self.converter.add_conversion_rule('circled_numbers', '(1)', '&#9312;')
+        
+        assert self.converter.convert_circled_numbers('(1) and ②') == '&#9312; and &#9313;'
+        assert self.converter.apply_all_conversions('(1) ①') == '&#9312; &#9312;'
+        
+        converter = CharacterConverter({'circled_numbers': {'(2)': '&#9313;'}})
+        assert converter.convert_circled_numbers('item (2)') == 'item &#9313;'
+    
+    def test_convert_symbols_chained_custom_rules(self):
+        """Test symbol rules feeding each other apply one after another."""
+        converter = CharacterConverter({'special_symbols': {'a': 'b', 'b': 'c'}})
+        
+        assert converter.convert_symbols('ab') == 'cc'
+        assert converter.apply_all_conversions('ab') == 'cc'
+    
+    def test_convert_stream_matches_whole_text(self):
+        """Test streamed conversion equals whole-text conversion at every split."""
+        text = 'テスト "商品①" は◎評価でハート付き♪'
+        expected = self.converter.apply_all_conversions(text)
+        
+        for split in range(len(text) + 1):
+            chunks = [text[:split], text[split:]]
+            assert ''.join(self.converter.convert_stream(chunks)) == expected
+    
+    def test_convert_stream_from_file_object(self):
+        """Test streamed conversion reading from a text stream."""
+        text = 'Heart ハート and ① ' * 50
+        expected = self.converter.apply_all_conversions(text)
+        
+        result = ''.join(self.converter.convert_stream(io.StringIO(text), chunk_size=7))
+        assert result == expected
+    
     def test_get_conversion_stats(self):
         """Test conversion statistics."""
         text = 'Text with "quotes" and ① ② numbers plus ◎ symbol'
@@ -157,21 +196,19 @@ class TestCharacterConverter:
         result = self.converter.apply_all_conversions(None)
         assert result is None
     
-    def test_edge_cases(self):
+    @pytest.mark.parametrize("text", [
+        "",  # Empty string
+        " ",  # Whitespace only
+        "No special characters",  # No conversions needed
+        "①②③④⑤⑥⑦⑧⑨⑩",  # Only circled numbers
+        '""""',  # Multiple quotes
+        "◎◎◎",  # Repeated symbols
+    ])
+    def test_edge_cases(self, text):
         """Test edge cases and boundary conditions."""
-        test_cases = [
-            "",  # Empty string
-            " ",  # Whitespace only
-            "No special characters",  # No conversions needed
-            "①②③④⑤⑥⑦⑧⑨⑩",  # Only circled numbers
-            '""""',  # Multiple quotes
-            "◎◎◎",  # Repeated symbols
-        ]
-        
-        for text in test_cases:
-            # Should not raise exceptions
-            result = self.converter.apply_all_conversions(text)
-            assert isinstance(result, str) or result is None
+        # Should not raise exceptions
+        result = self.converter.apply_all_conversions(text)
+        assert isinstance(result, str) or result is None
     
     def test_performance_large_text(self):
         """Test performance with large text."""
@@ -3,125 +3,125 @@ Integration tests for Version 1 CLI interface.
 """
 
 import pytest
-import tempfile
 import json
-import yaml
+import logging
 from pathlib import Path
-from unittest.mock import patch, MagicMock
+from types import SimpleNamespace
 
 from atobusu.cli.version1 import validate_cli_arguments, determine_template_and_output, run_version1_cli
 from atobusu.core.config import AtobusuConfig
 from atobusu.core.exceptions import InputError
 
 
+# Quiet logger passed to the CLI functions (no handlers beyond a NullHandler)
+TEST_LOGGER = logging.getLogger("atobusu.tests.cli")
+TEST_LOGGER.addHandler(logging.NullHandler())
+TEST_LOGGER.propagate = False
+
+# Minimal page template shared by the CLI tests
+BASE_PAGE_TEMPLATE = """
+<!DOCTYPE html>
+<html>
+<head><title>{{title|default('Test')}}</title></head>
+<body>
+    <h1>{{product_name|default('No Product')}}</h1>
+    <p>{{content|default('No Content')}}</p>
+</body>
+</html>
+"""
+
+
+@pytest.fixture(scope="session")
+def cli_workspace(tmp_path_factory):
+    """Create a working directory with templates/base_page.html once per session."""
+    workspace = tmp_path_factory.mktemp("cli_workspace")
+    templates_dir = workspace / "templates"
+    templates_dir.mkdir()
+    (templates_dir / "base_page.html").write_text(BASE_PAGE_TEMPLATE)
+    return workspace
+
+
+@pytest.fixture
+def in_cli_workspace(cli_workspace, monkeypatch):
+    """Run a test from the shared workspace (the CLI resolves templates/ and output/ from the CWD)."""
+    monkeypatch.chdir(cli_workspace)
+    return cli_workspace
+
+
 class TestCLIValidation:
     """Test CLI argument validation."""
     
-    def test_validate_cli_arguments_success(self):
+    def test_validate_cli_arguments_success(self, tmp_path):
         """Test successful CLI argument validation."""
         # Create temporary input file
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump({"test": "data"}, f)
-            temp_file = f.name
+        temp_file = tmp_path / "input.json"
+        temp_file.write_text(json.dumps({"test": "data"}))
+        
+        # CLI arguments
+        args = SimpleNamespace(input=str(temp_file), template=None, output=None)
+        
+        # Logger
+        logger = TEST_LOGGER
         
-        try:
-            # Mock args
-            args = MagicMock()
-            args.input = temp_file
-            args.template = None
-            args.output = None
-            
-            # Mock logger
-            logger = MagicMock()
-            
-            # Test validation
-            result = validate_cli_arguments(args, logger)
-            
-            assert result['errors'] == []
-            assert result['input_file'] == str(Path(temp_file).resolve())
-            assert result['template_file'] is None
-            assert result['output_file'] is None
-            
-        finally:
-            Path(temp_file).unlink()
+        # Test validation
+        result = validate_cli_arguments(args, logger)
+        
+        assert result['errors'] == []
+        assert result['input_file'] == str(temp_file.resolve())
+        assert result['template_file'] is None
+        assert result['output_file'] is None
     
     def test_validate_cli_arguments_missing_input(self):
         """Test validation with missing input file."""
-        args = MagicMock()
-        args.input = None
-        args.template = None
-        args.output = None
+        args = SimpleNamespace(input=None, template=None, output=None)
         
-        logger = MagicMock()
+        logger = TEST_LOGGER
         
         result = validate_cli_arguments(args, logger)
         
         assert len(result['errors']) == 1
         assert "Input file is required" in result['errors'][0]
     
-    def test_validate_cli_arguments_invalid_input_extension(self):
+    def test_validate_cli_arguments_invalid_input_extension(self, tmp_path):
         """Test validation with invalid input file extension."""
         # Create temporary file with wrong extension
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            f.write("test content")
-            temp_file = f.name
+        temp_file = tmp_path / "input.txt"
+        temp_file.write_text("test content")
+        
+        args = SimpleNamespace(input=str(temp_file), template=None, output=None)
         
-        try:
-            args = MagicMock()
-            args.input = temp_file
-            args.template = None
-            args.output = None
-            
-            logger = MagicMock()
-            
-            result = validate_cli_arguments(args, logger)
-            
-            assert len(result['errors']) == 1
-            assert "Input file must be JSON or YAML" in result['errors'][0]
-            
-        finally:
-            Path(temp_file).unlink()
+        logger = TEST_LOGGER
+        
+        result = validate_cli_arguments(args, logger)
+        
+        assert len(result['errors']) == 1
+        assert "Input file must be JSON or YAML" in result['errors'][0]
 
 
+@pytest.mark.usefixtures("in_cli_workspace")
 class TestTemplateAndOutputDetermination:
     """Test template and output file determination."""
     
     def test_determine_template_and_output_defaults(self):
         """Test default template and output determination."""
-        # Mock template data
-        template_data = MagicMock()
-        template_data.template_type = 'page'
-        
-        # Mock logger
-        logger = MagicMock()
+        # Template data
+        template_data = SimpleNamespace(template_type='page')
         
-        # Create templates directory for test
-        templates_dir = Path("templates")
-        if not templates_dir.exists():
-            templates_dir.mkdir()
+        # Logger
+        logger = TEST_LOGGER
         
-        # Create a test template file
-        test_template = templates_dir / "base_page.html"
-        if not test_template.exists():
-            test_template.write_text("<html>{{title}}</html>")
+        result = determine_template_and_output(template_data, None, None, logger)
         
-        try:
-            result = determine_template_and_output(template_data, None, None, logger)
-            
-            assert result['template_file'] == 'base_page.html'
-            assert result['output_file'].startswith('output/')
-            assert result['output_file'].endswith('.html')
-            
-        finally:
-            # Clean up if we created the template
-            if test_template.exists() and test_template.read_text() == "<html>{{title}}</html>":
-                test_template.unlink()
+        assert result['template_file'] == 'base_page.html'
+        assert result['output_file'].startswith('output/')
+        assert result['output_file'].endswith('.html')
 
 
+@pytest.mark.usefixtures("in_cli_workspace")
 class TestCLIIntegration:
     """Integration tests for CLI functionality."""
     
-    def test_cli_with_json_input(self):
+    def test_cli_with_json_input(self, tmp_path):
         """Test CLI with JSON input file."""
         # Create temporary JSON input file
         test_data = {
@@ -133,69 +133,34 @@ class TestCLIIntegration:
             "data": [{"test": "item"}]
         }
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
+        input_file = tmp_path / "input.json"
+        with open(input_file, 'w') as f:
             json.dump(test_data, f)
-            input_file = f.name
         
-        try:
-            # Mock args
-            args = MagicMock()
-            args.input = input_file
-            args.template = None
-            args.output = "test_output.html"
-            
-            # Mock config
-            config = AtobusuConfig()
-            
-            # Mock logger
-            logger = MagicMock()
-            
-            # Ensure templates directory exists
-            templates_dir = Path("templates")
-            if not templates_dir.exists():
-                templates_dir.mkdir()
-            
-            # Create a minimal test template
-            test_template = templates_dir / "base_page.html"
-            template_content = """
-<!DOCTYPE html>
-<html>
-<head><title>{{title|default('Test')}}</title></head>
-<body>
-    <h1>{{product_name|default('No Product')}}</h1>
-    <p>{{content|default('No Content')}}</p>
-</body>
-</html>
-"""
-            test_template.write_text(template_content)
-            
-            try:
-                # Test CLI execution
-                run_version1_cli(args, config, logger)
-                
-                # Check that output file was created
-                output_file = Path("output/test_output.html")
-                assert output_file.exists()
-                
-                # Check output content
-                output_content = output_file.read_text()
-                assert "Test Product" in output_content
-                assert "Test Page" in output_content
-                
-            finally:
-                # Clean up
-                if test_template.exists():
-                    test_template.unlink()
-                
-                output_file = Path("output/test_output.html")
-                if output_file.exists():
-                    output_file.unlink()
-                    
-        finally:
-            Path(input_file).unlink()
+        # CLI arguments
+        args = SimpleNamespace(input=str(input_file), template=None, output="test_output.html")
+        
+        # Mock config
+        config = AtobusuConfig()
+        
+        # Logger
+        logger = TEST_LOGGER
+        
+        # Test CLI execution
+        run_version1_cli(args, config, logger)
+        
+        # Check that output file was created
+        output_file = Path("output/test_output.html")
+        assert output_file.exists()
+        
+        # Check output content
+        output_content = output_file.read_text()
+        assert "Test Product" in output_content
+        assert "Test Page" in output_content
     
-    def test_cli_with_yaml_input(self):
+    def test_cli_with_yaml_input(self, tmp_path):
         """Test CLI with YAML input file."""
+        yaml = pytest.importorskip("yaml")
         # Create temporary YAML input file
         test_data = {
             "template_type": "page",
@@ -206,66 +171,30 @@ class TestCLIIntegration:
             "data": [{"yaml": "item"}]
         }
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
+        input_file = tmp_path / "input.yaml"
+        with open(input_file, 'w') as f:
             yaml.dump(test_data, f)
-            input_file = f.name
         
-        try:
-            # Mock args
-            args = MagicMock()
-            args.input = input_file
-            args.template = None
-            args.output = "yaml_test_output.html"
-            
-            # Mock config
-            config = AtobusuConfig()
-            
-            # Mock logger
-            logger = MagicMock()
-            
-            # Ensure templates directory exists
-            templates_dir = Path("templates")
-            if not templates_dir.exists():
-                templates_dir.mkdir()
-            
-            # Create a minimal test template
-            test_template = templates_dir / "base_page.html"
-            template_content = """
-<!DOCTYPE html>
-<html>
-<head><title>{{title|default('Test')}}</title></head>
-<body>
-    <h1>{{product_name|default('No Product')}}</h1>
-    <p>{{content|default('No Content')}}</p>
-</body>
-</html>
-"""
-            test_template.write_text(template_content)
-            
-            try:
-                # Test CLI execution
-                run_version1_cli(args, config, logger)
-                
-                # Check that output file was created
-                output_file = Path("output/yaml_test_output.html")
-                assert output_file.exists()
-                
-                # Check output content
-                output_content = output_file.read_text()
-                assert "YAML Product" in output_content
-                assert "YAML Test Page" in output_content
-                
-            finally:
-                # Clean up
-                if test_template.exists():
-                    test_template.unlink()
-                
-                output_file = Path("output/yaml_test_output.html")
-                if output_file.exists():
-                    output_file.unlink()
-                    
-        finally:
-            Path(input_file).unlink()
+        # CLI arguments
+        args = SimpleNamespace(input=str(input_file), template=None, output="yaml_test_output.html")
+        
+        # Mock config
+        config = AtobusuConfig()
+        
+        # Logger
+        logger = TEST_LOGGER
+        
+        # Test CLI execution
+        run_version1_cli(args, config, logger)
+        
+        # Check that output file was created
+        output_file = Path("output/yaml_test_output.html")
+        assert output_file.exists()
+        
+        # Check output content
+        output_content = output_file.read_text()
+        assert "YAML Product" in output_content
+        assert "YAML Test Page" in output_content
 
 
 if __name__ == "__main__":
@@ -2,11 +2,9 @@
 Tests for configuration management.
 """
 
+import io
 import pytest
-import tempfile
 import json
-import yaml
-from pathlib import Path
 
 from atobusu.core.config import AtobusuConfig
 from atobusu.core.exceptions import ConfigurationError
@@ -26,6 +24,16 @@ class TestAtobusuConfig:
         assert "quotes" in config.character_conversion_rules
         assert "circled_numbers" in config.character_conversion_rules
     
+    def test_default_rules_not_shared(self):
+        """Test each config gets its own copy of the default conversion rules."""
+        first = AtobusuConfig()
+        second = AtobusuConfig()
+        
+        first.character_conversion_rules['circled_numbers']['⑪'] = '&#9322;'
+        
+        assert '⑪' not in second.character_conversion_rules['circled_numbers']
+        assert second.character_conversion_rules == AtobusuConfig().character_conversion_rules
+    
     def test_config_validation(self):
         """Test configuration validation."""
         config = AtobusuConfig()
@@ -45,56 +53,47 @@ class TestAtobusuConfig:
             "log_level": "DEBUG"
         }
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(test_config, f)
-            temp_path = f.name
+        stream = io.StringIO(json.dumps(test_config))
+        config = AtobusuConfig.load_from_file(stream, file_format="json")
         
-        try:
-            config = AtobusuConfig.load_from_file(temp_path)
-            assert config.template_directory == "test_templates"
-            assert config.gui_framework == "pyqt5"
-            assert config.log_level == "DEBUG"
-        finally:
-            Path(temp_path).unlink()
+        assert config.template_directory == "test_templates"
+        assert config.gui_framework == "pyqt5"
+        assert config.log_level == "DEBUG"
     
     def test_load_from_yaml(self):
         """Test loading configuration from YAML file."""
+        yaml = pytest.importorskip("yaml")
         test_config = {
             "template_directory": "test_templates",
             "output_directory": "test_output",
             "gui_framework": "pyqt5"
         }
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(test_config, f)
-            temp_path = f.name
+        stream = io.StringIO(yaml.dump(test_config))
+        config = AtobusuConfig.load_from_file(stream, file_format="yaml")
         
-        try:
-            config = AtobusuConfig.load_from_file(temp_path)
-            assert config.template_directory == "test_templates"
-            assert config.gui_framework == "pyqt5"
-        finally:
-            Path(temp_path).unlink()
+        assert config.template_directory == "test_templates"
+        assert config.gui_framework == "pyqt5"
+    
+    def test_load_from_stream_requires_format(self):
+        """Test loading from an unnamed stream without a format."""
+        with pytest.raises(ValueError):
+            AtobusuConfig.load_from_file(io.StringIO("{}"))
     
-    def test_save_to_file(self):
+    def test_save_to_file(self, tmp_path):
         """Test saving configuration to file."""
         config = AtobusuConfig(
             template_directory="test_templates",
             gui_framework="pyqt5"
         )
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            temp_path = f.name
+        temp_path = str(tmp_path / "config.json")
+        config.save_to_file(temp_path)
         
-        try:
-            config.save_to_file(temp_path)
-            
-            # Load and verify
-            loaded_config = AtobusuConfig.load_from_file(temp_path)
-            assert loaded_config.template_directory == "test_templates"
-            assert loaded_config.gui_framework == "pyqt5"
-        finally:
-            Path(temp_path).unlink()
+        # Load and verify
+        loaded_config = AtobusuConfig.load_from_file(temp_path)
+        assert loaded_config.template_directory == "test_templates"
+        assert loaded_config.gui_framework == "pyqt5"
     
     def test_path_methods(self):
         """Test path utility methods."""
@@ -2,18 +2,40 @@
 Tests for data processing engine.
 """
 
+import io
+import sys
 import pytest
 import json
-import yaml
-import tempfile
-from pathlib import Path
 from datetime import datetime
 
-from atobusu.core.data_processor import DataProcessor
+from atobusu.core.data_processor import DataProcessor, MAX_SCRATCH_BUFFER_SIZE
 from atobusu.core.data_models import InputData, ProcessedData, TemplateData, ValidationResult
 from atobusu.core.character_converter import CharacterConverter
 from atobusu.core.exceptions import InputError, ProcessingError
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _json_bytes(data):
+    """Encode data as JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data).encode('utf-8')
+
+
+def _json_buf(data):
+    """Return data as an in-memory JSON file."""
+    return io.BytesIO(_json_bytes(data))
+
+
+@pytest.fixture(scope="module")
+def processor():
+    """DataProcessor shared by the module; tests must not mutate it."""
+    return DataProcessor()
+
 
 class TestDataModels:
     """Test cases for data models."""
@@ -98,26 +120,35 @@ class TestDataModels:
         assert result.has_warnings()
         
         assert "Test error" in result.get_error_summary()
+    
+    @pytest.mark.skipif(sys.version_info < (3, 10), reason="dataclass slots need Python 3.10+")
+    def test_models_are_slotted(self):
+        """Test data models do not carry a per-instance __dict__."""
+        instances = [
+            InputData(content="test"),
+            TemplateData(),
+            ProcessedData(converted_content="test"),
+            ValidationResult(is_valid=True),
+        ]
+        
+        for instance in instances:
+            assert not hasattr(instance, '__dict__')
 
 
 class TestDataProcessor:
     """Test cases for DataProcessor class."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        self.processor = DataProcessor()
-    
-    def test_processor_initialization(self):
+    def test_processor_initialization(self, processor):
         """Test DataProcessor initialization."""
-        assert self.processor.character_converter is not None
-        assert isinstance(self.processor.character_converter, CharacterConverter)
+        assert processor.character_converter is not None
+        assert isinstance(processor.character_converter, CharacterConverter)
         
         # Test with custom character converter
         custom_converter = CharacterConverter()
-        processor = DataProcessor(custom_converter)
-        assert processor.character_converter is custom_converter
+        custom_processor = DataProcessor(custom_converter)
+        assert custom_processor.character_converter is custom_converter
     
-    def test_parse_json_file(self):
+    def test_parse_json_file(self, processor):
         """Test JSON file parsing."""
         test_data = {
             "content": "Test content with \"quotes\"",
@@ -127,124 +158,73 @@ class TestDataProcessor:
             }
         }
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(test_data, f)
-            temp_path = f.name
-        
-        try:
-            parsed_data = self.processor.parse_json(temp_path)
-            assert parsed_data["content"] == test_data["content"]
-            assert parsed_data["template_data"]["product_code"] == "TEST123"
-        finally:
-            Path(temp_path).unlink()
-    
-    def test_parse_yaml_file(self):
-        """Test YAML file parsing."""
-        test_data = {
-            "content": "Test content with special chars ①",
-            "template_type": "page",
-            "output_format": "html"
-        }
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            yaml.dump(test_data, f)
-            temp_path = f.name
-        
-        try:
-            parsed_data = self.processor.parse_yaml(temp_path)
-            assert parsed_data["content"] == test_data["content"]
-            assert parsed_data["template_type"] == "page"
-        finally:
-            Path(temp_path).unlink()
-    
-    def test_parse_file_json(self):
-        """Test generic file parsing with JSON."""
-        test_data = {"content": "JSON test content"}
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(test_data, f)
-            temp_path = f.name
-        
-        try:
-            input_data = self.processor.parse_file(temp_path)
-            assert isinstance(input_data, InputData)
-            assert input_data.source_type == "json"
-            assert "JSON test content" in input_data.content
-            assert input_data.metadata["parsed_data"]["content"] == "JSON test content"
-        finally:
-            Path(temp_path).unlink()
-    
-    def test_parse_file_yaml(self):
-        """Test generic file parsing with YAML."""
-        test_data = {"content": "YAML test content"}
-        
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yml', delete=False) as f:
-            yaml.dump(test_data, f)
-            temp_path = f.name
-        
-        try:
-            input_data = self.processor.parse_file(temp_path)
-            assert isinstance(input_data, InputData)
-            assert input_data.source_type == "yaml"
-            assert "YAML test content" in input_data.content
-        finally:
-            Path(temp_path).unlink()
+        parsed_data = processor.parse_json(_json_buf(test_data))
+        assert parsed_data["content"] == test_data["content"]
+        assert parsed_data["template_data"]["product_code"] == "TEST123"
     
-    def test_parse_unsupported_file(self):
-        """Test parsing unsupported file format."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', delete=False) as f:
-            f.write("Test content")
-            temp_path = f.name
-        
-        try:
-            with pytest.raises(InputError):
-                self.processor.parse_file(temp_path)
-        finally:
-            Path(temp_path).unlink()
+    @pytest.mark.skipif(orjson is None, reason="scratch buffer is only used with orjson")
+    def test_parse_json_large_file_does_not_grow_scratch(self, tmp_path):
+        """Test a large file is not kept in the reused read buffer."""
+        processor = DataProcessor()
+        large = {"content": "x" * (2 * MAX_SCRATCH_BUFFER_SIZE)}
+        small = {"content": "small"}
+        (tmp_path / "large.json").write_bytes(_json_bytes(large))
+        (tmp_path / "small.json").write_bytes(_json_bytes(small))
+        
+        assert processor.parse_json(tmp_path / "small.json") == small
+        assert processor.parse_json(tmp_path / "large.json") == large
+        assert len(processor._scratch.buffer) <= MAX_SCRATCH_BUFFER_SIZE
+        assert processor.parse_json(tmp_path / "small.json") == small
     
-    def test_parse_nonexistent_file(self):
-        """Test parsing non-existent file."""
-        with pytest.raises(InputError):
-            self.processor.parse_json("nonexistent.json")
+    def test_parse_yaml_file(self, processor):
+        """Test YAML file parsing."""
+        yaml_text = (
+            'content: "Test content with special chars ①"\n'
+            'template_type: page\n'
+            'output_format: html\n'
+        )
         
-        with pytest.raises(InputError):
-            self.processor.parse_yaml("nonexistent.yaml")
-    
-    def test_parse_invalid_json(self):
-        """Test parsing invalid JSON file."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            f.write("{ invalid json }")
-            temp_path = f.name
-        
-        try:
-            with pytest.raises(InputError):
-                self.processor.parse_json(temp_path)
-        finally:
-            Path(temp_path).unlink()
+        parsed_data = processor.parse_yaml(io.BytesIO(yaml_text.encode('utf-8')))
+        assert parsed_data["content"] == "Test content with special chars ①"
+        assert parsed_data["template_type"] == "page"
     
-    def test_parse_invalid_yaml(self):
-        """Test parsing invalid YAML file."""
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.yaml', delete=False) as f:
-            f.write("invalid: yaml: content: [")
-            temp_path = f.name
-        
-        try:
-            with pytest.raises(InputError):
-                self.processor.parse_yaml(temp_path)
-        finally:
-            Path(temp_path).unlink()
+    @pytest.mark.parametrize("suffix,payload,expect", [
+        (".json", _json_bytes({"content": "JSON test content"}), "json"),
+        (".yml", b"content: YAML test content\n", "yaml"),
+        (".txt", b"Test content", InputError),  # Unsupported format
+        (".json", b"{ invalid json }", InputError),
+        (".yaml", b"invalid: yaml: content: [", InputError),
+        (".json", None, InputError),  # Nonexistent file
+        (".yaml", None, InputError),
+    ])
+    def test_parse_file(self, processor, tmp_path, suffix, payload, expect):
+        """Test generic file parsing by suffix, including failure cases."""
+        file_path = tmp_path / f"input{suffix}"
+        if payload is not None:
+            file_path.write_bytes(payload)
+        
+        if isinstance(expect, type):
+            with pytest.raises(expect):
+                processor.parse_file(str(file_path))
+            return
+        
+        input_data = processor.parse_file(str(file_path))
+        assert isinstance(input_data, InputData)
+        assert input_data.source_type == expect
+        assert f"{expect.upper()} test content" in input_data.content
+        assert input_data.metadata["parsed_data"]["content"] == f"{expect.upper()} test content"
     
-    def test_validate_data_input_data(self):
+    def test_validate_data_input_data(self, processor):
         """Test data validation with InputData."""
         input_data = InputData(
             content="Test content",
             source_type="json"
         )
         
-        result = self.processor.validate_data(input_data)
+        result = processor.validate_data(input_data)
         assert result.is_valid
     
-    def test_validate_data_dict(self):
+    def test_validate_data_dict(self, processor):
         """Test data validation with dictionary."""
         data = {
             "content": "Test content",
@@ -255,43 +235,43 @@ class TestDataProcessor:
             }
         }
         
-        result = self.processor.validate_data(data)
+        result = processor.validate_data(data)
         assert result.is_valid
     
-    def test_validate_data_invalid(self):
+    def test_validate_data_invalid(self, processor):
         """Test data validation with invalid data."""
         # Test with invalid template data
         data = {
             "template_data": "invalid_not_dict"
         }
         
-        result = self.processor.validate_data(data)
+        result = processor.validate_data(data)
         assert not result.is_valid
         assert result.has_errors()
     
-    def test_determine_template_type(self):
+    def test_determine_template_type(self, processor):
         """Test template type determination."""
         # Test explicit template_type
         data = {"template_type": "index"}
-        assert self.processor.determine_template_type(data) == "index"
+        assert processor.determine_template_type(data) == "index"
         
         # Test inference from file path
         data = {}
-        assert self.processor.determine_template_type(data, "page_template.html") == "page"
-        assert self.processor.determine_template_type(data, "index_list.html") == "index"
+        assert processor.determine_template_type(data, "page_template.html") == "page"
+        assert processor.determine_template_type(data, "index_list.html") == "index"
         
         # Test inference from data structure
         data = {"items": []}
-        assert self.processor.determine_template_type(data) == "index"
+        assert processor.determine_template_type(data) == "index"
         
         data = {"product_code": "TEST123"}
-        assert self.processor.determine_template_type(data) == "page"
+        assert processor.determine_template_type(data) == "page"
         
         # Test default
         data = {}
-        assert self.processor.determine_template_type(data) == "page"
+        assert processor.determine_template_type(data) == "page"
     
-    def test_process_data(self):
+    def test_process_data(self, processor):
         """Test data processing."""
         input_data = InputData(
             content='Test "content" with ① symbol',
@@ -311,7 +291,7 @@ class TestDataProcessor:
             source_type="json"
         )
         
-        processed_data = self.processor.process_data(input_data)
+        processed_data = processor.process_data(input_data)
         
         assert isinstance(processed_data, ProcessedData)
         assert processed_data.template_type == "page"
@@ -324,16 +304,69 @@ class TestDataProcessor:
         assert '\u201C' in processed_data.converted_content  # Curly quote
         assert '&#9312;' in processed_data.converted_content  # Circled number
     
-    def test_process_data_invalid(self):
+    def test_process_many_matches_single(self, processor):
+        """Test batch processing matches processing each input separately."""
+        contents = ['Test "content" with ① symbol', '', 'ハート ◎ and ♪', 'split\x1erecord ②']
+        inputs = [
+            InputData(content=content, metadata={"parsed_data": {"template_type": "page"}}, source_type="json")
+            for content in contents
+        ]
+        
+        results = processor.process_many(inputs)
+        
+        assert len(results) == len(inputs)
+        for input_data, result in zip(inputs, results):
+            expected = processor.process_data(input_data)
+            assert result.converted_content == expected.converted_content
+            assert result.processing_metadata['conversion_stats'] == expected.processing_metadata['conversion_stats']
+        
+        # Inputs containing the record separator fall back to per-input conversion
+        batched = processor.process_many(inputs[:3])
+        assert [result.converted_content for result in batched] == [
+            result.converted_content for result in results[:3]
+        ]
+    
+    def test_process_many_mixed_encodings(self, processor):
+        """Test batch processing converts each input with its own encoding."""
+        inputs = [
+            InputData(content=content, metadata={"parsed_data": {"template_type": "page"}},
+                      source_type="json", encoding=encoding)
+            for content, encoding in [
+                ('価格 € 100', 'shift_jis'), ('価格 € 100', 'utf-8'), ('①と€', 'shift_jis')
+            ]
+        ]
+        
+        results = processor.process_many(inputs)
+        
+        assert [result.converted_content for result in results] == [
+            processor.process_data(input_data).converted_content for input_data in inputs
+        ]
+        assert results[0].converted_content != results[1].converted_content
+    
+    def test_process_data_reuses_validation(self, processor):
+        """Test process_data honours a validation result passed by the caller."""
+        input_data = InputData(content='Test "content" ①', source_type="json")
+        
+        validation_result = processor.validate_data(input_data)
+        validation_result.add_warning("Checked by caller")
+        
+        processed_data = processor.process_data(input_data, validation_result)
+        assert {"message": "Checked by caller"} in processed_data.processing_metadata["warnings"]
+        
+        validation_result.add_error("Rejected by caller")
+        with pytest.raises(ProcessingError):
+            processor.process_data(input_data, validation_result)
+    
+    def test_process_data_invalid(self, processor):
         """Test processing invalid data."""
         # Create invalid InputData
         input_data = InputData(content="", source_type="invalid")
         
         # Should raise ProcessingError due to validation failure
         with pytest.raises(ProcessingError):
-            self.processor.process_data(input_data)
+            processor.process_data(input_data)
     
-    def test_process_file_integration(self):
+    def test_process_file_integration(self, processor, tmp_path):
         """Test complete file processing integration."""
         test_data = {
             "content": 'Product "Test①" review',
@@ -346,29 +379,24 @@ class TestDataProcessor:
             }
         }
         
-        with tempfile.NamedTemporaryFile(mode='w', suffix='.json', delete=False) as f:
-            json.dump(test_data, f)
-            temp_path = f.name
-        
-        try:
-            processed_data = self.processor.process_file(temp_path)
-            
-            assert isinstance(processed_data, ProcessedData)
-            assert processed_data.template_type == "page"
-            assert processed_data.output_format == "html"
-            
-            # Check character conversion
-            assert '\u201C' in processed_data.converted_content
-            assert '&#9312;' in processed_data.converted_content
-            
-            # Check template data
-            assert processed_data.template_data.product_code == "TEST123"
-            assert processed_data.template_data.rating == 5
-            
-        finally:
-            Path(temp_path).unlink()
+        input_path = tmp_path / "input.json"
+        input_path.write_bytes(_json_bytes(test_data))
+        
+        processed_data = processor.process_file(str(input_path))
+        
+        assert isinstance(processed_data, ProcessedData)
+        assert processed_data.template_type == "page"
+        assert processed_data.output_format == "html"
+        
+        # Check character conversion
+        assert '\u201C' in processed_data.converted_content
+        assert '&#9312;' in processed_data.converted_content
+        
+        # Check template data
+        assert processed_data.template_data.product_code == "TEST123"
+        assert processed_data.template_data.rating == 5
     
-    def test_create_template_data_from_dict(self):
+    def test_create_template_data_from_dict(self, processor):
         """Test template data creation from dictionary."""
         data = {
             "product_code": "TEST123",
@@ -377,16 +405,16 @@ class TestDataProcessor:
             "rating": 4
         }
         
-        template_data = self.processor.create_template_data_from_dict(data)
+        template_data = processor.create_template_data_from_dict(data)
         
         assert isinstance(template_data, TemplateData)
         assert template_data.product_code == "TEST123"
         assert template_data.dates["post_date"] == "2025/01/15"
         assert template_data.rating == 4
     
-    def test_get_processing_stats(self):
+    def test_get_processing_stats(self, processor):
         """Test processing statistics."""
-        stats = self.processor.get_processing_stats()
+        stats = processor.get_processing_stats()
         
         assert "supported_json_extensions" in stats
         assert "supported_yaml_extensions" in stats
@@ -398,31 +426,31 @@ class TestDataProcessor:
         assert 'page' in stats["template_types"]
         assert stats["character_converter_available"] is True
     
-    def test_multiple_template_types(self):
+    def test_multiple_template_types(self, processor):
         """Test processing different template types."""
         # Test page template
         page_data = {"product_code": "TEST123", "content": "Page content"}
-        result = self.processor.determine_template_type(page_data)
+        result = processor.determine_template_type(page_data)
         assert result == "page"
         
         # Test index template
         index_data = {"items": ["item1", "item2"], "content": "Index content"}
-        result = self.processor.determine_template_type(index_data)
+        result = processor.determine_template_type(index_data)
         assert result == "index"
         
         # Test content template (default)
         content_data = {"title": "Article", "content": "Article content"}
-        result = self.processor.determine_template_type(content_data)
+        result = processor.determine_template_type(content_data)
         assert result == "page"  # Default
     
-    def test_character_conversion_integration(self):
+    def test_character_conversion_integration(self, processor):
         """Test integration with character conversion."""
         input_data = InputData(
             content='Japanese: テスト "商品①" は◎評価',
             source_type="json"
         )
         
-        processed_data = self.processor.process_data(input_data)
+        processed_data = processor.process_data(input_data)
         
         # Check that character conversion was applied
         converted = processed_data.converted_content
@@ -435,4 +463,9 @@ class TestDataProcessor:
         assert 'conversion_stats' in processed_data.processing_metadata
         stats = processed_data.processing_metadata['conversion_stats']
         assert stats['japanese_chars'] > 0
-        assert stats['circled_numbers'] > 0
\ No newline at end of file
+        assert stats['circled_numbers'] > 0    
+    def test_dump_content_matches_stdlib(self, processor):
+        """Test parsed data is re-serialized exactly like json.dumps, floats included."""
+        data = {'price': 1e-05, 'big': 1e16, 'missing': float('nan'), 1: ['テスト', True, None]}
+        
+        assert processor._dump_content(data) == json.dumps(data, ensure_ascii=False, indent=2)
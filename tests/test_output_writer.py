@@ -2,12 +2,12 @@
 Tests for file I/O operations.
 """
 
-import pytest
-import tempfile
+import os
 import shutil
+import pytest
 import json
-import yaml
 from pathlib import Path
+from datetime import datetime
 
 from atobusu.file_handlers.output_writer import OutputWriter
 from atobusu.core.exceptions import OutputError
@@ -16,28 +16,8 @@ from atobusu.core.exceptions import OutputError
 class TestOutputWriter:
     """Test cases for OutputWriter class."""
     
-    def setup_method(self):
-        """Set up test fixtures."""
-        # Create temporary directory for output
-        self.temp_dir = tempfile.mkdtemp()
-        self.output_dir = Path(self.temp_dir)
-        
-        # Initialize output writer
-        self.writer = OutputWriter(str(self.output_dir))
-        
-        # Sample data for testing
-        self.test_data = {
-            'title': 'Test Document',
-            'content': 'This is test content',
-            'items': ['item1', 'item2', 'item3'],
-            'metadata': {
-                'author': 'Test Author',
-                'date': '2025-01-15'
-            }
-        }
-        
-        # Sample HTML content
-        self.html_content = """
+    # Sample HTML content (immutable, so shared by all tests)
+    html_content = """
         <!DOCTYPE html>
         <html>
         <head><title>Test Page</title></head>
@@ -47,9 +27,9 @@ class TestOutputWriter:
         </body>
         </html>
         """
-        
-        # Sample PHP content
-        self.php_content = """
+    
+    # Sample PHP content
+    php_content = """
         <?php
         $title = "Test PHP Page";
         $content = "This is PHP content";
@@ -57,9 +37,9 @@ class TestOutputWriter:
         <h1><?php echo $title; ?></h1>
         <p><?php echo $content; ?></p>
         """
-        
-        # Sample mixed content
-        self.mixed_content = """
+    
+    # Sample mixed content
+    mixed_content = """
         <div class="content">
             <h2>Mixed Content</h2>
             <?=prod_info("test_code", "pname")?>
@@ -67,9 +47,28 @@ class TestOutputWriter:
         </div>
         """
     
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+    # Sample data for testing (a plain dict so the JSON/YAML serializers
+    # accept it; the writer never mutates it, so it is shared by all tests)
+    test_data = {
+        'title': 'Test Document',
+        'content': 'This is test content',
+        'items': ['item1', 'item2', 'item3'],
+        'metadata': {
+            'author': 'Test Author',
+            'date': '2025-01-15'
+        }
+    }
+    
+    @pytest.fixture(autouse=True)
+    def setup_writer(self, tmp_path):
+        """Set up test fixtures."""
+        # Per-test output directory; pytest removes old base temp dirs in bulk
+        # on later runs instead of tearing each one down after its test
+        self.temp_dir = str(tmp_path)
+        self.output_dir = tmp_path
+        
+        # Initialize output writer
+        self.writer = OutputWriter(str(self.output_dir))
     
     def test_writer_initialization(self):
         """Test OutputWriter initialization."""
@@ -78,8 +77,7 @@ class TestOutputWriter:
         assert self.output_dir.exists()
         
         # Test initialization without creating directories
-        temp_dir2 = tempfile.mkdtemp()
-        shutil.rmtree(temp_dir2)  # Remove it
+        temp_dir2 = str(self.output_dir / "not_created")
         writer2 = OutputWriter(temp_dir2, create_dirs=False)
         assert not Path(temp_dir2).exists()
     
@@ -95,8 +93,18 @@ class TestOutputWriter:
         assert full_path.exists()
         
         # Check content
-        written_content = full_path.read_text(encoding='utf-8')
-        assert self.html_content.strip() in written_content
+        assert self.writer.verify(output_path, self.html_content.strip())
+    
+    def test_verify(self):
+        """Test byte-level verification of written content."""
+        self.writer.write_html("<p>テスト</p>", "verify.html")
+        self.writer.write_html("", "empty.html")
+        
+        assert self.writer.verify("verify.html", "テスト") is True
+        assert self.writer.verify("verify.html", b"<p>") is True
+        assert self.writer.verify("verify.html", "missing") is False
+        assert self.writer.verify("empty.html", "") is True
+        assert self.writer.verify("nonexistent.html", "x") is False
     
     def test_write_html_with_extension_correction(self):
         """Test HTML writing with automatic extension correction."""
@@ -114,6 +122,17 @@ class TestOutputWriter:
         with pytest.raises(OutputError):
             self.writer.write_html(123, "test.html")  # Non-string content
     
+    def test_write_preencoded_content(self):
+        """Test already-encoded content is written as-is."""
+        payload = self.php_content.encode('utf-8')
+        
+        assert self.writer.write_html(self.html_content.encode('utf-8'), "encoded.html") is True
+        assert self.writer.write_mixed_template(memoryview(payload), "encoded_mixed") is True
+        
+        assert (self.output_dir / "encoded.html").read_text(encoding='utf-8') == self.html_content
+        assert (self.output_dir / "encoded_mixed.php").read_bytes() == payload
+        assert self.writer.get_write_stats()['formats']['mixed']['bytes'] == len(payload)
+    
     def test_write_php_basic(self):
         """Test basic PHP file writing."""
         output_path = "test.php"
@@ -158,6 +177,106 @@ class TestOutputWriter:
         
         assert loaded_data == self.test_data
     
+    def test_write_json_compact(self):
+        """Test compact JSON writing without indentation."""
+        data = {'title': 'テスト', 'items': [1, 2]}
+        success = self.writer.write_json(data, "compact.json", indent=None)
+        
+        assert success is True
+        written = (self.output_dir / "compact.json").read_text(encoding='utf-8')
+        assert written == '{"title":"テスト","items":[1,2]}'
+    
+    def test_write_json_matches_stdlib_layout(self):
+        """Test serialized JSON matches json.dumps output, including non-string keys."""
+        data = {'title': 'テスト', 1: [1.5, None, True], 'nested': {'empty': {}}}
+        success = self.writer.write_json(data, "layout.json")
+        
+        assert success is True
+        written = (self.output_dir / "layout.json").read_text(encoding='utf-8')
+        assert written == json.dumps(data, indent=2, ensure_ascii=False)
+    
+    @pytest.mark.parametrize("indent", [2, None])
+    def test_write_json_floats_match_stdlib(self, indent):
+        """Test non-finite and exponent-form floats are written as json.dumps writes them."""
+        data = {'values': [float('nan'), float('inf'), -float('inf'), 1e-05, 1e16, 2.5e-07, 0.5]}
+        success = self.writer.write_json(data, "floats.json", indent=indent)
+        
+        assert success is True
+        written = (self.output_dir / "floats.json").read_text(encoding='utf-8')
+        separators = (',', ':') if indent is None else None
+        assert written == json.dumps(data, indent=indent, ensure_ascii=False,
+                                     separators=separators)
+    
+    def test_write_json_rejects_datetime(self):
+        """Test values json.dumps cannot serialize still raise OutputError."""
+        with pytest.raises(OutputError):
+            self.writer.write_json({'created': datetime(2025, 1, 2)}, "dates.json")
+    
+    def test_write_many(self):
+        """Test batch writing with aggregated statistics."""
+        results = self.writer.write_many([
+            ("<h1>Batch</h1>", "batch.html", "auto"),
+            (self.test_data, "batch.json", "json"),
+            ("<?php echo 1; ?>", "batch", "php"),
+        ])
+        
+        assert results == [True, True, True]
+        assert (self.output_dir / "batch.html").exists()
+        assert (self.output_dir / "batch.json").exists()
+        assert (self.output_dir / "batch.php").exists()
+        
+        stats = self.writer.get_write_stats()
+        assert stats['files_written'] == 3
+        assert stats['formats']['html']['count'] == 1
+        assert stats['formats']['json']['count'] == 1
+        assert stats['formats']['php']['count'] == 1
+    
+    def test_write_many_concurrent(self):
+        """Test batch writing on several threads."""
+        items = [(f"<p>{i}</p>", f"page_{i}.html", "html") for i in range(20)]
+        results = self.writer.write_many(items, max_workers=4)
+        
+        assert results == [True] * 20
+        assert len(list(self.output_dir.glob("page_*.html"))) == 20
+        assert (self.output_dir / "page_7.html").read_text(encoding='utf-8') == "<p>7</p>"
+        assert self.writer.get_write_stats()['formats']['html']['count'] == 20
+    
+    def test_write_many_across_directories(self):
+        """Test batch writing into several directories releases their descriptors."""
+        fd_dir = Path("/proc/self/fd")
+        open_fds = len(os.listdir(fd_dir)) if fd_dir.exists() else None
+        
+        items = [(f"<p>{i}</p>", f"dir_{i % 3}/page_{i}.html", "html") for i in range(9)]
+        results = self.writer.write_many(items, max_workers=3)
+        
+        assert results == [True] * 9
+        assert (self.output_dir / "dir_2" / "page_5.html").read_text(encoding='utf-8') == "<p>5</p>"
+        if open_fds is not None:
+            assert len(os.listdir(fd_dir)) == open_fds
+    
+    def test_write_chunks(self):
+        """Test writing content assembled from several chunks."""
+        chunks = ["<?php\n", "echo '日本語';".encode('utf-8'), b"", "\n?>"]
+        success = self.writer.write_chunks(chunks, "nested/chunked.php")
+        
+        assert success is True
+        written = (self.output_dir / "nested" / "chunked.php").read_text(encoding='utf-8')
+        assert written == "<?php\necho '日本語';\n?>"
+        
+        stats = self.writer.get_write_stats()
+        assert stats['formats']['php']['count'] == 1
+        assert stats['total_bytes'] == len(written.encode('utf-8'))
+    
+    def test_write_many_invalid_item(self):
+        """Test batch writing keeps stats for items written before an error."""
+        with pytest.raises(OutputError):
+            self.writer.write_many([
+                ("<h1>Batch</h1>", "first.html", "html"),
+                (123, "second.html", "html"),
+            ])
+        
+        assert self.writer.get_write_stats()['files_written'] == 1
+    
     def test_write_json_from_string(self):
         """Test JSON writing from JSON string."""
         json_string = json.dumps(self.test_data, indent=2)
@@ -182,6 +301,7 @@ class TestOutputWriter:
     
     def test_write_yaml_from_dict(self):
         """Test YAML writing from dictionary."""
+        yaml = pytest.importorskip("yaml")
         output_path = "test.yaml"
         success = self.writer.write_yaml(self.test_data, output_path)
         
@@ -199,6 +319,7 @@ class TestOutputWriter:
     
     def test_write_yaml_from_string(self):
         """Test YAML writing from YAML string."""
+        yaml = pytest.importorskip("yaml")
         yaml_string = yaml.dump(self.test_data, default_flow_style=False)
         output_path = "test_string.yaml"
         success = self.writer.write_yaml(yaml_string, output_path)
@@ -300,6 +421,24 @@ class TestOutputWriter:
         assert full_path.exists()
         assert full_path.is_dir()
     
+    def test_create_directory_skips_repeated_mkdir(self):
+        """Test that created directories are remembered for later writes."""
+        self.writer.create_directory("known/dir")
+        known_dir = self.output_dir / "known" / "dir"
+        assert str(known_dir) in self.writer._known_dirs
+        
+        success = self.writer.write_html(self.html_content, "known/dir/file.html")
+        assert success is True
+        assert (known_dir / "file.html").exists()
+    
+    def test_write_recreates_removed_directory(self):
+        """Test a cached directory removed between writes is created again."""
+        assert self.writer.write_html(self.html_content, "sub/first.html") is True
+        shutil.rmtree(self.output_dir / "sub")
+        
+        assert self.writer.write_html(self.html_content, "sub/second.html") is True
+        assert (self.output_dir / "sub" / "second.html").exists()
+    
     def test_validate_output_path_valid(self):
         """Test output path validation for valid path."""
         output_path = "valid_file.html"
@@ -319,6 +458,15 @@ class TestOutputWriter:
         assert result['is_valid'] is True
         assert result['directory_exists'] is True
     
+    def test_validate_output_path_outside_tree(self, tmp_path_factory):
+        """Test output path validation for a path outside the output directory."""
+        other_dir = tmp_path_factory.mktemp("other")
+        result = self.writer.validate_output_path(str(other_dir / "file.html"))
+        
+        assert result['is_valid'] is True
+        assert result['directory_exists'] is True
+        assert result['exists'] is False
+    
     def test_get_write_stats(self):
         """Test write statistics tracking."""
         # Write some files
@@ -334,6 +482,11 @@ class TestOutputWriter:
         assert 'php' in stats['formats']
         assert 'json' in stats['formats']
         assert stats['last_write'] is not None
+        
+        # The returned stats are a snapshot, not a live view
+        self.writer.write_html(self.html_content, "stats4.html")
+        assert stats['formats']['html']['count'] == 1
+        assert isinstance(stats['last_write'], str)
     
     def test_reset_stats(self):
         """Test statistics reset."""
@@ -365,12 +518,35 @@ class TestOutputWriter:
         assert len(all_files) >= 3
         assert "list1.html" in all_files
         assert "list2.php" in all_files
+        assert os.path.join("subdir", "list3.json") in all_files
         
         # List HTML files only
         html_files = self.writer.list_output_files("*.html")
         assert "list1.html" in html_files
         assert "list2.php" not in html_files
     
+    def test_list_output_files_multi(self):
+        """Test listing output files for several patterns at once."""
+        self.writer.write_html(self.html_content, "multi1.html")
+        self.writer.write_php(self.php_content, "multi2.php")
+        self.writer.write_html(self.html_content, "subdir/multi3.html")
+        
+        patterns = ["*", "*.html", "*.php", "*.json", "subdir/*.html"]
+        listing = self.writer.list_output_files_multi(patterns)
+        
+        for pattern in patterns:
+            assert listing[pattern] == self.writer.list_output_files(pattern)
+        assert listing["*.json"] == []
+    
+    @pytest.mark.skipif(not hasattr(os, 'symlink'), reason="symlinks not supported")
+    def test_list_output_files_skips_dangling_symlinks(self):
+        """Test only links that resolve to files are listed, as with Path.is_file()."""
+        self.writer.write_html(self.html_content, "target.html")
+        os.symlink(self.output_dir / "target.html", self.output_dir / "alias.html")
+        os.symlink(self.output_dir / "missing.html", self.output_dir / "dangling.html")
+        
+        assert self.writer.list_output_files("*.html") == ["alias.html", "target.html"]
+    
     def test_backup_file(self):
         """Test file backup creation."""
         # Create original file
@@ -390,6 +566,28 @@ class TestOutputWriter:
         backup_content = backup_path.read_text()
         assert original_content == backup_content
     
+    def test_backup_file_independent_of_original(self):
+        """Test backup keeps its content when the original is rewritten."""
+        self.writer.write_html("<p>original</p>", "versioned.html")
+        assert self.writer.backup_file("versioned.html") is True
+        
+        self.writer.write_html("<p>updated</p>", "versioned.html")
+        
+        backup_path = self.output_dir / "versioned.html.bak"
+        assert backup_path.read_bytes() == b"<p>original</p>"
+    
+    def test_write_with_backup(self):
+        """Test writing a file together with a backup of the same version."""
+        success = self.writer.write_with_backup("<p>v1</p>", "snapshot", "html")
+        assert success is True
+        
+        backup_path = self.output_dir / "snapshot.html.bak"
+        assert backup_path.read_bytes() == b"<p>v1</p>"
+        
+        self.writer.write_html("<p>v2</p>", "snapshot.html")
+        assert backup_path.read_bytes() == b"<p>v1</p>"
+        assert self.writer.get_write_stats()['formats']['html']['count'] == 2
+    
     def test_backup_nonexistent_file(self):
         """Test backup of non-existent file."""
         success = self.writer.backup_file("nonexistent.html")
@@ -425,6 +623,19 @@ class TestOutputWriter:
         assert not (self.output_dir / "cleanup1.html").exists()
         assert (self.output_dir / "cleanup2.php").exists()
     
+    def test_cleanup_output_dir_nested(self):
+        """Test cleanup removes matching files across subdirectories."""
+        for index in range(3):
+            self.writer.write_html(self.html_content, f"sub_{index}/page.html")
+        self.writer.write_php(self.php_content, "sub_0/keep.php")
+        
+        result = self.writer.cleanup_output_dir("*.html", dry_run=False)
+        
+        assert result['files_deleted'] == 3
+        assert result['errors'] == []
+        assert not (self.output_dir / "sub_2" / "page.html").exists()
+        assert (self.output_dir / "sub_0" / "keep.php").exists()
+    
     def test_directory_creation_in_write(self):
         """Test automatic directory creation during write."""
         nested_path = "deep/nested/dir/file.html"
@@ -446,9 +657,7 @@ class TestOutputWriter:
         assert success is True
         
         # Read back and verify
-        full_path = self.output_dir / "japanese.html"
-        read_content = full_path.read_text(encoding='utf-8')
-        assert japanese_content in read_content
+        assert self.writer.verify("japanese.html", japanese_content, "utf-8")
     
     def test_large_file_writing(self):
         """Test writing large files."""
@@ -462,6 +671,25 @@ class TestOutputWriter:
         full_path = self.output_dir / "large_file.html"
         assert full_path.stat().st_size > 10000  # Should be reasonably large
     
+    def test_large_file_writing_repeated_chunks(self):
+        """Test writing a repeated fragment without building the joined content."""
+        success = self.writer.write_chunks([self.html_content] * 2000, "repeated.html")
+        assert success is True
+        
+        written = (self.output_dir / "repeated.html").read_text(encoding='utf-8')
+        assert written == self.html_content * 2000
+    
+    def test_large_file_writing_direct_io(self):
+        """Test large writes through the O_DIRECT path keep the exact length."""
+        writer = OutputWriter(str(self.output_dir), direct_io=True)
+        large_content = self.html_content * 1000 + "末尾"
+        
+        success = writer.write_html(large_content, "direct.html")
+        assert success is True
+        
+        written = (self.output_dir / "direct.html").read_text(encoding='utf-8')
+        assert written == large_content
+    
     def test_error_handling_write_permission(self):
         """Test error handling for write permission issues."""
         # This test might not work on all systems, so we'll make it conditional
@@ -4,33 +4,36 @@ Tests for placeholder processing system.
 
 import pytest
 from datetime import datetime
+from types import MappingProxyType
 
 from atobusu.templates.placeholder_processor import PlaceholderProcessor
 from atobusu.core.exceptions import ProcessingError
 
 
+# Sample data for testing, shared read-only by every test
+TEST_DATA = MappingProxyType({
+    'product_code': 'サンプル商品コード123456',
+    'product_name': 'テスト商品名',
+    'category': 'テストカテゴリ',
+    'reviewer_name': 'テスト評価者名前',
+    'rating': 5,
+    'dates': MappingProxyType({
+        'post_date': '2025/01/15',
+        'short_date': '25/01/15',
+        'update_date': '2025/01/20'
+    }),
+    'title': 'Test Title',
+    'description': 'Test Description'
+})
+
+
 class TestPlaceholderProcessor:
     """Test cases for PlaceholderProcessor class."""
     
     def setup_method(self):
         """Set up test fixtures."""
         self.processor = PlaceholderProcessor()
-        
-        # Sample data for testing
-        self.test_data = {
-            'product_code': 'サンプル商品コード123456',
-            'product_name': 'テスト商品名',
-            'category': 'テストカテゴリ',
-            'reviewer_name': 'テスト評価者名前',
-            'rating': 5,
-            'dates': {
-                'post_date': '2025/01/15',
-                'short_date': '25/01/15',
-                'update_date': '2025/01/20'
-            },
-            'title': 'Test Title',
-            'description': 'Test Description'
-        }
+        self.test_data = TEST_DATA
     
     def test_processor_initialization(self):
         """Test PlaceholderProcessor initialization."""
@@ -58,6 +61,13 @@ class TestPlaceholderProcessor:
         expected_code = self.test_data['product_code']
         assert result.count(expected_code) >= 1
     
+    def test_process_product_codes_single_pass(self):
+        """Test a product code containing a placeholder word is not replaced again."""
+        data = {'product_code': 'code-001'}
+        result = self.processor.process_product_codes("item_code / code", data)
+        
+        assert result == "code-001 / code-001"
+    
     def test_process_product_codes_empty_data(self):
         """Test product code processing with empty data."""
         content = "Product code: 商品コード here"
@@ -104,6 +114,13 @@ class TestPlaceholderProcessor:
         assert current_year in result
         assert 'current_date' not in result  # Should be replaced
     
+    def test_process_date_placeholders_current_short_date(self):
+        """Test current_short_date is not split by the short_date placeholder."""
+        data = {'dates': {'short_date': '25/01/15'}}
+        result = self.processor.process_date_placeholders("current_short_date", data)
+        
+        assert result == datetime.now().strftime("'%y/%m/%d")
+    
     def test_process_php_function_params_basic(self):
         """Test basic PHP function parameter processing."""
         content = '<?=prod_info("商品コード123", "pname")?>'
@@ -164,6 +181,13 @@ class TestPlaceholderProcessor:
         # Should keep original placeholder when variable not found
         assert '{{missing_variable}}' in result
     
+    def test_process_generic_placeholders_repeated(self):
+        """Test every occurrence of a repeated placeholder is handled."""
+        content = "{{title}} {{ title }} {{missing}} {{title}} {{missing}}"
+        result = self.processor.process_generic_placeholders(content, self.test_data)
+        
+        assert result == "Test Title Test Title {{missing}} Test Title {{missing}}"
+    
     def test_process_template_variables(self):
         """Test ${variable} template variable processing."""
         content = "Title: ${title} and Rating: ${rating}"
@@ -201,6 +225,15 @@ class TestPlaceholderProcessor:
         assert '5' in result  # Template variable
         assert '<?=' in result and '?>' in result  # PHP syntax preserved
     
+    def test_apply_all_replacements_single_pass(self):
+        """Test that replaced values are not rescanned by later placeholder kinds."""
+        data = dict(self.test_data, product_code='CODE-{{title}}')
+        content = "Product: 商品コード / {{title}}"
+        
+        result = self.processor.apply_all_replacements(content, data)
+        
+        assert result == "Product: CODE-{{title}} / Test Title"
+    
     def test_apply_all_replacements_empty_content(self):
         """Test replacement with empty content."""
         result = self.processor.apply_all_replacements("", self.test_data)
@@ -217,6 +250,13 @@ class TestPlaceholderProcessor:
         # Should not crash, placeholders might remain
         assert isinstance(result, str)
     
+    def test_apply_all_replacements_no_placeholders(self):
+        """Test placeholder-free content is returned as-is."""
+        content = "Plain text without any placeholders"
+        
+        assert self.processor.apply_all_replacements(content, self.test_data) is content
+        assert self.processor.apply_all_replacements(content, {'tags': [{'a': set()}]}) is content
+    
     def test_get_placeholder_stats(self):
         """Test placeholder statistics."""
         content = '''
@@ -265,6 +305,44 @@ class TestPlaceholderProcessor:
         
         with pytest.raises(ProcessingError):
             self.processor.add_custom_pattern('invalid', invalid_pattern)
+        
+        assert 'invalid' not in self.processor.placeholder_patterns
+        assert 'invalid' not in self.processor.compiled_patterns
+    
+    def test_custom_override_bypasses_anchor_check(self):
+        """Test an overridden built-in pattern is not skipped by its old anchor."""
+        self.processor.add_custom_pattern('generic_placeholder', r'\[\[(\w+)\]\]')
+        
+        result = self.processor.process_generic_placeholders(
+            'Name: [[product_name]]', {'product_name': 'Widget'}
+        )
+        assert result == 'Name: Widget'
+    
+    def test_custom_override_applies_to_all_replacements(self):
+        """Test apply_all_replacements uses an overridden built-in pattern."""
+        self.processor.add_custom_pattern('generic_placeholder', r'\[\[([^\]]+)\]\]')
+        
+        result = self.processor.apply_all_replacements('[[title]] {{title}}', {'title': 'T'})
+        assert result == 'T {{title}}'
+    
+    def test_custom_override_clears_caches(self):
+        """Test content rendered before an override is re-split afterwards."""
+        content = '[[title]] {{title}}'
+        data = {'title': 'T'}
+        assert self.processor.apply_all_replacements(content, data) == '[[title]] T'
+        
+        self.processor.add_custom_pattern('generic_placeholder', r'\[\[([^\]]+)\]\]')
+        
+        assert self.processor.apply_all_replacements(content, data) == 'T {{title}}'
+    
+    def test_custom_override_needs_capture_groups(self):
+        """Test overriding a built-in pattern without its capture groups is rejected."""
+        original = self.processor.placeholder_patterns['php_function']
+        
+        with pytest.raises(ProcessingError):
+            self.processor.add_custom_pattern('php_function', r'<\?=prod_info\(([^)]*)\)\?>')
+        
+        assert self.processor.placeholder_patterns['php_function'] == original
     
     def test_real_world_template_content(self):
         """Test with real-world template content similar to provided examples."""
@@ -357,6 +435,64 @@ class TestPlaceholderProcessor:
         assert len(result) > len(large_content)  # Should be longer due to replacements
         assert self.test_data['product_code'] in result
     
+    def test_apply_all_replacements_cached(self):
+        """Test repeated renders are cached but follow changes to the data."""
+        content = "{{title}} rated ${rating} for product_code"
+        data = dict(self.test_data)
+        
+        first = self.processor.apply_all_replacements(content, data)
+        assert self.processor.apply_all_replacements(content, data) is first
+        
+        data['rating'] = 4.0
+        changed = self.processor.apply_all_replacements(content, data)
+        assert changed == first.replace('rated 5', 'rated 4.0')
+        
+        uncached = PlaceholderProcessor(max_cache_size=0)
+        assert uncached.apply_all_replacements(content, data) == changed
+    
+    def test_apply_all_replacements_mutable_object_not_cached(self):
+        """Test data holding arbitrary objects is re-rendered after they change."""
+        class Price:
+            def __init__(self, amount):
+                self.amount = amount
+            
+            def __str__(self):
+                return f"{self.amount} yen"
+        
+        price = Price(100)
+        data = {'price': price}
+        
+        assert self.processor.apply_all_replacements("{{price}}", data) == "100 yen"
+        price.amount = 200
+        assert self.processor.apply_all_replacements("{{price}}", data) == "200 yen"
+    
+    def test_apply_all_replacements_reuses_plan(self):
+        """Test a template's segment plan is built once and reused across data."""
+        content = "{{ title }} / ${ rating } / {{missing}}"
+        
+        first = self.processor.apply_all_replacements(content, self.test_data)
+        plan = self.processor._compile_segments(content)
+        second = self.processor.apply_all_replacements(content, {'title': 'Other', 'rating': 1})
+        
+        assert self.processor._compile_segments(content) is plan
+        assert first == f"{self.test_data['title']} / 5 / {{{{missing}}}}"
+        assert second == "Other / 1 / {{missing}}"
+    
+    def test_apply_all_replacements_batch(self):
+        """Test batch rendering matches rendering each row separately."""
+        content = 'Code: 商品コード {{title}} ${rating} <?=prod_info("x", "pname")?>'
+        rows = [
+            dict(self.test_data, product_code=f'P-{i}', title=f'Title {i}')
+            for i in range(3)
+        ] + [{}]
+        
+        expected = [self.processor.apply_all_replacements(content, row) for row in rows]
+        
+        uncached = PlaceholderProcessor(max_cache_size=0)
+        assert uncached.apply_all_replacements_batch(content, rows) == expected
+        assert expected[1].startswith('Code: P-1 Title 1')
+        assert expected[-1] == content
+    
     def test_edge_cases(self):
         """Test edge cases and boundary conditions."""
         edge_cases = [
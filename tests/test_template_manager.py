@@ -3,50 +3,101 @@ Tests for template management system.
 """
 
 import pytest
-import tempfile
-import shutil
-from pathlib import Path
+import os
+import asyncio
+from types import MappingProxyType
+from jinja2 import DictLoader, FunctionLoader
 
 from atobusu.templates.template_manager import TemplateManager
 from atobusu.templates.placeholder_processor import PlaceholderProcessor
 from atobusu.core.exceptions import TemplateError
 
 
+# Sample data for testing, shared read-only by every test
+TEST_DATA = MappingProxyType({
+    'title': 'Test Product Review',
+    'product_code': 'TEST123',
+    'product_name': 'Test Product',
+    'category': 'Test Category',
+    'reviewer_name': 'Test Reviewer',
+    'rating': 5,
+    'post_date': '2025/01/15',
+    'short_date': '25/01/15',
+    'content': 'This is test content',
+    'description': 'Test description'
+})
+
+
+# Templates rendered by test_render: (file name, content, renderer method,
+# fragments the result must contain)
+RENDER_CASES = [
+    (
+        "basic.html",
+        "<h1>{{title}}</h1><p>Product: {{product_name}}</p>",
+        "render_html",
+        ("Test Product Review", "Test Product", "<h1>", "</h1>"),
+    ),
+    (
+        "basic.php",
+        """
+        <h1>{{title}}</h1>
+        <?php echo "PHP code preserved"; ?>
+        <p>Product: {{product_name}}</p>
+        """,
+        "render_php",
+        ("Test Product Review", "Test Product", "<?php echo", "?>"),
+    ),
+    (
+        "php_functions.php",
+        """
+        <h1>{{title}}</h1>
+        <img src="<?=prod_info("test_code", "mimg")?>" alt="{{product_name}}">
+        <p>Product: product_code</p>
+        """,
+        "render_php",
+        # Product code and PHP function replacement, function call preserved
+        ("Test Product Review", "TEST123", "<?=prod_info(", "Test Product"),
+    ),
+    (
+        "mixed_html.html",
+        "<h1>{{title}}</h1><p>No PHP here</p>",
+        "render_mixed_template",
+        ("Test Product Review", "<h1>"),
+    ),
+    (
+        "mixed_php.html",
+        """
+        <h1>{{title}}</h1>
+        <?php echo "Mixed content"; ?>
+        <p>{{product_name}}</p>
+        """,
+        "render_mixed_template",
+        ("Test Product Review", "Test Product", "<?php echo"),
+    ),
+]
+
+
 class TestTemplateManager:
     """Test cases for TemplateManager class."""
     
-    def setup_method(self):
+    @pytest.fixture(autouse=True)
+    def setup_manager(self, tmp_path):
         """Set up test fixtures."""
-        # Create temporary directory for templates
-        self.temp_dir = tempfile.mkdtemp()
-        self.template_dir = Path(self.temp_dir)
+        # Per-test template directory, cleaned up by pytest's temp dir rotation
+        self.temp_dir = str(tmp_path)
+        self.template_dir = tmp_path
         
-        # Initialize template manager
+        # Initialize template manager (cheap; a fresh one keeps caches per test)
         self.manager = TemplateManager(str(self.template_dir))
-        
-        # Sample data for testing
-        self.test_data = {
-            'title': 'Test Product Review',
-            'product_code': 'TEST123',
-            'product_name': 'Test Product',
-            'category': 'Test Category',
-            'reviewer_name': 'Test Reviewer',
-            'rating': 5,
-            'post_date': '2025/01/15',
-            'short_date': '25/01/15',
-            'content': 'This is test content',
-            'description': 'Test description'
-        }
-    
-    def teardown_method(self):
-        """Clean up test fixtures."""
-        shutil.rmtree(self.temp_dir, ignore_errors=True)
+        self.test_data = TEST_DATA
     
     def create_test_template(self, name: str, content: str):
         """Helper to create test template files."""
         template_path = self.template_dir / name
-        template_path.parent.mkdir(parents=True, exist_ok=True)
-        template_path.write_text(content, encoding='utf-8')
+        if template_path.parent != self.template_dir:
+            # Only nested names need their directory created
+            template_path.parent.mkdir(parents=True, exist_ok=True)
+        template_path.write_bytes(content.encode('utf-8'))
     
     def test_manager_initialization(self):
         """Test TemplateManager initialization."""
@@ -83,6 +134,59 @@ class TestTemplateManager:
         assert template1 is template2
         assert len(self.manager._template_cache) == 1
     
+    def test_load_template_bytecode_cache(self, tmp_path_factory):
+        """Test compiled templates are shared through the bytecode cache directory."""
+        cache_dir = tmp_path_factory.mktemp("jinja_bytecode")
+        self.create_test_template("shared.html", "<h1>{{title}}</h1>")
+        
+        first = TemplateManager(str(self.template_dir), bytecode_cache_dir=str(cache_dir))
+        assert first.load_template("shared.html").render(title="A") == "<h1>A</h1>"
+        assert list(cache_dir.iterdir())
+        
+        # A second manager loads the compiled code instead of recompiling
+        second = TemplateManager(str(self.template_dir), bytecode_cache_dir=str(cache_dir))
+        assert second.load_template("shared.html").render(title="B") == "<h1>B</h1>"
+    
+    def test_load_template_cache_bounded(self):
+        """Test that the template cache evicts least recently used entries."""
+        manager = TemplateManager(str(self.template_dir), max_cache_size=2)
+        for name in ("lru1.html", "lru2.html", "lru3.html"):
+            self.create_test_template(name, "<h1>{{title}}</h1>")
+        
+        manager.load_template("lru1.html")
+        manager.load_template("lru2.html")
+        manager.load_template("lru1.html")  # Mark lru1 as recently used
+        manager.load_template("lru3.html")
+        
+        assert len(manager._template_cache) == 2
+        assert "lru1.html" in manager._template_cache
+        assert "lru2.html" not in manager._template_cache
+        assert "lru3.html" in manager._template_cache
+    
+    def test_load_template_reloads_changed_file(self):
+        """Test that cached templates are reloaded when the file changes."""
+        self.create_test_template("changing.html", "<h1>Old {{title}}</h1>")
+        template1 = self.manager.load_template("changing.html")
+        
+        self.create_test_template("changing.html", "<h1>New {{title}}</h1>")
+        template_path = self.template_dir / "changing.html"
+        mtime = template_path.stat().st_mtime + 10
+        os.utime(template_path, (mtime, mtime))
+        
+        template2 = self.manager.load_template("changing.html")
+        assert template2 is not template1
+        assert "New" in self.manager.render_html("changing.html", self.test_data)
+    
+    def test_render_reuses_compiled_template(self):
+        """Test that repeated renders reuse the compiled processed template."""
+        self.create_test_template("repeat.html", "<h1>{{title}}</h1>")
+        
+        first = self.manager.render_html("repeat.html", self.test_data)
+        second = self.manager.render_html("repeat.html", self.test_data)
+        
+        assert first == second
+        assert len(self.manager._string_template_cache) == 1
+    
     def test_load_template_not_found(self):
         """Test loading non-existent template."""
         with pytest.raises(TemplateError):
@@ -96,16 +200,16 @@ class TestTemplateManager:
         with pytest.raises(TemplateError):
             self.manager.load_template("invalid.html")
     
-    def test_render_html_basic(self):
-        """Test basic HTML template rendering."""
-        template_content = "<h1>{{title}}</h1><p>Product: {{product_name}}</p>"
-        self.create_test_template("basic.html", template_content)
+    @pytest.mark.parametrize("name,content,renderer,expected", RENDER_CASES,
+                             ids=[case[0] for case in RENDER_CASES])
+    def test_render(self, name, content, renderer, expected):
+        """Test rendering a template with each renderer keeps data and PHP code."""
+        self.create_test_template(name, content)
         
-        result = self.manager.render_html("basic.html", self.test_data)
+        result = getattr(self.manager, renderer)(name, self.test_data)
         
-        assert "Test Product Review" in result
-        assert "Test Product" in result
-        assert "<h1>" in result and "</h1>" in result
+        for fragment in expected:
+            assert fragment in result
     
     def test_render_html_with_placeholders(self):
         """Test HTML rendering with placeholder processing."""
@@ -124,109 +228,6 @@ class TestTemplateManager:
         assert "2025/" in result  # Date replacement (current or test date)
         assert "Test Category" in result  # Generic placeholder
     
-    def test_render_php_basic(self):
-        """Test basic PHP template rendering."""
-        template_content = """
-        <h1>{{title}}</h1>
-        <?php echo "PHP code preserved"; ?>
-        <p>Product: {{product_name}}</p>
-        """
-        self.create_test_template("basic.php", template_content)
-        
-        result = self.manager.render_php("basic.php", self.test_data)
-        
-        assert "Test Product Review" in result
-        assert "Test Product" in result
-        assert "<?php echo" in result  # PHP preserved
-        assert "?>" in result
-    
-    def test_render_php_with_functions(self):
-        """Test PHP rendering with function processing."""
-        template_content = """
-        <h1>{{title}}</h1>
-        <img src="<?=prod_info("test_code", "mimg")?>" alt="{{product_name}}">
-        <p>Product: product_code</p>
-        """
-        self.create_test_template("php_functions.php", template_content)
-        
-        result = self.manager.render_php("php_functions.php", self.test_data)
-        
-        assert "Test Product Review" in result
-        assert "TEST123" in result  # Product code and PHP function replacement
-        assert "<?=prod_info(" in result  # PHP function preserved
-        assert "Test Product" in result
-    
-    def test_render_mixed_template_html(self):
-        """Test mixed template rendering (HTML content)."""
-        template_content = "<h1>{{title}}</h1><p>No PHP here</p>"
-        self.create_test_template("mixed_html.html", template_content)
-        
-        result = self.manager.render_mixed_template("mixed_html.html", self.test_data)
-        
-        assert "Test Product Review" in result
-        assert "<h1>" in result
-    
-    def test_render_mixed_template_php(self):
-        """Test mixed template rendering (PHP content)."""
-        template_content = """
-        <h1>{{title}}</h1>
-        <?php echo "Mixed content"; ?>
-        <p>{{product_name}}</p>
-        """
-        self.create_test_template("mixed_php.html", template_content)
-        
-        result = self.manager.render_mixed_template("mixed_php.html", self.test_data)
-        
-        assert "Test Product Review" in result
-        assert "Test Product" in result
-        assert "<?php echo" in result
-    
-    def test_php_block_preservation(self):
-        """Test PHP code block preservation."""
-        content = """
-        <h1>Title</h1>
-        <?php echo "test"; ?>
-        <?=variable?>
-        <p>Content</p>
-        """
-        
-        php_blocks, protected = self.manager._preserve_php_blocks(content)
-        
-        assert len(php_blocks) > 0
-        assert "<?php echo" not in protected  # Should be replaced with placeholder
-        assert "__PHP_" in protected  # Should contain placeholders
-        
-        # Test restoration
-        restored = self.manager._restore_php_blocks(protected, php_blocks)
-        assert "<?php echo" in restored
-        assert "<?=variable?>" in restored
-    
-    def test_contains_php(self):
-        """Test PHP detection."""
-        php_content = "<?php echo 'test'; ?>"
-        html_content = "<h1>No PHP here</h1>"
-        mixed_content = "<h1>Title</h1><?=variable?><p>Text</p>"
-        
-        assert self.manager._contains_php(php_content) is True
-        assert self.manager._contains_php(html_content) is False
-        assert self.manager._contains_php(mixed_content) is True
-    
-    def test_process_php_functions(self):
-        """Test PHP function processing."""
-        content = '<?=prod_info("test_code", "pname")?>'
-        result = self.manager.process_php_functions(content, self.test_data)
-        
-        assert "TEST123" in result  # Product code should be replaced
-        assert "<?=prod_info(" in result  # PHP syntax preserved
-    
-    def test_create_template_from_string(self):
-        """Test creating template from string."""
-        template_string = "<h1>{{title}}</h1><p>Product: product_code</p>"
-        result = self.manager.create_template_from_string(template_string, self.test_data)
-        
-        assert "Test Product Review" in result
-        assert "TEST123" in result
-    
     def test_get_template_list(self):
         """Test getting list of available templates."""
         # Create some test templates
@@ -241,6 +242,15 @@ class TestTemplateManager:
         assert "subdir/template3.html" in templates or "subdir\\template3.html" in templates
         assert len(templates) >= 3
     
+    @pytest.mark.skipif(not hasattr(os, 'symlink'), reason="symlinks not supported")
+    def test_get_template_list_skips_dangling_symlinks(self):
+        """Test only links that resolve to files are listed, as with Path.is_file()."""
+        self.create_test_template("a.html", "<h1>A</h1>")
+        os.symlink(self.template_dir / "a.html", self.template_dir / "alias.html")
+        os.symlink(self.template_dir / "missing.html", self.template_dir / "dangling.html")
+        
+        assert self.manager.get_template_list() == ["a.html", "alias.html"]
+    
     def test_template_exists(self):
         """Test template existence check."""
         self.create_test_template("exists.html", "<h1>Exists</h1>")
@@ -261,6 +271,36 @@ class TestTemplateManager:
         self.manager.clear_cache()
         assert len(self.manager._template_cache) == 0
     
+    def test_prewarm_sources(self):
+        """Test concurrent template source prewarming."""
+        self.create_test_template("warm1.html", "<h1>{{title}}</h1>")
+        self.create_test_template("warm2.php", "<?php echo 'test'; ?>")
+        
+        loaded = asyncio.run(
+            self.manager.prewarm_sources(["warm1.html", "warm2.php", "missing.html"])
+        )
+        
+        assert loaded == 2
+        assert self.manager._source_cache["warm1.html"][0] == "<h1>{{title}}</h1>"
+        assert "missing.html" not in self.manager._source_cache
+        
+        # Rendering uses the prewarmed source
+        result = self.manager.render_html("warm1.html", self.test_data)
+        assert "Test Product Review" in result
+    
+    def test_prewarmed_source_reloaded_after_change(self):
+        """Test a prewarmed source is re-read once the file changes on disk."""
+        self.create_test_template("changed.html", "<p>old {{rating}}</p>")
+        path = self.template_dir / "changed.html"
+        asyncio.run(self.manager.prewarm_sources(["changed.html"]))
+        
+        path.write_text("<p>new {{rating}}</p>", encoding='utf-8')
+        stat = path.stat()
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+        
+        result = self.manager.render_html("changed.html", self.test_data)
+        assert result.startswith("<p>new ")
+    
     def test_get_cache_stats(self):
         """Test cache statistics."""
         template_content = "<h1>{{title}}</h1>"
@@ -276,7 +316,19 @@ class TestTemplateManager:
         assert "template_directory" in stats
         assert "available_templates" in stats
         assert stats["cached_templates"] == 1
-        assert "stats.html" in stats["template_names"]
+        assert stats["template_names"] == ["stats.html"]
+    
+    def test_get_cache_stats_memoizes_template_count(self):
+        """Test that the available template count is not rescanned every call."""
+        self.create_test_template("first.html", "<h1>{{title}}</h1>")
+        assert self.manager.get_cache_stats()["available_templates"] == 1
+        
+        # New template is not seen until the memoized count expires or is cleared
+        self.create_test_template("second.html", "<h1>{{title}}</h1>")
+        assert self.manager.get_cache_stats()["available_templates"] == 1
+        
+        self.manager.clear_cache()
+        assert self.manager.get_cache_stats()["available_templates"] == 2
     
     def test_validate_template_valid(self):
         """Test template validation for valid template."""
@@ -420,4 +472,90 @@ class TestTemplateManager:
         assert "2025/" in result  # Date placeholder
         assert "5/5" in result  # Rating
         assert "<?=prod_info(" in result  # PHP function preserved
-        assert "This is test content" in result  # Safe content
\ No newline at end of file
+        assert "This is test content" in result  # Safe content
+
+
+class TestTemplateManagerInMemory:
+    """Test cases for TemplateManager with in-memory templates (no template directory)."""
+    
+    def setup_method(self):
+        """Set up test fixtures."""
+        self.manager = TemplateManager(None, loader=DictLoader({
+            'page.html': "<h1>{{title}}</h1><p>Product: product_code</p>",
+            'page.php': "<?php echo 'kept'; ?><h1>{{title}}</h1>",
+        }))
+        self.test_data = TEST_DATA
+    
+    def test_requires_template_dir_or_loader(self):
+        """Test a manager needs either a template directory or a loader."""
+        with pytest.raises(TemplateError):
+            TemplateManager(None)
+    
+    def test_render_from_loader(self):
+        """Test rendering and listing templates served by the loader."""
+        assert self.manager.get_template_list() == ['page.html', 'page.php']
+        assert self.manager.template_exists('page.php')
+        assert not self.manager.template_exists('missing.html')
+        
+        result = self.manager.render_template('page.html', self.test_data)
+        assert result == "<h1>Test Product Review</h1><p>Product: TEST123</p>"
+        
+        result = self.manager.render_template('page.php', self.test_data)
+        assert "<?php echo 'kept'; ?>" in result
+        assert "Test Product Review" in result
+    
+    def test_loader_without_listing(self):
+        """Test a loader that cannot list templates still answers template_exists."""
+        manager = TemplateManager(None, loader=FunctionLoader(
+            lambda name: "<h1>{{title}}</h1>" if name == 'page.html' else None
+        ))
+        
+        assert manager.template_exists('page.html')
+        assert not manager.template_exists('missing.html')
+        assert manager.get_template_list() == []
+    
+    def test_php_block_preservation(self):
+        """Test PHP code block preservation."""
+        content = """
+        <h1>Title</h1>
+        <?php echo "test"; ?>
+        <?=variable?>
+        <p>Content</p>
+        """
+        
+        php_blocks, protected = self.manager._preserve_php_blocks(content)
+        
+        assert len(php_blocks) > 0
+        assert "<?php echo" not in protected  # Should be replaced with placeholder
+        assert "__PHP_" in protected  # Should contain placeholders
+        
+        # Test restoration
+        restored = self.manager._restore_php_blocks(protected, php_blocks)
+        assert "<?php echo" in restored
+        assert "<?=variable?>" in restored
+    
+    def test_contains_php(self):
+        """Test PHP detection."""
+        php_content = "<?php echo 'test'; ?>"
+        html_content = "<h1>No PHP here</h1>"
+        mixed_content = "<h1>Title</h1><?=variable?><p>Text</p>"
+        
+        assert self.manager._contains_php(php_content) is True
+        assert self.manager._contains_php(html_content) is False
+        assert self.manager._contains_php(mixed_content) is True
+    
+    def test_process_php_functions(self):
+        """Test PHP function processing."""
+        content = '<?=prod_info("test_code", "pname")?>'
+        result = self.manager.process_php_functions(content, self.test_data)
+        
+        assert "TEST123" in result  # Product code should be replaced
+        assert "<?=prod_info(" in result  # PHP syntax preserved
+    
+    def test_create_template_from_string(self):
+        """Test creating template from string."""
+        template_string = "<h1>{{title}}</h1><p>Product: product_code</p>"
+        result = self.manager.create_template_from_string(template_string, self.test_data)
+        
+        assert "Test Product Review" in result
+        assert "TEST123" in result